@@ -1,14 +1,13 @@
 # main.py
-import os
 from dotenv import load_dotenv
 from fastapi import FastAPI, APIRouter, HTTPException
 from pydantic import BaseModel
-from langchain_ollama import ChatOllama
 from langchain.agents import AgentExecutor, create_tool_calling_agent
 from langchain_core.prompts import ChatPromptTemplate
 
 # Import your custom tools
 from tools.legislative_bill_analyzer import LegislativeAnalysisTools
+from services.llm_service import get_chat_model
 
 # Load environment variables from .env file
 load_dotenv()
@@ -24,6 +23,39 @@ class AgentResponse(BaseModel):
     output: str
     intermediate_steps: list
 
+# --- Create the agent components once when the server starts ---
+
+# 1. Use the shared LLM client
+llm = get_chat_model()
+
+# 2. Create the agent prompt
+prompt = ChatPromptTemplate.from_messages([
+    ("system", """You are an AI assistant designed specifically for grassroots activists and community organizers. Your primary mission is to demystify complex legislative language and empower users to understand a bill. You are a knowledgeable, supportive partner in their advocacy efforts.
+
+        **Your Core Workflow:**
+        1. When a user asks a question, your **first and only action** is to use the `search_legislative_text` tool to find the most relevant sections within the bill.
+        2. Your final answer to the user **MUST** be based exclusively on the information returned by the tool.
+        3. If the tool returns no relevant information, clearly state that the answer could not be found within the provided text.
+
+        **How to Communicate:**
+        * **Simplify, Don't Just Summarize:** Translate legal and governmental jargon into plain, everyday language. For example, instead of "ad valorem tax," explain it as "property tax." Instead of "notwithstanding any other provision of law," say "this rule overrides any other conflicting rules."
+        * **Use Clear Formatting:** Use bullet points, bold text for key terms, and short paragraphs to make your answers easy to scan and digest.
+
+        **Crucial Guardrails:**
+        * **No Political Opinions:** Do not express personal or political opinions, or predict a bill's success.
+        * **Cite Your Source:** When possible, mention which section or article your information comes from. This helps users reference the source text themselves.
+
+        Your goal is to transform a wall of legal text into clear, actionable intelligence for people working to make a difference."""),
+    ("user", "{input}"),
+    ("placeholder", "{agent_scratchpad}"),
+])
+
+# 3. Create the agent once. The agent only needs the tool's name and schema to
+# bind it to the LLM; the bill context lives on the per-request tool instance.
+tool_schema = [LegislativeAnalysisTools(bill_number=0, chamber="")]
+agent = create_tool_calling_agent(llm, tool_schema, prompt)
+
+
 # --- APIRouter Setup ---
 # Using a router helps organize endpoints in larger applications
 router = APIRouter()
@@ -33,56 +65,25 @@ async def run_agent(request: AgentRequest):
     """
     Runs the legislative analysis agent on a specific bill and query.
     
-    This endpoint initializes the agent with the provided bill number and chamber,
-    then executes the user's query to find and analyze relevant text.
+    The LLM, prompt and agent are built once at startup. Each request only binds
+    the bill number and chamber to a fresh tool instance and a lightweight
+    AgentExecutor, then executes the user's query without blocking the event loop.
     """
     try:
         print(f"Received request for bill: {request.bill_number}, query: {request.query}")
 
-        # 1. Initialize the LLM from environment variables
-        llm = ChatOllama(
-            base_url=os.getenv("OLLAMA_BASE_URL"),
-            model=os.getenv("OLLAMA_MODEL")
-        )
-
-        # 2. Instantiate the tools with the specific bill context from the request
-        # Instantiate the tool class with the required state.
+        # 1. Bind the bill context from the request to the search tool
         search_tool = LegislativeAnalysisTools(
             bill_number=request.bill_number,
             chamber=request.chamber
         )
         tools = [search_tool]
 
-        # 3. Create the agent prompt
-        prompt = ChatPromptTemplate.from_messages([
-            ("system", """You are an AI assistant designed specifically for grassroots activists and community organizers. Your primary mission is to demystify complex legislative language and empower users to understand a bill. You are a knowledgeable, supportive partner in their advocacy efforts.
-
-        **Your Core Workflow:**
-        1. When a user asks a question, your **first and only action** is to use the `search_legislative_text` tool to find the most relevant sections within the bill.
-        2. Your final answer to the user **MUST** be based exclusively on the information returned by the tool.
-        3. If the tool returns no relevant information, clearly state that the answer could not be found within the provided text.
-
-        **How to Communicate:**
-        * **Simplify, Don't Just Summarize:** Translate legal and governmental jargon into plain, everyday language. For example, instead of "ad valorem tax," explain it as "property tax." Instead of "notwithstanding any other provision of law," say "this rule overrides any other conflicting rules."
-        * **Use Clear Formatting:** Use bullet points, bold text for key terms, and short paragraphs to make your answers easy to scan and digest.
-
-        **Crucial Guardrails:**
-        * **No Political Opinions:** Do not express personal or political opinions, or predict a bill's success.
-        * **Cite Your Source:** When possible, mention which section or article your information comes from. This helps users reference the source text themselves.
-
-        Your goal is to transform a wall of legal text into clear, actionable intelligence for people working to make a difference."""),
-            ("user", "{input}"),
-            ("placeholder", "{agent_scratchpad}"),
-        ])
-        
-        # 4. Create the agent
-        agent = create_tool_calling_agent(llm, tools, prompt)
-
-        # 5. Create the Agent Executor to run the agent
+        # 2. Wrap the shared agent in an executor that runs this request's tool
         agent_executor = AgentExecutor(agent=agent, tools=tools, verbose=True)
 
-        # 6. Invoke the agent and get the result
-        response = agent_executor.invoke({
+        # 3. Invoke the agent asynchronously and get the result
+        response = await agent_executor.ainvoke({
             "input": request.query
         })
         
@@ -3,30 +3,28 @@ import os
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 
-from langchain_ollama import ChatOllama
 from langchain_core.prompts import ChatPromptTemplate
 # MODIFIED IMPORTS: Using standard LangChain AgentExecutor
 from langchain.agents import AgentExecutor, create_tool_calling_agent
 
 # Import your tools
-from tools.database_state_legislator_tools import find_house_rep_by_district, find_senate_rep_by_district, find_house_rep_by_name, find_senate_rep_by_name
-from tools.cicero_civic_tools import find_elected_officials_by_address
+from tools.database_state_legislator_tools import find_house_rep_by_district, find_senate_rep_by_district, find_house_rep_by_name, find_senate_rep_by_name, find_legislator_by_partial_name, find_state_legislators_by_location
+from tools.cicero_civic_tools import find_elected_officials_by_address, find_all_elected_officials_by_address
 from tools.legislative_tools import (
     search_for_legislative_documents, find_bills_by_author_on_topic, get_bill_details, list_all_bills_by_author
 )
+from services.llm_service import get_chat_model
 
 # --- Create all agent components once when the server starts ---
 
-# Initialize the model, pointing to the Docker service name
-model = ChatOllama(
-    base_url=os.getenv("OLLAMA_BASE_URL"),
-    model=os.getenv("OLLAMA_MODEL")
-)
+# Use the shared model, pointing to the Docker service name
+model = get_chat_model()
 
 # Define the list of tools the agent can use
 tools = [
     find_house_rep_by_district, find_senate_rep_by_district, find_house_rep_by_name, find_senate_rep_by_name,
-    find_elected_officials_by_address,
+    find_legislator_by_partial_name, find_state_legislators_by_location,
+    find_elected_officials_by_address, find_all_elected_officials_by_address,
     search_for_legislative_documents,
     find_bills_by_author_on_topic, get_bill_details, list_all_bills_by_author
 ]
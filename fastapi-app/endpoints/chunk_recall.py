@@ -2,14 +2,23 @@
 
 from fastapi import APIRouter, HTTPException, BackgroundTasks
 from pydantic import BaseModel, Field, validator
-from typing import List, Dict, Any, Optional, Union
+from typing import List, Dict, Any, Optional, Tuple, Union
 import asyncio
+import base64
 import hashlib
+import os
+import struct
+import tempfile
+import threading
 import time
 import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
 from datetime import datetime
 import logging
 
+from services.ttl_cache import TTLCache
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -17,9 +26,20 @@ logger = logging.getLogger(__name__)
 # Create router
 router = APIRouter()
 
+EMBEDDING_MODEL_NAME = 'all-MiniLM-L6-v2'
+# Texts per SentenceTransformer forward pass; larger batches trade memory for throughput
+EMBEDDING_BATCH_SIZE = int(os.getenv("CHUNK_RECALL_EMBEDDING_BATCH_SIZE", 64))
+# On-disk chunk embedding cache shared by evaluations and by every worker pointed at
+# the same directory (writes are file-locked); set the directory to '' to disable
+CHUNK_EMBEDDING_CACHE_DIR = os.getenv(
+    "CHUNK_EMBEDDING_CACHE_DIR", os.path.join(tempfile.gettempdir(), "chunk_embedding_cache")
+)
+CHUNK_EMBEDDING_CACHE_CAPACITY = int(os.getenv("CHUNK_EMBEDDING_CACHE_CAPACITY", 50000))
+
 # Try to import optional dependencies
 try:
     import numpy as np
+    from services.chunk_embedding_cache import ChunkEmbeddingCache
 
     HAS_NUMPY = True
 except ImportError:
@@ -38,19 +58,24 @@ except ImportError:
     logger.warning("sentence-transformers not available. Using dummy embeddings.")
 
 
+_embedding_model_lock = threading.Lock()
+
+
 def get_embedding_model():
-    """Lazy load the embedding model"""
+    """Lazy load the embedding model (evaluation workers may call this concurrently)"""
     global embedding_model
     if not HAS_SENTENCE_TRANSFORMERS:
         return "dummy"
 
     if embedding_model is None:
-        try:
-            embedding_model = SentenceTransformer('all-MiniLM-L6-v2')
-            logger.info("Embedding model loaded successfully")
-        except Exception as e:
-            logger.error(f"Failed to load embedding model: {e}")
-            embedding_model = "dummy"
+        with _embedding_model_lock:
+            if embedding_model is None:
+                try:
+                    embedding_model = SentenceTransformer(EMBEDDING_MODEL_NAME)
+                    logger.info("Embedding model loaded successfully")
+                except Exception as e:
+                    logger.error(f"Failed to load embedding model: {e}")
+                    embedding_model = "dummy"
     return embedding_model
 
 
@@ -94,6 +119,16 @@ class ChunkRecallRequest(BaseModel):
     top_k: int = Field(default=5, ge=1, le=20, description="Number of top chunks to retrieve")
     similarity_threshold: float = Field(default=0.7, ge=0.0, le=1.0, description="Similarity threshold")
     embedding_model: str = Field(default="sentence-transformers", description="Embedding model to use")
+    embedding_batch_size: Optional[int] = Field(None, ge=1, le=1024, description="Texts per embedding batch (defaults to CHUNK_RECALL_EMBEDDING_BATCH_SIZE)")
+    response_mode: str = Field(default="full", description="'full' inlines chunks in every query result; 'compact' returns chunk ids referencing one deduplicated chunk table, without embeddings")
+    include_embeddings: bool = Field(default=False, description="Compact mode only: include base64-encoded float32 embeddings in the chunk table")
+
+    @validator('response_mode')
+    def validate_response_mode(cls, v):
+        allowed_modes = ['full', 'compact']
+        if v not in allowed_modes:
+            raise ValueError(f"Response mode must be one of {allowed_modes}")
+        return v
 
 
 class Chunk(BaseModel):
@@ -130,6 +165,57 @@ class ChunkRecallResponse(BaseModel):
     metadata: Dict[str, Any] = Field(default_factory=dict, description="Additional metadata")
 
 
+class CompactChunk(BaseModel):
+    """Chunk table entry for compact responses"""
+    id: str = Field(..., description="Unique chunk identifier")
+    content: str = Field(..., description="Chunk content")
+    document_id: str = Field(..., description="Source document ID")
+    start_position: int = Field(..., description="Start position in document")
+    end_position: int = Field(..., description="End position in document")
+    token_count: int = Field(..., description="Number of tokens in chunk")
+    embedding_b64: Optional[str] = Field(None, description="Base64-encoded little-endian float32 embedding (only with include_embeddings)")
+
+
+class CompactQueryResult(BaseModel):
+    """Result for a single query, referencing chunks by id"""
+    query_id: str = Field(..., description="Query identifier")
+    query_text: str = Field(..., description="Original query text")
+    retrieved_chunk_ids: List[str] = Field(..., description="Ids of retrieved chunks, keys into the chunk table")
+    similarity_scores: List[float] = Field(..., description="Similarity scores for retrieved chunks")
+    chunk_recall: bool = Field(..., description="Whether correct chunk was retrieved")
+    recall_rank: Optional[int] = Field(None, description="Rank of correct chunk (if found)")
+    execution_time_ms: float = Field(..., description="Query execution time in milliseconds")
+
+
+class CompactChunkRecallResponse(BaseModel):
+    """Compact response: each retrieved chunk appears once in `chunks`"""
+    evaluation_id: str = Field(..., description="Unique evaluation identifier")
+    strategy: ChunkingStrategy = Field(..., description="Evaluated strategy")
+    overall_recall: float = Field(..., description="Overall recall score (0-1)")
+    total_chunks: int = Field(..., description="Total number of chunks created")
+    avg_chunk_size: float = Field(..., description="Average chunk size in tokens")
+    chunks: Dict[str, CompactChunk] = Field(..., description="Every retrieved chunk, keyed by chunk id")
+    query_results: List[CompactQueryResult] = Field(..., description="Results for each query")
+    processing_time_ms: float = Field(..., description="Total processing time")
+    metadata: Dict[str, Any] = Field(default_factory=dict, description="Additional metadata")
+
+
+class EvaluationJobStatus(BaseModel):
+    """Status and progress of a background chunk recall evaluation"""
+    evaluation_id: str = Field(..., description="Unique evaluation identifier")
+    status: str = Field(default="queued", description="One of 'queued', 'running', 'completed', 'failed'")
+    stage: Optional[str] = Field(None, description="Current stage: 'chunking', 'embedding_chunks', 'embedding_queries', 'scoring'")
+    chunks_total: int = Field(default=0, description="Chunks created so far")
+    chunks_embedded: int = Field(default=0, description="Chunks embedded so far")
+    queries_total: int = Field(default=0, description="Queries in the evaluation")
+    queries_scored: int = Field(default=0, description="Queries scored so far")
+    submitted_at: str = Field(..., description="Submission timestamp")
+    started_at: Optional[str] = Field(None, description="Start timestamp")
+    completed_at: Optional[str] = Field(None, description="Completion timestamp")
+    error: Optional[str] = Field(None, description="Error message if the evaluation failed")
+    result: Optional[Union[ChunkRecallResponse, CompactChunkRecallResponse]] = Field(None, description="Final result once completed")
+
+
 # Chunking Functions
 def chunk_text_fixed(text: str, chunk_size: int, overlap: int = 0) -> List[Dict[str, Any]]:
     """Fixed-size chunking with optional overlap"""
@@ -228,8 +314,13 @@ def apply_chunking_strategy(text: str, strategy: ChunkingStrategy) -> List[Dict[
         return chunk_text_fixed(text, 100, 0)
 
 
-def get_embeddings(texts: List[str]) -> List[List[float]]:
-    """Get embeddings for a list of texts"""
+def get_embeddings(texts: List[str], batch_size: int = EMBEDDING_BATCH_SIZE, as_numpy: bool = False):
+    """
+    Get embeddings for a list of texts in batched encode calls.
+
+    Returns a list of lists, or a float32 NumPy matrix when `as_numpy` is set
+    and the model is available (skipping the conversion to Python floats).
+    """
     model = get_embedding_model()
 
     if model == "dummy" or not HAS_SENTENCE_TRANSFORMERS:
@@ -238,7 +329,9 @@ def get_embeddings(texts: List[str]) -> List[List[float]]:
         return [[random.random() * 0.4 + 0.3 for _ in range(384)] for _ in texts]
 
     try:
-        embeddings = model.encode(texts)
+        embeddings = model.encode(texts, batch_size=batch_size, convert_to_numpy=True)
+        if as_numpy:
+            return embeddings.astype(np.float32, copy=False)
         return embeddings.tolist()
     except Exception as e:
         logger.error(f"Error generating embeddings: {e}")
@@ -247,6 +340,54 @@ def get_embeddings(texts: List[str]) -> List[List[float]]:
         return [[random.random() * 0.4 + 0.3 for _ in range(384)] for _ in texts]
 
 
+_chunk_embedding_cache = None
+_chunk_embedding_cache_lock = threading.Lock()
+
+
+def get_chunk_embedding_cache() -> Optional["ChunkEmbeddingCache"]:
+    """The on-disk chunk embedding cache, or None when disabled or NumPy is missing"""
+    global _chunk_embedding_cache
+    if not HAS_NUMPY or not CHUNK_EMBEDDING_CACHE_DIR:
+        return None
+    if _chunk_embedding_cache is None:
+        with _chunk_embedding_cache_lock:
+            if _chunk_embedding_cache is None:
+                _chunk_embedding_cache = ChunkEmbeddingCache(
+                    CHUNK_EMBEDDING_CACHE_DIR, EMBEDDING_MODEL_NAME, CHUNK_EMBEDDING_CACHE_CAPACITY
+                )
+    return _chunk_embedding_cache
+
+
+def embed_chunk_texts(texts: List[str], batch_size: int = EMBEDDING_BATCH_SIZE) -> List[List[float]]:
+    """
+    Get chunk embeddings through the content-addressed cache.
+
+    Chunks are keyed by the SHA-256 of their text, so repeated evaluations over
+    the same corpus only embed chunks they have not seen before. Dummy
+    embeddings are never cached.
+    """
+    model = get_embedding_model()
+    cache = get_chunk_embedding_cache() if model != "dummy" else None
+    if cache is None:
+        return get_embeddings(texts, batch_size=batch_size)
+
+    keys = [hashlib.sha256(text.encode("utf-8")).hexdigest() for text in texts]
+    vectors = cache.get_many(keys)
+
+    missing = {key: text for key, text in zip(keys, texts) if key not in vectors}
+    if missing:
+        try:
+            new_vectors = model.encode(list(missing.values()), batch_size=batch_size, convert_to_numpy=True)
+        except Exception as e:
+            logger.error(f"Error generating embeddings: {e}")
+            return get_embeddings(texts, batch_size=batch_size)
+        cache.put_many(list(missing.keys()), new_vectors)
+        vectors.update(zip(missing.keys(), np.asarray(new_vectors, dtype=np.float32)))
+
+    logger.info(f"Chunk embeddings: {len(texts) - len(missing)} cached, {len(missing)} computed")
+    return [vectors[key].tolist() for key in keys]
+
+
 def calculate_similarity(query_embedding: List[float], chunk_embeddings: List[List[float]]) -> List[float]:
     """Calculate cosine similarity between query and chunks"""
     try:
@@ -279,6 +420,143 @@ def calculate_similarity(query_embedding: List[float], chunk_embeddings: List[Li
         return [0.4 + 0.4 * random.random() for _ in chunk_embeddings]
 
 
+def encode_embedding(embedding: List[float]) -> str:
+    """Base64 of the embedding as little-endian float32"""
+    if HAS_NUMPY:
+        raw = np.asarray(embedding, dtype='<f4').tobytes()
+    else:
+        raw = struct.pack(f"<{len(embedding)}f", *embedding)
+    return base64.b64encode(raw).decode("ascii")
+
+
+def to_compact_response(response: ChunkRecallResponse, include_embeddings: bool = False) -> CompactChunkRecallResponse:
+    """Replace inline chunks with ids into a deduplicated chunk table, dropping embeddings unless requested"""
+    chunks: Dict[str, CompactChunk] = {}
+    query_results = []
+    for result in response.query_results:
+        for chunk in result.retrieved_chunks:
+            if chunk.id not in chunks:
+                chunks[chunk.id] = CompactChunk(
+                    id=chunk.id,
+                    content=chunk.content,
+                    document_id=chunk.document_id,
+                    start_position=chunk.start_position,
+                    end_position=chunk.end_position,
+                    token_count=chunk.token_count,
+                    embedding_b64=encode_embedding(chunk.embedding) if include_embeddings and chunk.embedding else None
+                )
+        query_results.append(CompactQueryResult(
+            query_id=result.query_id,
+            query_text=result.query_text,
+            retrieved_chunk_ids=[chunk.id for chunk in result.retrieved_chunks],
+            similarity_scores=result.similarity_scores,
+            chunk_recall=result.chunk_recall,
+            recall_rank=result.recall_rank,
+            execution_time_ms=result.execution_time_ms
+        ))
+
+    return CompactChunkRecallResponse(
+        evaluation_id=response.evaluation_id,
+        strategy=response.strategy,
+        overall_recall=response.overall_recall,
+        total_chunks=response.total_chunks,
+        avg_chunk_size=response.avg_chunk_size,
+        chunks=chunks,
+        query_results=query_results,
+        processing_time_ms=response.processing_time_ms,
+        metadata={**response.metadata, "response_mode": "compact"}
+    )
+
+
+def normalize_embeddings(embeddings) -> "np.ndarray":
+    """Stack embeddings into a float32 matrix with unit-length rows (zero rows stay zero)"""
+    matrix = np.asarray(embeddings, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+def select_top_k(query_matrix: "np.ndarray", chunk_matrix: "np.ndarray", top_k: int) -> Tuple["np.ndarray", "np.ndarray"]:
+    """
+    Top-k chunks for every query from one query-by-chunk similarity matmul.
+
+    Both matrices must be row-normalized, so the product is cosine similarity.
+    argpartition selects each row's k best in linear time; only those k are sorted.
+
+    Returns:
+        (indices, scores), each of shape (n_queries, k), best first.
+    """
+    similarities = query_matrix @ chunk_matrix.T
+    k = min(top_k, similarities.shape[1])
+    if k < similarities.shape[1]:
+        top_indices = np.argpartition(-similarities, k - 1, axis=1)[:, :k]
+    else:
+        top_indices = np.tile(np.arange(k), (similarities.shape[0], 1))
+    top_scores = np.take_along_axis(similarities, top_indices, axis=1)
+    order = np.argsort(-top_scores, axis=1)
+    return np.take_along_axis(top_indices, order, axis=1), np.take_along_axis(top_scores, order, axis=1)
+
+
+def check_chunk_recall(query: Query, top_chunks: List[Chunk]) -> Tuple[bool, Optional[int]]:
+    """Simple recall check: if query's expected answer appears in any retrieved chunk"""
+    expected = query.expected_answer.lower()
+    expected_words = [word for word in expected.split() if len(word) > 2]
+    for i, chunk in enumerate(top_chunks):
+        content = chunk.content.lower()
+        if expected in content or any(word in content for word in expected_words):
+            return True, i + 1
+    return False, None
+
+
+def score_queries(
+        queries: List[Query],
+        query_embeddings: Union[List[List[float]], "np.ndarray"],
+        all_chunks: List[Chunk],
+        chunk_matrix: Optional["np.ndarray"],
+        top_k: int
+) -> List[QueryResult]:
+    """
+    Score every query against every chunk and build the per-query results.
+
+    With NumPy, `chunk_matrix` is the pre-normalized float32 chunk matrix and all
+    queries are scored in a single matrix product. Without it, each query falls
+    back to calculate_similarity() and a full sort.
+    """
+    if not queries:
+        return []
+
+    start_time = time.time()
+    ranked: List[Tuple[List[int], List[float]]] = []
+
+    if HAS_NUMPY and chunk_matrix is not None and len(all_chunks) > 0:
+        top_indices, top_scores = select_top_k(normalize_embeddings(query_embeddings), chunk_matrix, top_k)
+        ranked = list(zip(top_indices.tolist(), top_scores.tolist()))
+    else:
+        chunk_embeddings = [chunk.embedding for chunk in all_chunks]
+        for query_embedding in query_embeddings:
+            similarities = calculate_similarity(query_embedding, chunk_embeddings) if all_chunks else []
+            order = sorted(range(len(similarities)), key=lambda i: similarities[i], reverse=True)[:top_k]
+            ranked.append((order, [similarities[i] for i in order]))
+
+    # Scoring is shared by all queries, so each result reports an equal share of it.
+    execution_time = (time.time() - start_time) * 1000 / max(1, len(queries))
+
+    query_results = []
+    for query, (indices, scores) in zip(queries, ranked):
+        top_chunks = [all_chunks[i] for i in indices]
+        chunk_recall, recall_rank = check_chunk_recall(query, top_chunks)
+        query_results.append(QueryResult(
+            query_id=query.id,
+            query_text=query.text,
+            retrieved_chunks=top_chunks,
+            similarity_scores=scores,
+            chunk_recall=chunk_recall,
+            recall_rank=recall_rank,
+            execution_time_ms=execution_time
+        ))
+    return query_results
+
+
 async def process_single_query(
         query: Query,
         all_chunks: List[Chunk],
@@ -286,129 +564,230 @@ async def process_single_query(
         similarity_threshold: float
 ) -> QueryResult:
     """Process a single query and return results"""
+    chunk_matrix = normalize_embeddings([chunk.embedding for chunk in all_chunks]) if HAS_NUMPY and all_chunks else None
+    query_embeddings = get_embeddings([query.text])
+    return score_queries([query], query_embeddings, all_chunks, chunk_matrix, top_k)[0]
+
+
+def run_evaluation(
+        request: ChunkRecallRequest,
+        evaluation_id: str,
+        progress: Optional[EvaluationJobStatus] = None
+) -> ChunkRecallResponse:
+    """
+    Chunk, embed and score one evaluation. CPU-bound, so it runs on the
+    evaluation worker pool rather than the event loop.
+
+    When `progress` is given, its stage and counters are updated as the
+    evaluation advances so pollers can follow a background job.
+    """
+    def report(**fields):
+        if progress is not None:
+            for name, value in fields.items():
+                setattr(progress, name, value)
+
     start_time = time.time()
 
-    # Get embeddings
-    query_embedding = get_embeddings([query.text])[0]
-    chunk_embeddings = [chunk.embedding for chunk in all_chunks]
+    logger.info(f"Starting chunk recall evaluation {evaluation_id}")
 
-    # Calculate similarities
-    similarities = calculate_similarity(query_embedding, chunk_embeddings)
+    report(stage="chunking", queries_total=len(request.queries))
 
-    # Get top-k chunks
-    chunk_similarity_pairs = list(zip(all_chunks, similarities))
-    chunk_similarity_pairs.sort(key=lambda x: x[1], reverse=True)
+    # Step 1: Chunk all documents
+    all_chunks = []
+    total_chunks = 0
 
-    top_chunks = [chunk for chunk, _ in chunk_similarity_pairs[:top_k]]
-    top_similarities = [sim for _, sim in chunk_similarity_pairs[:top_k]]
+    for doc in request.documents:
+        chunk_data = apply_chunking_strategy(doc.content, request.strategy)
 
-    # Check chunk recall
-    chunk_recall = False
-    recall_rank = None
+        for i, chunk_info in enumerate(chunk_data):
+            chunk_id = f"{doc.id}_chunk_{i}"
 
-    # Simple recall check: if query's expected answer appears in any retrieved chunk
-    for i, chunk in enumerate(top_chunks):
-        if (query.expected_answer.lower() in chunk.content.lower() or
-                any(word in chunk.content.lower() for word in query.expected_answer.lower().split() if len(word) > 2)):
-            chunk_recall = True
-            recall_rank = i + 1
-            break
+            chunk = Chunk(
+                id=chunk_id,
+                content=chunk_info["content"],
+                document_id=doc.id,
+                start_position=chunk_info["start_position"],
+                end_position=chunk_info["end_position"],
+                token_count=chunk_info["token_count"],
+                embedding=None  # Will be populated below
+            )
+            all_chunks.append(chunk)
+            total_chunks += 1
 
-    execution_time = (time.time() - start_time) * 1000
+    batch_size = request.embedding_batch_size or EMBEDDING_BATCH_SIZE
 
-    return QueryResult(
-        query_id=query.id,
-        query_text=query.text,
-        retrieved_chunks=top_chunks,
-        similarity_scores=top_similarities,
-        chunk_recall=chunk_recall,
-        recall_rank=recall_rank,
-        execution_time_ms=execution_time
+    # Step 2: Generate embeddings for all chunks
+    report(stage="embedding_chunks", chunks_total=total_chunks)
+    chunk_texts = [chunk.content for chunk in all_chunks]
+    if progress is None:
+        chunk_embeddings = embed_chunk_texts(chunk_texts, batch_size=batch_size)
+    else:
+        # Embed in blocks of a few batches so progress advances while the job runs
+        chunk_embeddings = []
+        block_size = batch_size * 8
+        for block_start in range(0, len(chunk_texts), block_size):
+            chunk_embeddings.extend(embed_chunk_texts(chunk_texts[block_start:block_start + block_size], batch_size=batch_size))
+            report(chunks_embedded=len(chunk_embeddings))
+
+    for chunk, embedding in zip(all_chunks, chunk_embeddings):
+        chunk.embedding = embedding
+
+    # Held once as a normalized float32 matrix and reused by every query
+    chunk_matrix = normalize_embeddings(chunk_embeddings) if HAS_NUMPY and chunk_embeddings else None
+
+    # Step 3: Embed all queries in one batch and score them together
+    report(stage="embedding_queries", chunks_embedded=len(chunk_embeddings))
+    query_embeddings = get_embeddings(
+        [query.text for query in request.queries], batch_size=batch_size, as_numpy=HAS_NUMPY
+    ) if request.queries else []
+    report(stage="scoring")
+    query_results = score_queries(
+        request.queries, query_embeddings, all_chunks, chunk_matrix, request.top_k
+    )
+    report(queries_scored=len(query_results))
+
+    # Step 4: Calculate overall metrics
+    successful_recalls = sum(1 for result in query_results if result.chunk_recall)
+    overall_recall = successful_recalls / len(query_results) if query_results else 0.0
+
+    avg_chunk_size = sum(chunk.token_count for chunk in all_chunks) / len(all_chunks) if all_chunks else 0
+
+    processing_time = (time.time() - start_time) * 1000
+
+    response = ChunkRecallResponse(
+        evaluation_id=evaluation_id,
+        strategy=request.strategy,
+        overall_recall=overall_recall,
+        total_chunks=total_chunks,
+        avg_chunk_size=avg_chunk_size,
+        query_results=query_results,
+        processing_time_ms=processing_time,
+        metadata={
+            "embedding_model": request.embedding_model,
+            "timestamp": datetime.now().isoformat(),
+            "top_k": request.top_k,
+            "similarity_threshold": request.similarity_threshold,
+            "embedding_batch_size": batch_size,
+            "has_numpy": HAS_NUMPY,
+            "has_sentence_transformers": HAS_SENTENCE_TRANSFORMERS
+        }
     )
 
+    logger.info(f"Completed evaluation {evaluation_id} in {processing_time:.2f}ms")
+    return response
 
-# API Endpoints
-@router.post("/evaluate", response_model=ChunkRecallResponse)
-async def evaluate_chunk_recall(request: ChunkRecallRequest):
-    """
-    Evaluate chunk recall for a given chunking strategy
-    """
-    try:
-        start_time = time.time()
-        evaluation_id = str(uuid.uuid4())
 
-        logger.info(f"Starting chunk recall evaluation {evaluation_id}")
+# Evaluation admission control. Embedding and scoring run on a bounded thread
+# pool so a large evaluation cannot freeze the event loop serving the agents.
+MAX_CONCURRENT_EVALUATIONS = int(os.getenv("CHUNK_RECALL_MAX_CONCURRENT", 2))
+# Evaluations allowed to wait for a worker; beyond this, requests get 429.
+MAX_QUEUED_EVALUATIONS = int(os.getenv("CHUNK_RECALL_MAX_QUEUED", 4))
 
-        # Step 1: Chunk all documents
-        all_chunks = []
-        total_chunks = 0
+_evaluation_executor = ThreadPoolExecutor(max_workers=MAX_CONCURRENT_EVALUATIONS, thread_name_prefix="chunk-recall")
+_evaluation_semaphore = asyncio.Semaphore(MAX_CONCURRENT_EVALUATIONS)
+_evaluations_admitted = 0
 
-        for doc in request.documents:
-            chunk_data = apply_chunking_strategy(doc.content, request.strategy)
 
-            for i, chunk_info in enumerate(chunk_data):
-                chunk_id = f"{doc.id}_chunk_{i}"
+def admit_evaluation():
+    """Reserve a place in the evaluation queue, or reject with 429 when it is full"""
+    global _evaluations_admitted
+    if _evaluations_admitted >= MAX_CONCURRENT_EVALUATIONS + MAX_QUEUED_EVALUATIONS:
+        raise HTTPException(
+            status_code=429,
+            detail="Too many chunk recall evaluations in progress. Try again shortly.",
+            headers={"Retry-After": "10"}
+        )
+    _evaluations_admitted += 1
 
-                chunk = Chunk(
-                    id=chunk_id,
-                    content=chunk_info["content"],
-                    document_id=doc.id,
-                    start_position=chunk_info["start_position"],
-                    end_position=chunk_info["end_position"],
-                    token_count=chunk_info["token_count"],
-                    embedding=None  # Will be populated below
-                )
-                all_chunks.append(chunk)
-                total_chunks += 1
 
-        # Step 2: Generate embeddings for all chunks
-        chunk_texts = [chunk.content for chunk in all_chunks]
-        chunk_embeddings = get_embeddings(chunk_texts)
+@asynccontextmanager
+async def evaluation_slot(admitted: bool = False):
+    """Wait for a free evaluation worker; the queue place is released on exit"""
+    global _evaluations_admitted
+    if not admitted:
+        admit_evaluation()
+    try:
+        async with _evaluation_semaphore:
+            yield
+    finally:
+        _evaluations_admitted -= 1
+
 
-        for chunk, embedding in zip(all_chunks, chunk_embeddings):
-            chunk.embedding = embedding
+# Background evaluation jobs, kept for CHUNK_RECALL_JOB_TTL_SECONDS after their last update
+evaluation_jobs = TTLCache(
+    maxsize=int(os.getenv("CHUNK_RECALL_JOB_STORE_SIZE", 100)),
+    ttl=float(os.getenv("CHUNK_RECALL_JOB_TTL_SECONDS", 3600))
+)
 
-        # Step 3: Process all queries
-        query_results = []
 
-        for query in request.queries:
-            result = await process_single_query(
-                query, all_chunks, request.top_k, request.similarity_threshold
+async def run_evaluation_job(job: EvaluationJobStatus, request: ChunkRecallRequest):
+    """Run an admitted evaluation in the background and record its outcome on the job"""
+    async with evaluation_slot(admitted=True):
+        job.status = "running"
+        job.started_at = datetime.now().isoformat()
+        try:
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(
+                _evaluation_executor, run_evaluation, request, job.evaluation_id, job
             )
-            query_results.append(result)
-
-        # Step 4: Calculate overall metrics
-        successful_recalls = sum(1 for result in query_results if result.chunk_recall)
-        overall_recall = successful_recalls / len(query_results) if query_results else 0.0
-
-        avg_chunk_size = sum(chunk.token_count for chunk in all_chunks) / len(all_chunks) if all_chunks else 0
-
-        processing_time = (time.time() - start_time) * 1000
-
-        response = ChunkRecallResponse(
-            evaluation_id=evaluation_id,
-            strategy=request.strategy,
-            overall_recall=overall_recall,
-            total_chunks=total_chunks,
-            avg_chunk_size=avg_chunk_size,
-            query_results=query_results,
-            processing_time_ms=processing_time,
-            metadata={
-                "embedding_model": request.embedding_model,
-                "timestamp": datetime.now().isoformat(),
-                "top_k": request.top_k,
-                "similarity_threshold": request.similarity_threshold,
-                "has_numpy": HAS_NUMPY,
-                "has_sentence_transformers": HAS_SENTENCE_TRANSFORMERS
-            }
-        )
+            if request.response_mode == "compact":
+                result = to_compact_response(result, request.include_embeddings)
+            job.result = result
+            job.status = "completed"
+        except Exception as e:
+            logger.error(f"Error in background chunk recall evaluation {job.evaluation_id}: {e}")
+            job.status = "failed"
+            job.error = str(e)
+        job.completed_at = datetime.now().isoformat()
+        # Restart the expiry clock so finished results stay available for the full TTL
+        evaluation_jobs.set(job.evaluation_id, job)
 
-        logger.info(f"Completed evaluation {evaluation_id} in {processing_time:.2f}ms")
-        return response
 
-    except Exception as e:
-        logger.error(f"Error in chunk recall evaluation: {e}")
-        raise HTTPException(status_code=500, detail=f"Evaluation failed: {str(e)}")
+# API Endpoints
+@router.post("/evaluate", response_model=Union[ChunkRecallResponse, CompactChunkRecallResponse])
+async def evaluate_chunk_recall(request: ChunkRecallRequest):
+    """
+    Evaluate chunk recall for a given chunking strategy.
+    Set response_mode='compact' to get a deduplicated chunk table without embeddings.
+    """
+    evaluation_id = str(uuid.uuid4())
+
+    async with evaluation_slot():
+        try:
+            loop = asyncio.get_running_loop()
+            response = await loop.run_in_executor(_evaluation_executor, run_evaluation, request, evaluation_id)
+            if request.response_mode == "compact":
+                return to_compact_response(response, request.include_embeddings)
+            return response
+        except Exception as e:
+            logger.error(f"Error in chunk recall evaluation: {e}")
+            raise HTTPException(status_code=500, detail=f"Evaluation failed: {str(e)}")
+
+
+@router.post("/evaluate/jobs", response_model=EvaluationJobStatus, status_code=202)
+async def submit_chunk_recall_evaluation(request: ChunkRecallRequest, background_tasks: BackgroundTasks):
+    """
+    Submit a chunk recall evaluation to run in the background.
+    Returns the evaluation_id immediately; poll GET /evaluate/{evaluation_id} for progress and the result.
+    """
+    admit_evaluation()
+    job = EvaluationJobStatus(
+        evaluation_id=str(uuid.uuid4()),
+        queries_total=len(request.queries),
+        submitted_at=datetime.now().isoformat()
+    )
+    evaluation_jobs.set(job.evaluation_id, job)
+    background_tasks.add_task(run_evaluation_job, job, request)
+    return job
+
+
+@router.get("/evaluate/{evaluation_id}", response_model=EvaluationJobStatus)
+async def get_chunk_recall_evaluation(evaluation_id: str):
+    """Get the progress of a background evaluation, including the ChunkRecallResponse once completed"""
+    job = evaluation_jobs.get(evaluation_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Evaluation {evaluation_id} not found or expired")
+    return job
 
 
 @router.get("/strategies")
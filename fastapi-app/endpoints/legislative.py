@@ -1,9 +1,11 @@
+import json
 from fastapi import FastAPI, APIRouter, Body, HTTPException
+from fastapi.responses import StreamingResponse
 from typing import Dict, Any, Optional
 
 # Import your service functions and the database connector
 try:
-    from services.legislative_query_service import run_query_service
+    from services.legislative_query_service import run_query_service, iter_query_service
     from services.legislative_search_service import run_search_service
     # from services.db_connector import get_vectorstore
 except ImportError:
@@ -12,6 +14,7 @@ except ImportError:
     print("Could not import service files. Please check your project structure.")
     # Define dummy functions if imports fail, so the file can be loaded.
     def run_query_service(filter_dict): return []
+    def iter_query_service(filter_dict): return iter([])
     def run_search_service(**kwargs): return []
     # def get_vectorstore(): return None
 
@@ -35,7 +38,7 @@ def search_endpoint(
     author: Optional[str] = None,
     bill_number: Optional[str] = None,
     chamber: Optional[str] = None,
-    k: int = 50
+    k: int = 20
 ):
     """
     Performs a semantic search on legislative documents.
@@ -44,7 +47,8 @@ def search_endpoint(
     - **author**: (Optional) Filter results by a specific author.
     - **bill_number**: (Optional) Filter results by a specific bill number.
     - **chamber**: (Optional) Filter results by chamber ('House' or 'Senate').
-    - **k**: (Optional) The maximum number of raw documents to retrieve for processing.
+    - **k**: (Optional) The maximum number of raw documents to retrieve for processing
+      (bills for a topic search, sections when filtering by bill_number).
     """
     try:
         # Pass all parameters to the service function
@@ -53,7 +57,8 @@ def search_endpoint(
             author=author, 
             bill_number=bill_number, 
             chamber=chamber,
-            k=k
+            k=k,
+            with_sections=True
         )
         return {"status": "success", "data": results}
     except Exception as e:
@@ -70,11 +75,39 @@ def get_endpoint(filter_dict: Dict[str, Any] = Body(
             {"bill_number": "S.500"}
         ]
     }
-)):
+), stream: bool = False):
     """
     Retrieves all document chunks that exactly match a given metadata filter.
     This endpoint uses the ChromaDB filter specification.
+
+    - **stream**: (Optional) Return newline-delimited JSON (one document per line)
+      as pages arrive from ChromaDB, instead of a single JSON body. Memory use
+      stays flat regardless of how many documents match. An error on the first
+      page fails the request as usual; an error on a later page ends the stream
+      with a final `{"error": ...}` line.
     """
+    if stream:
+        # Fetch the first page before committing to a 200, so an invalid filter
+        # or an unreachable ChromaDB still surfaces as an HTTP error.
+        documents = iter_query_service(filter_dict)
+        try:
+            first = next(documents, None)
+        except Exception as e:
+            print(f"An error occurred in /get: {e}")
+            raise HTTPException(status_code=500, detail="An internal error occurred during data retrieval.")
+
+        def ndjson_lines():
+            if first is None:
+                return
+            yield json.dumps(first) + "\n"
+            try:
+                for document in documents:
+                    yield json.dumps(document) + "\n"
+            except Exception as e:
+                print(f"An error occurred while streaming /get: {e}")
+                yield json.dumps({"error": "An internal error occurred during data retrieval."}) + "\n"
+        return StreamingResponse(ndjson_lines(), media_type="application/x-ndjson")
+
     try:
         results = run_query_service(filter_dict)
         return {"status": "success", "count": len(results), "data": results}
@@ -1,3 +1,5 @@
+import asyncio
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, File, UploadFile, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
@@ -8,15 +10,51 @@ from endpoints.state_legislators import router as state_legislators_router
 from endpoints.legislative import router as legislative_router
 from endpoints.agent_legislative_overview import router as agent_legislative_overview_router
 from endpoints.agent_legislative_analysis import router as agent_legislative_analysis_router
+from services.warmup import run_warmup, get_readiness
+from services.vector_store import get_query_embeddings
+from services.search_result_cache import search_result_cache
+from services.database_pool import close_pool, close_async_pool
+from services.legislator_directory import run_directory_refresh
+from services.http_client import close_http_client
 
 import PyPDF2
 import io
 
-app = FastAPI(title="Dallas AI Summer Program: Legislative Project")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Warm up embeddings, Chroma and Ollama in the background so liveness is
+    # answered immediately while readiness waits for the dependencies.
+    warmup_task = asyncio.create_task(run_warmup())
+    # Keep the in-memory legislator directory loaded and fresh.
+    directory_task = asyncio.create_task(run_directory_refresh())
+    yield
+    warmup_task.cancel()
+    directory_task.cancel()
+    await close_async_pool()
+    close_pool()
+    await close_http_client()
+
+app = FastAPI(title="Dallas AI Summer Program: Legislative Project", lifespan=lifespan)
 
 @app.get("/healthz", tags=["Health"])
 async def healthz():
-    return {"status": "ok"}
+    """Liveness: the process is up and serving requests."""
+    return {"status": "ok", "ready": get_readiness()["ready"]}
+
+@app.get("/healthz/ready", tags=["Health"])
+async def healthz_ready():
+    """Readiness: every warm-up check has passed, so requests will not hit a cold start."""
+    readiness = get_readiness()
+    status_code = 200 if readiness["ready"] else 503
+    return JSONResponse(status_code=status_code, content=readiness)
+
+@app.get("/healthz/caches", tags=["Health"])
+async def healthz_caches():
+    """Hit/miss counters for the in-process caches."""
+    return {
+        "query_embeddings": get_query_embeddings().cache.stats(),
+        "search_results": search_result_cache.stats(),
+    }
 
 # Include routers for each endppoint
 # app.include_router(helloworld_router, prefix="/hello_world", tags=["Hello World"])
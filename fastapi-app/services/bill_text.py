@@ -0,0 +1,162 @@
+# services/bill_text.py
+import math
+import os
+import re
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+from services.snippets import STOPWORDS, estimate_tokens, split_sentences, truncate_to_tokens
+
+# Assembles a bill's full text from its section chunks for the LLM: sections in
+# bill order, repeated boilerplate removed, and the result held to a token budget.
+
+# Approximate token budget for the text get_bill_details hands to the agent.
+BILL_TEXT_TOKEN_BUDGET = int(os.getenv("BILL_TEXT_TOKEN_BUDGET", 6000))
+# Lines at least this long are dropped when they repeat an earlier line verbatim.
+BOILERPLATE_MIN_CHARS = 40
+# Short lines repeated in at least this many sections are treated as page headers/footers.
+BOILERPLATE_MIN_SECTIONS = 3
+
+_PAGE_FOOTER = re.compile(r"^(?:[HS]\.\s*[BJC]\.\s*(?:R\.\s*)?No\.\s*\d+|\d+[RS]\d+\s+[A-Z]{2,4}-[A-Z])$", re.IGNORECASE)
+_NATURAL_PART = re.compile(r"(\d+)")
+_WORD = re.compile(r"[a-z0-9]+")
+
+
+def natural_key(value: Any) -> Tuple:
+    """Sort key that orders '2' before '10' and '1.02' before '1.10'; None sorts first."""
+    if value is None or value == "":
+        return ()
+    parts = _NATURAL_PART.split(str(value).upper())
+    return tuple((0, int(part), "") if part.isdigit() else (1, 0, part) for part in parts if part)
+
+
+def section_sort_key(document: Dict[str, Any]) -> Tuple:
+    metadata = document.get("metadata") or {}
+    return (
+        natural_key(metadata.get("article_number")),
+        natural_key(metadata.get("section_number")),
+        metadata.get("page") or 0,
+        document.get("id") or "",
+    )
+
+
+def order_sections(documents: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Orders a bill's chunks by article and section number. The preamble, which has
+    no section number, comes first.
+    """
+    return sorted(documents, key=section_sort_key)
+
+
+def _normalize_line(line: str) -> str:
+    return " ".join(line.lower().split())
+
+
+def remove_boilerplate(sections: List[str]) -> List[str]:
+    """
+    Drops duplicate chunks, page headers/footers, and long lines that repeat
+    verbatim in later sections. Sections left empty are removed.
+    """
+    section_lines = [[line.strip() for line in section.splitlines() if line.strip()] for section in sections]
+    section_counts = Counter()
+    for lines in section_lines:
+        section_counts.update({_normalize_line(line) for line in lines})
+
+    seen = set()
+    cleaned = []
+    for lines in section_lines:
+        kept = []
+        for line in lines:
+            normalized = _normalize_line(line)
+            if _PAGE_FOOTER.match(line):
+                continue
+            if len(normalized) < BOILERPLATE_MIN_CHARS:
+                if section_counts[normalized] >= BOILERPLATE_MIN_SECTIONS and section_counts[normalized] * 2 >= len(sections):
+                    continue
+            elif normalized in seen:
+                continue
+            seen.add(normalized)
+            kept.append(line)
+        if kept:
+            cleaned.append("\n".join(kept))
+    return cleaned
+
+
+def _sentence_scores(sentences: List[str], term_counts: Counter) -> List[float]:
+    # A sentence is representative when its terms recur across the bill.
+    scores = []
+    for sentence in sentences:
+        terms = [word for word in _WORD.findall(sentence.lower()) if word not in STOPWORDS and len(word) > 2]
+        if not terms:
+            scores.append(0.0)
+            continue
+        scores.append(sum(term_counts[term] for term in terms) / len(terms) / math.sqrt(len(terms)))
+    return scores
+
+
+def summarize_sections(sections: List[str], max_tokens: int) -> List[str]:
+    """
+    Extractive fallback for bills over budget: every section keeps its first
+    sentence (the SECTION heading and what it amends) plus its highest-scoring
+    sentences, in their original order, within a share of the budget proportional
+    to the section's length.
+    """
+    section_sentences = [split_sentences(section) for section in sections]
+    term_counts = Counter(
+        word
+        for sentences in section_sentences
+        for sentence in sentences
+        for word in _WORD.findall(sentence.lower())
+        if word not in STOPWORDS and len(word) > 2
+    )
+    total_tokens = sum(estimate_tokens(section) for section in sections) or 1
+    ratio = max_tokens / total_tokens
+
+    summarized = []
+    for section, sentences in zip(sections, section_sentences):
+        if not sentences:
+            continue
+        allowance = max(1, int(estimate_tokens(section) * ratio))
+        # A bare "SECTION 2." heading is kept together with the sentence it introduces.
+        chosen = {0, 1} if len(sentences) > 1 and len(sentences[0]) < 20 else {0}
+        used = sum(estimate_tokens(sentences[i]) for i in chosen)
+        scores = _sentence_scores(sentences, term_counts)
+        for index in sorted(range(len(chosen), len(sentences)), key=lambda i: scores[i], reverse=True):
+            cost = estimate_tokens(sentences[index])
+            if used + cost > allowance:
+                continue
+            chosen.add(index)
+            used += cost
+        summary = " ".join(sentences[i] for i in sorted(chosen))
+        if len(chosen) < len(sentences):
+            summary += " […]"
+        summarized.append(summary)
+    return summarized
+
+
+def assemble_bill_text(documents: List[Dict[str, Any]], max_tokens: Optional[int] = BILL_TEXT_TOKEN_BUDGET) -> str:
+    """
+    Builds a bill's text from its section documents (dicts with 'content' and 'metadata').
+
+    Sections are ordered and stripped of boilerplate. If the text is over `max_tokens`,
+    it is condensed with summarize_sections() and prefixed with a note saying so, so
+    the prompt stays bounded however long the bill is. Pass max_tokens=None for the
+    full text.
+    """
+    sections = [document.get("content") or "" for document in order_sections(documents)]
+    return fit_to_budget(remove_boilerplate(sections), max_tokens)
+
+
+def fit_to_budget(sections: List[str], max_tokens: Optional[int] = BILL_TEXT_TOKEN_BUDGET) -> str:
+    """Joins ordered, cleaned sections, condensing them when they exceed `max_tokens`."""
+    full_text = "\n\n".join(sections)
+    full_tokens = estimate_tokens(full_text)
+    if max_tokens is None or full_tokens <= max_tokens:
+        return full_text
+
+    note = (
+        f"[Condensed: the full bill is about {full_tokens} tokens. Each section keeps its heading "
+        f"and most representative sentences; '[…]' marks omitted text.]\n\n"
+    )
+    condensed = "\n\n".join(summarize_sections(sections, max_tokens - estimate_tokens(note)))
+    # Section headings alone can exceed the budget on very large omnibus bills.
+    return note + truncate_to_tokens(condensed, max_tokens - estimate_tokens(note))
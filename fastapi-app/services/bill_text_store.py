@@ -0,0 +1,88 @@
+# services/bill_text_store.py
+import gzip
+import json
+import os
+import threading
+from typing import Any, Dict, List, Optional
+from dotenv import load_dotenv
+
+# Read side of the per-bill full-text store written by the Chroma seeder
+# (seeds/chromadb/legislative-bill-seeding). Layout under BILL_TEXT_STORE_DIR:
+#
+#   <chamber>/<bill_number>.json.gz   one bill: metadata plus its sections in order
+#   authors.json                      author -> [{bill_number, chamber, title}]
+#
+# Looking a bill up is one file read, with no vector database round trip. When
+# the store is missing (not seeded yet), callers fall back to querying Chroma.
+
+load_dotenv()
+
+BILL_TEXT_STORE_DIR = os.getenv(
+    "BILL_TEXT_STORE_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "shared", "bill_text"),
+)
+CHAMBERS = ("House", "Senate")
+
+_author_index_lock = threading.Lock()
+_author_index: Optional[Dict[str, List[Dict[str, Any]]]] = None
+_author_index_mtime: Optional[float] = None
+
+
+def bill_text_path(chamber: str, bill_number: int, store_dir: str = BILL_TEXT_STORE_DIR) -> str:
+    return os.path.join(store_dir, chamber.lower(), f"{int(bill_number)}.json.gz")
+
+
+def load_bill_text(chamber: str, bill_number: str) -> Optional[Dict[str, Any]]:
+    """
+    Returns a bill's stored record, or None when it is not in the store.
+
+    The record has 'chamber', 'bill_number', 'author', 'caption', 'source' and
+    'sections', a list of {'article_number', 'section_number', 'content'} in bill order.
+    """
+    chamber = chamber.strip().capitalize()
+    if chamber not in CHAMBERS:
+        return None
+    try:
+        path = bill_text_path(chamber, int(bill_number))
+    except ValueError:
+        return None
+    try:
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        print(f"⚠️ Unreadable bill text at {path}: {e}")
+        return None
+
+
+def load_author_index() -> Optional[Dict[str, List[Dict[str, Any]]]]:
+    """Returns the author index, reloading it when the seeder rewrites the file, or None if missing."""
+    global _author_index, _author_index_mtime
+    path = os.path.join(BILL_TEXT_STORE_DIR, "authors.json")
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        return None
+
+    with _author_index_lock:
+        if _author_index is None or mtime != _author_index_mtime:
+            try:
+                with open(path, encoding="utf-8") as f:
+                    _author_index = json.load(f)
+                _author_index_mtime = mtime
+            except (OSError, ValueError) as e:
+                print(f"⚠️ Unreadable bill author index at {path}: {e}")
+                return None
+        return _author_index
+
+
+def list_bills_by_author(author_name: str) -> Optional[List[Dict[str, Any]]]:
+    """
+    Returns the stored bills for an author (an empty list if they have none), or
+    None when the store has not been seeded. Authors match exactly, as in Chroma.
+    """
+    index = load_author_index()
+    if index is None:
+        return None
+    return index.get(author_name, [])
@@ -0,0 +1,194 @@
+# services/chunk_embedding_cache.py
+import json
+import os
+import re
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process locking, use one directory per process
+    fcntl = None
+
+
+class ChunkEmbeddingCache:
+    """
+    A content-addressed, on-disk cache of chunk embeddings for one model.
+
+    Vectors live in a fixed-capacity float32 memmap (`<model>.f32`) and an
+    append-only log (`<model>.index.jsonl`) maps each content hash to its row:
+    a header line, then one `[hash, row]` line per write, later lines winning.
+    When the array is full, the least recently written row is overwritten.
+
+    Several processes (e.g. uvicorn workers) may share a directory: every read
+    and write holds an flock on `<model>.lock` and first replays whatever the
+    other processes appended to the log, so a hash never resolves to a row that
+    has since been reused for another chunk.
+
+    Args:
+        directory: Where the array, index log and lock file are stored.
+        model_name: Embedding model the vectors come from; part of the file names.
+        capacity: Maximum number of vectors kept.
+    """
+
+    # The log is rewritten with only the live entries once it holds this many
+    # times `capacity` lines.
+    COMPACT_FACTOR = 4
+
+    def __init__(self, directory: str, model_name: str, capacity: int = 50000):
+        self.directory = directory
+        self.model_name = model_name
+        self.capacity = capacity
+        os.makedirs(directory, exist_ok=True)
+        safe_name = re.sub(r"[^\w.-]", "_", model_name)
+        self.array_path = os.path.join(directory, f"{safe_name}.f32")
+        self.index_path = os.path.join(directory, f"{safe_name}.index.jsonl")
+        self.lock_path = os.path.join(directory, f"{safe_name}.lock")
+
+        self._lock = threading.Lock()
+        self._lock_file = open(self.lock_path, "a+")
+        self._vectors: Optional[np.memmap] = None
+        self._dim: Optional[int] = None
+        # content hash -> row, least recently written first
+        self._slots: "OrderedDict[str, int]" = OrderedDict()
+        self._slot_keys: Dict[int, str] = {}
+        # How much of the index log has been replayed, and which file it was
+        self._index_id = None
+        self._index_offset = 0
+        self._log_entries = 0
+
+    @contextmanager
+    def _locked(self, exclusive: bool):
+        with self._lock:
+            if fcntl is not None:
+                fcntl.flock(self._lock_file, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            try:
+                self._sync()
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(self._lock_file, fcntl.LOCK_UN)
+
+    def _reset(self):
+        self._vectors, self._dim = None, None
+        self._slots, self._slot_keys = OrderedDict(), {}
+        self._index_id, self._index_offset, self._log_entries = None, 0, 0
+
+    def _sync(self):
+        """Replays index lines written since the last sync, reloading fully if the log was replaced."""
+        try:
+            stat = os.stat(self.index_path)
+        except FileNotFoundError:
+            self._reset()
+            return
+        index_id = (stat.st_dev, stat.st_ino)
+        if index_id != self._index_id or stat.st_size < self._index_offset:
+            self._reset()
+        if stat.st_size == self._index_offset:
+            return
+        try:
+            with open(self.index_path, "rb") as f:
+                f.seek(self._index_offset)
+                data = f.read()
+            # Only replay complete lines; a torn tail is picked up on the next sync
+            data = data[:data.rfind(b"\n") + 1]
+            lines = data.decode("utf-8").splitlines()
+            if self._index_id is None:
+                if not self._open_array(json.loads(lines[0])):
+                    return
+                lines = lines[1:]
+            for line in lines:
+                key, slot = json.loads(line)
+                self._assign(key, int(slot))
+            self._log_entries += len(lines)
+            self._index_id = index_id
+            self._index_offset += len(data)
+        except (OSError, ValueError, KeyError, IndexError) as e:
+            print(f"⚠️ Ignoring unreadable chunk embedding cache at {self.directory}: {e}")
+            self._reset()
+
+    def _open_array(self, header: Dict) -> bool:
+        if header.get("model_name") != self.model_name or header.get("capacity") != self.capacity:
+            return False
+        self._dim = int(header["dim"])
+        self._vectors = np.memmap(self.array_path, dtype=np.float32, mode="r+", shape=(self.capacity, self._dim))
+        return True
+
+    def _assign(self, key: str, slot: int):
+        previous = self._slot_keys.get(slot)
+        if previous is not None and previous != key:
+            del self._slots[previous]
+        self._slots[key] = slot
+        self._slots.move_to_end(key)
+        self._slot_keys[slot] = key
+
+    def _header(self) -> str:
+        return json.dumps({"model_name": self.model_name, "capacity": self.capacity, "dim": self._dim})
+
+    def _write_index(self):
+        """Replaces the log with a header and the live entries."""
+        lines = [self._header()] + [json.dumps([key, slot]) for key, slot in self._slots.items()]
+        data = ("\n".join(lines) + "\n").encode("utf-8")
+        tmp_path = f"{self.index_path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, self.index_path)
+        stat = os.stat(self.index_path)
+        self._index_id = (stat.st_dev, stat.st_ino)
+        self._index_offset = len(data)
+        self._log_entries = len(self._slots)
+
+    def _create(self, dim: int):
+        self._dim = dim
+        self._vectors = np.memmap(self.array_path, dtype=np.float32, mode="w+", shape=(self.capacity, dim))
+        self._slots, self._slot_keys = OrderedDict(), {}
+        self._write_index()
+
+    def __len__(self) -> int:
+        with self._locked(exclusive=False):
+            return len(self._slots)
+
+    def get_many(self, keys: List[str]) -> Dict[str, np.ndarray]:
+        """Returns copies of the cached vectors for whichever keys are present."""
+        found = {}
+        with self._locked(exclusive=False):
+            if self._vectors is None:
+                return found
+            for key in keys:
+                slot = self._slots.get(key)
+                if slot is not None:
+                    found[key] = np.array(self._vectors[slot])
+        return found
+
+    def put_many(self, keys: List[str], vectors: np.ndarray):
+        """Stores vectors under their keys, evicting the least recently written rows when full."""
+        if len(keys) == 0:
+            return
+        vectors = np.asarray(vectors, dtype=np.float32)
+        with self._locked(exclusive=True):
+            if self._vectors is None or self._dim != vectors.shape[1]:
+                self._create(vectors.shape[1])
+            lines = []
+            for key, vector in zip(keys, vectors):
+                slot = self._slots.get(key)
+                if slot is None:
+                    if len(self._slots) < self.capacity:
+                        slot = len(self._slots)
+                    else:
+                        slot = next(iter(self._slots.values()))
+                self._assign(key, slot)
+                self._vectors[slot] = vector
+                lines.append(json.dumps([key, slot]))
+            # Rows are durable before the index lines that point at them
+            self._vectors.flush()
+            if self._log_entries + len(lines) > self.COMPACT_FACTOR * self.capacity:
+                self._write_index()
+                return
+            data = ("\n".join(lines) + "\n").encode("utf-8")
+            with open(self.index_path, "ab") as f:
+                f.write(data)
+            self._index_offset += len(data)
+            self._log_entries += len(lines)
@@ -1,27 +1,133 @@
-import requests
+import asyncio
+import re
+import tempfile
+import threading
+import unicodedata
+import httpx
 import os
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional
 from dotenv import load_dotenv
+from services import http_client
+from services.disk_cache import SQLiteCache
 
-def get_representative_by_address(address: str, district_type: str):
-    # """
-    # Queries the Cicero Data Civic Information API to find elected official information for a user's address.
+load_dotenv()
 
-    # Args:
-    #     address (str): The address to search for (e.g., "301 Trail View Ln, Garland, TX 75043").
+# Overridable so a local stub server can stand in for Cicero in tests.
+CICERO_BASE_URL = os.getenv("CICERO_BASE_URL", "https://app.cicerodata.com/v3.1/official")
+# District assignments for an address change only with redistricting, so
+# cached lookups stay valid for a long time (30 days by default).
+CICERO_CACHE_TTL_SECONDS = float(os.getenv("CICERO_CACHE_TTL_SECONDS", 30 * 86400))
+CICERO_CACHE_PATH = os.getenv("CICERO_CACHE_PATH", os.path.join(tempfile.gettempdir(), "cicero_cache.sqlite3"))
 
-    # Returns:
-    #     A dictionary containing the API response, or None if an error occurs.
-    # """
-    load_dotenv()
+STREET_ABBREVIATIONS = {
+    "street": "st", "road": "rd", "avenue": "ave", "lane": "ln", "drive": "dr",
+    "boulevard": "blvd", "court": "ct", "circle": "cir", "parkway": "pkwy",
+    "highway": "hwy", "place": "pl", "terrace": "ter", "trail": "trl",
+    "north": "n", "south": "s", "east": "e", "west": "w",
+}
 
+
+def normalize_address(address: str) -> str:
+    """
+    Folds an address so trivially different spellings share a cache entry:
+    case-folded, punctuation dropped, whitespace collapsed and common street
+    words abbreviated ("601 West Renner Road, Richardson" -> "601 w renner rd richardson").
+    """
+    folded = unicodedata.normalize("NFKC", address).casefold()
+    tokens = re.sub(r"[^\w\s#-]", " ", folded).split()
+    return " ".join(STREET_ABBREVIATIONS.get(token, token) for token in tokens)
+
+
+# Every district level the agent answers "who are all my representatives" with.
+ALL_DISTRICT_TYPES = ("STATE_LOWER", "STATE_UPPER", "NATIONAL_LOWER", "NATIONAL_UPPER")
+
+
+def make_lookup_key(address: str, district_type: str) -> str:
+    return f"{district_type.strip().upper()}|{normalize_address(address)}"
+
+
+# Persistent lookup cache, shared by every worker on the host through one SQLite file.
+_lookup_cache = None
+_lookup_cache_lock = threading.Lock()
+
+
+def get_lookup_cache() -> SQLiteCache:
+    global _lookup_cache
+    if _lookup_cache is None:
+        with _lookup_cache_lock:
+            if _lookup_cache is None:
+                _lookup_cache = SQLiteCache(CICERO_CACHE_PATH, ttl=CICERO_CACHE_TTL_SECONDS)
+    return _lookup_cache
+
+
+# In-flight lookups by cache key. Concurrent callers for the same key wait on
+# the first caller's request instead of sending their own.
+_inflight: Dict[str, "asyncio.Future"] = {}
+
+async def aget_representative_by_address(address: str, district_type: str):
+    """
+    Queries the Cicero Data API for the elected officials of an address at one
+    district level (e.g. "STATE_LOWER"), through the shared http_client layer so
+    an agent tool waiting on Cicero never blocks the event loop.
+
+    Results are served from the persistent lookup cache when possible, and
+    concurrent lookups of the same address and district type share one request.
+    """
+    cache_key = make_lookup_key(address, district_type)
+    return await _cached_single_flight(
+        cache_key, lambda: _afetch_representative_by_address(address, district_type)
+    )
+
+async def _acache_get(cache_key: str):
+    # SQLiteCache blocks (up to its busy timeout when other workers write), so keep it off the event loop.
+    return await asyncio.to_thread(lambda: get_lookup_cache().get(cache_key))
+
+async def _acache_set(cache_key: str, value: Any):
+    await asyncio.to_thread(lambda: get_lookup_cache().set(cache_key, value))
+
+async def _cached_single_flight(
+    cache_key: str,
+    fetch: Callable[[], Awaitable[Any]],
+    should_cache: Callable[[Any], bool] = lambda result: result is not None
+):
+    """
+    Returns the cached value for `cache_key`, otherwise awaits `fetch()` and caches
+    its result when `should_cache(result)` (by default, when it is not None).
+    Concurrent callers for the same key share one fetch.
+    """
+    inflight = _inflight.get(cache_key)
+    if inflight is not None:
+        return await asyncio.shield(inflight)
+
+    cached = await _acache_get(cache_key)
+    if cached is not None:
+        print(f"Cicero cache hit for '{cache_key}'.")
+        return cached
+
+    # Another caller may have started the same lookup while the cache was read.
+    inflight = _inflight.get(cache_key)
+    if inflight is not None:
+        return await asyncio.shield(inflight)
+
+    future = asyncio.get_running_loop().create_future()
+    _inflight[cache_key] = future
+    result = None
+    try:
+        result = await fetch()
+        if should_cache(result):
+            await _acache_set(cache_key, result)
+    finally:
+        _inflight.pop(cache_key, None)
+        # Waiters get None (a failed lookup) if this request was cancelled.
+        future.set_result(result)
+    return result
+
+async def _afetch_representative_by_address(address: str, district_type: str):
     api_key = os.getenv("CICERO_DATA_API_KEY")
     if not api_key:
         print("❌ Error: CICERO_DATA_API_KEY not found in .env file.")
         return None
 
-    # end url example: https://app.cicerodata.com/v3.1/official?search_loc=601 W Renner Rd. Richardson, TX 75080&district_type=STATE_LOWER 
-    base_url = "https://app.cicerodata.com/v3.1/official?"
-    
     params = {
         "key": api_key,
         "search_loc": address,
@@ -29,25 +135,120 @@ def get_representative_by_address(address: str, district_type: str):
     }
 
     try:
-        print(f"Querying Google Civic API for address: '{address}'...")
-        response = requests.get(base_url, params=params)
-
-        # Raise an exception for bad status codes (4xx or 5xx)
+        print(f"Querying Cicero Civic API for address: '{address}'...")
+        response = await http_client.get(CICERO_BASE_URL, params=params)
         response.raise_for_status()
 
         print("✅ Successfully retrieved data from Cicero Civic API.")
         return response.json()
 
-    except requests.exceptions.HTTPError as http_err:
+    except httpx.HTTPStatusError as http_err:
         print(f"❌ HTTP error occurred: {http_err}")
-        print(f"Response Body: {response.text}")
-    except requests.exceptions.RequestException as req_err:
+        print(f"Response Body: {http_err.response.text}")
+    except httpx.HTTPError as req_err:
         print(f"❌ A request error occurred: {req_err}")
     except Exception as err:
         print(f"❌ An unexpected error occurred: {err}")
-        
+
     return None
 
+def _group_officials_by_district_type(response_data: Dict[str, Any]) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Groups the officials in a Cicero response by office.district.district_type.
+
+    Handles both response shapes: officials listed under each geocoding
+    candidate, and officials listed directly under results.
+    """
+    results = (response_data or {}).get("response", {}).get("results", {}) or {}
+    officials = list(results.get("officials") or [])
+    # Every candidate geocodes the same address; take the first that has officials.
+    for candidate in results.get("candidates") or []:
+        if candidate.get("officials"):
+            officials.extend(candidate["officials"])
+            break
+
+    grouped: Dict[str, List[Dict[str, Any]]] = {}
+    for official in officials:
+        district_type = ((official.get("office") or {}).get("district") or {}).get("district_type")
+        if district_type:
+            grouped.setdefault(district_type, []).append(official)
+    return grouped
+
+async def aget_all_representatives_by_address(
+    address: str,
+    district_types: Iterable[str] = ALL_DISTRICT_TYPES
+) -> Optional[Dict[str, Any]]:
+    """
+    Finds the officials for every requested district level of an address at once.
+
+    Cicero accepts several district_type parameters, so one request normally
+    geocodes the address and returns every level. Any level missing from that
+    response is fetched with concurrent per-level lookups. The combined result
+    is cached like single-level lookups, but only when every level resolved;
+    a transient failure on one level must not cache "no officials" for it.
+
+    Returns:
+        {"address": ..., "districts": {district_type: [official, ...]}}, plus
+        "unresolved": [district_type, ...] listing levels whose lookup failed,
+        or None if no level could be resolved.
+    """
+    district_types = [district_type.strip().upper() for district_type in district_types]
+    cache_key = make_lookup_key(address, "+".join(sorted(district_types)))
+    return await _cached_single_flight(
+        cache_key,
+        lambda: _afetch_all_representatives_by_address(address, district_types),
+        should_cache=lambda result: result is not None and not result.get("unresolved")
+    )
+
+async def _afetch_all_representatives_by_address(address: str, district_types: List[str]):
+    api_key = os.getenv("CICERO_DATA_API_KEY")
+    if not api_key:
+        print("❌ Error: CICERO_DATA_API_KEY not found in .env file.")
+        return None
+
+    params = [("key", api_key), ("search_loc", address)]
+    params += [("district_type", district_type) for district_type in district_types]
+
+    grouped: Dict[str, List[Dict[str, Any]]] = {}
+    try:
+        print(f"Querying Cicero Civic API for address: '{address}' ({', '.join(district_types)})...")
+        response = await http_client.get(CICERO_BASE_URL, params=params)
+        response.raise_for_status()
+        grouped = _group_officials_by_district_type(response.json())
+    except httpx.HTTPStatusError as http_err:
+        print(f"❌ HTTP error occurred: {http_err}")
+        print(f"Response Body: {http_err.response.text}")
+    except httpx.HTTPError as req_err:
+        print(f"❌ A request error occurred: {req_err}")
+    except Exception as err:
+        print(f"❌ An unexpected error occurred: {err}")
+
+    missing = [district_type for district_type in district_types if district_type not in grouped]
+    unresolved = []
+    if missing:
+        print(f"Fetching remaining district types separately: {', '.join(missing)}")
+        responses = await asyncio.gather(
+            *(aget_representative_by_address(address, district_type) for district_type in missing)
+        )
+        for district_type, response_data in zip(missing, responses):
+            if response_data is None:
+                # The lookup failed, as opposed to Cicero reporting no officials.
+                unresolved.append(district_type)
+                continue
+            officials = _group_officials_by_district_type(response_data).get(district_type)
+            if officials:
+                grouped[district_type] = officials
+
+    if not grouped:
+        return None
+    result = {
+        "address": address,
+        "districts": {district_type: grouped.get(district_type, []) for district_type in district_types}
+    }
+    if unresolved:
+        result["unresolved"] = unresolved
+    return result
+
 if __name__ == "__main__":
     # empty main function for testing purposes
     pass
@@ -0,0 +1,174 @@
+# services/database_pool.py
+import asyncio
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator
+import asyncpg
+import psycopg2
+from psycopg2 import pool as psycopg2_pool
+from dotenv import load_dotenv
+
+# Pooled PostgreSQL connections shared by the legislator services and tools.
+# A psycopg2 pool serves the sync functions and an asyncpg pool serves the
+# event-loop tool path; both use the same size limits and statement timeout.
+
+load_dotenv()
+
+DB_POOL_MIN_SIZE = int(os.getenv('DB_POOL_MIN_SIZE', 1))
+DB_POOL_MAX_SIZE = int(os.getenv('DB_POOL_MAX_SIZE', 10))
+DB_STATEMENT_TIMEOUT_MS = int(os.getenv('DB_STATEMENT_TIMEOUT_MS', 5000))
+# Connections idle longer than this are pinged with SELECT 1 before reuse.
+DB_POOL_HEALTH_CHECK_SECONDS = float(os.getenv('DB_POOL_HEALTH_CHECK_SECONDS', 30))
+
+
+def get_connection_params() -> Dict[str, str]:
+    return {
+        'dbname': os.getenv('POSTGRES_DB'),
+        'user': os.getenv('POSTGRES_USER'),
+        'password': os.getenv('POSTGRES_PASSWORD'),
+        'host': os.getenv('DB_HOST'),
+        'port': os.getenv('DB_PORT')
+    }
+
+
+# --- Sync (psycopg2) pool ---
+
+_pool_lock = threading.Lock()
+_pool = None
+# ThreadedConnectionPool raises when exhausted; the semaphore makes callers wait instead.
+_pool_slots = threading.BoundedSemaphore(DB_POOL_MAX_SIZE)
+
+
+class PooledConnection(psycopg2.extensions.connection):
+    """A psycopg2 connection that remembers when it was last returned to the pool."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.last_used = time.monotonic()
+
+
+def get_pool() -> psycopg2_pool.ThreadedConnectionPool:
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                print(f"Creating PostgreSQL connection pool (min={DB_POOL_MIN_SIZE}, max={DB_POOL_MAX_SIZE})...")
+                _pool = psycopg2_pool.ThreadedConnectionPool(
+                    DB_POOL_MIN_SIZE,
+                    DB_POOL_MAX_SIZE,
+                    connection_factory=PooledConnection,
+                    options=f"-c statement_timeout={DB_STATEMENT_TIMEOUT_MS}",
+                    **get_connection_params()
+                )
+    return _pool
+
+
+def _is_healthy(conn: PooledConnection) -> bool:
+    if conn.closed:
+        return False
+    if time.monotonic() - conn.last_used < DB_POOL_HEALTH_CHECK_SECONDS:
+        return True
+    try:
+        with conn.cursor() as cur:
+            cur.execute("SELECT 1;")
+        return True
+    except psycopg2.Error:
+        return False
+
+
+def _prepare(conn: PooledConnection) -> bool:
+    # Autocommit must be set before the ping, which would otherwise open a transaction.
+    try:
+        conn.autocommit = True
+    except psycopg2.Error:
+        return False
+    return _is_healthy(conn)
+
+
+def _checkout(pool: psycopg2_pool.ThreadedConnectionPool) -> PooledConnection:
+    """Gets a ready connection, replacing a broken one once. Never leaks a checked-out connection."""
+    conn = pool.getconn()
+    try:
+        if _prepare(conn):
+            return conn
+    except BaseException:
+        pool.putconn(conn, close=True)
+        raise
+    pool.putconn(conn, close=True)
+
+    conn = pool.getconn()
+    try:
+        conn.autocommit = True
+    except BaseException:
+        pool.putconn(conn, close=True)
+        raise
+    return conn
+
+
+@contextmanager
+def get_connection() -> Iterator["psycopg2.extensions.connection"]:
+    """
+    Checks a connection out of the pool for the duration of a `with` block.
+
+    Connections are in autocommit mode (the legislator queries are read-only),
+    health-checked when they have been idle, and discarded instead of returned
+    if they broke while in use.
+    """
+    pool = get_pool()
+    with _pool_slots:
+        conn = _checkout(pool)
+        try:
+            yield conn
+        finally:
+            conn.last_used = time.monotonic()
+            pool.putconn(conn, close=bool(conn.closed))
+
+
+def close_pool():
+    """Closes every pooled psycopg2 connection on application shutdown."""
+    global _pool
+    if _pool is not None:
+        _pool.closeall()
+        _pool = None
+
+
+# --- Async (asyncpg) pool ---
+
+_async_pool = None
+_async_pool_lock = None
+
+
+async def get_async_pool() -> asyncpg.Pool:
+    """
+    Returns the shared asyncpg connection pool, creating it inside the running event loop.
+    """
+    global _async_pool, _async_pool_lock
+    if _async_pool is None:
+        if _async_pool_lock is None:
+            _async_pool_lock = asyncio.Lock()
+        async with _async_pool_lock:
+            if _async_pool is None:
+                params = get_connection_params()
+                _async_pool = await asyncpg.create_pool(
+                    database=params['dbname'],
+                    user=params['user'],
+                    password=params['password'],
+                    host=params['host'],
+                    port=int(params['port'] or 5432),
+                    min_size=DB_POOL_MIN_SIZE,
+                    max_size=DB_POOL_MAX_SIZE,
+                    # Recycle idle connections so a restarted database is picked up cleanly.
+                    max_inactive_connection_lifetime=DB_POOL_HEALTH_CHECK_SECONDS * 10,
+                    server_settings={'statement_timeout': str(DB_STATEMENT_TIMEOUT_MS)}
+                )
+    return _async_pool
+
+
+async def close_async_pool():
+    """Closes the asyncpg pool on application shutdown."""
+    global _async_pool
+    if _async_pool is not None:
+        await _async_pool.close()
+        _async_pool = None
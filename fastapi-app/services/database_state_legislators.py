@@ -1,6 +1,11 @@
-import os
+import asyncpg
 import psycopg2
 from psycopg2 import sql # Import the 'sql' module for safe query composition
+from services.database_pool import get_connection, get_async_pool
+from services.legislator_directory import legislator_directory
+
+ALLOWED_TABLES = {"house_representatives", "senate_senators"}
+ALLOWED_COLUMNS = {"district_number", "full_name"}
 
 def query_legislator(table_name: str, column: str, value: str | int):
     """
@@ -9,31 +14,22 @@ def query_legislator(table_name: str, column: str, value: str | int):
     """
     # --- 1. Security: Validate table and column names against an allowlist ---
     # This prevents SQL injection by ensuring only known, safe names are used.
-    allowed_tables = {"house_representatives", "senate_senators"}
-    allowed_columns = {"district_number", "full_name"}
-
-    if table_name not in allowed_tables:
+    if table_name not in ALLOWED_TABLES:
         print(f"❌ Error: Invalid table name '{table_name}'. Aborting query.")
         return None
-    if column not in allowed_columns:
+    if column not in ALLOWED_COLUMNS:
         print(f"❌ Error: Invalid column name '{column}'. Aborting query.")
         return None
 
-    # --- Database Connection ---
-    conn_params = {
-        'dbname': os.getenv('POSTGRES_DB'),
-        'user': os.getenv('POSTGRES_USER'),
-        'password': os.getenv('POSTGRES_PASSWORD'),
-        'host': os.getenv('DB_HOST'),
-        'port': os.getenv('DB_PORT')
-    }
-    
-    record_to_return = None
+    # Serve from the in-memory directory; only a miss goes to the database.
+    record_to_return = legislator_directory.lookup(table_name, column, value)
+    if record_to_return is not None:
+        return record_to_return
 
     # --- 2. Idiomatic Python: Use 'with' statements for resource management ---
     try:
-        # The 'with' statement ensures the connection is always closed properly.
-        with psycopg2.connect(**conn_params) as conn:
+        # The 'with' statement borrows a pooled connection and always returns it.
+        with get_connection() as conn:
             with conn.cursor() as cur:
                 
                 # --- 3. Case-Insensitive & Secure Query Construction ---
@@ -66,12 +62,53 @@ def query_legislator(table_name: str, column: str, value: str | int):
     except psycopg2.Error as e:
         print(f"❌ Error connecting to PostgreSQL or executing query: {e}")
         
-    # The 'with' statements handle closing, but we print for clarity
-    if 'conn' in locals() and conn.closed:
-        print("\nDatabase connection closed.")
-        
     return record_to_return
 
+async def aquery_legislator(table_name: str, column: str, value: str | int):
+    """
+    Async counterpart of query_legislator() backed by the asyncpg pool,
+    so agent tools never block the event loop on a database round trip.
+    """
+    if table_name not in ALLOWED_TABLES:
+        print(f"❌ Error: Invalid table name '{table_name}'. Aborting query.")
+        return None
+    if column not in ALLOWED_COLUMNS:
+        print(f"❌ Error: Invalid column name '{column}'. Aborting query.")
+        return None
+
+    if column != 'full_name':
+        # asyncpg needs an int for the integer column; agents may pass "12" or "twelve".
+        try:
+            value = int(value)
+        except (TypeError, ValueError):
+            print(f"❌ Error: Invalid {column} '{value}'. Aborting query.")
+            return None
+
+    directory_record = legislator_directory.lookup(table_name, column, value)
+    if directory_record is not None:
+        return directory_record
+
+    # Table and column are checked against the allowlists above, so quoting
+    # them as identifiers here is safe; the value is always a bind parameter.
+    if column == 'full_name':
+        sql_query = f'SELECT * FROM "{table_name}" WHERE LOWER("{column}") = LOWER($1);'
+    else:
+        sql_query = f'SELECT * FROM "{table_name}" WHERE "{column}" = $1;'
+
+    try:
+        pool = await get_async_pool()
+        print(f"Querying table '{table_name}' where {column} = '{value}'...")
+        record = await pool.fetchrow(sql_query, value)
+    except (asyncpg.PostgresError, OSError) as e:
+        print(f"❌ Error connecting to PostgreSQL or executing query: {e}")
+        return None
+
+    if record is None:
+        print(f"⚠️ Query successful, but no record found for {column} = '{value}'.")
+        return None
+    print(f"✅ Query successful! Record found.")
+    return dict(record)
+
 def get_all_legislators_from_chamber(table_name: str):
     """
     Retrieves all records from a specified legislator table.
@@ -88,29 +125,25 @@ def get_all_legislators_from_chamber(table_name: str):
         print(f"❌ Error: Invalid table '{table_name}'.")
         return []
 
-    conn_params = { 'dbname': os.getenv('POSTGRES_DB'), 'user': os.getenv('POSTGRES_USER'), 'password': os.getenv('POSTGRES_PASSWORD'), 'host': os.getenv('DB_HOST'), 'port': os.getenv('DB_PORT') }
-    conn = None
+    if legislator_directory.loaded:
+        return legislator_directory.records(table_name)
+
     results = []
     try:
-        conn = psycopg2.connect(**conn_params)
-        cur = conn.cursor()
-        sql_query = f"SELECT * FROM {table_name};"
-        cur.execute(sql_query)
-        
-        # Fetch all records
-        records = cur.fetchall()
-        
-        if records:
-            colnames = [desc[0] for desc in cur.description]
-            for record in records:
-                results.append(dict(zip(colnames, record)))
-        
-        cur.close()
+        with get_connection() as conn:
+            with conn.cursor() as cur:
+                sql_query = f"SELECT * FROM {table_name};"
+                cur.execute(sql_query)
+
+                # Fetch all records
+                records = cur.fetchall()
+
+                if records:
+                    colnames = [desc[0] for desc in cur.description]
+                    for record in records:
+                        results.append(dict(zip(colnames, record)))
     except psycopg2.Error as e:
         print(f"❌ Error during query: {e}")
-    finally:
-        if conn is not None:
-            conn.close()
     return results
 
 if __name__ == "__main__":
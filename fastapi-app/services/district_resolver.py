@@ -0,0 +1,168 @@
+# services/district_resolver.py
+import json
+import math
+import os
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from dotenv import load_dotenv
+
+# Offline point-to-district resolution from locally stored boundary files.
+# Maps a geocoded point to its Texas House, Senate and congressional district
+# numbers in-process, without a Cicero or Google Civic round trip.
+
+load_dotenv()
+
+DISTRICT_BOUNDARIES_DIR = os.getenv(
+    "DISTRICT_BOUNDARIES_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "districts")
+)
+# One GeoJSON FeatureCollection per district level, in WGS84 longitude/latitude.
+DISTRICT_BOUNDARY_FILES = {
+    "STATE_LOWER": os.getenv("DISTRICT_BOUNDARIES_HOUSE_FILE", "texas_house.geojson"),
+    "STATE_UPPER": os.getenv("DISTRICT_BOUNDARIES_SENATE_FILE", "texas_senate.geojson"),
+    "NATIONAL_LOWER": os.getenv("DISTRICT_BOUNDARIES_CONGRESSIONAL_FILE", "texas_congressional.geojson"),
+}
+# Feature properties that may hold the district number, in order of preference
+# (Texas Legislative Council exports use "District", Census TIGER files use the others).
+DISTRICT_NUMBER_PROPERTIES = ("District", "DISTRICT", "district", "district_number", "SLDLST", "SLDUST", "CD118FP", "CD119FP")
+# Grid cell size in degrees; about 0.1 degrees keeps each cell's candidate list short.
+DISTRICT_GRID_CELL_DEGREES = float(os.getenv("DISTRICT_GRID_CELL_DEGREES", 0.1))
+
+Ring = List[Tuple[float, float]]
+Polygon = List[Ring]  # Outer ring followed by any holes.
+
+
+def _point_in_ring(x: float, y: float, ring: Ring) -> bool:
+    """Ray-casting test of a point against one closed ring."""
+    inside = False
+    j = len(ring) - 1
+    for i in range(len(ring)):
+        xi, yi = ring[i]
+        xj, yj = ring[j]
+        if (yi > y) != (yj > y) and x < (xj - xi) * (y - yi) / (yj - yi) + xi:
+            inside = not inside
+        j = i
+    return inside
+
+
+def _point_in_polygon(x: float, y: float, polygon: Polygon) -> bool:
+    if not _point_in_ring(x, y, polygon[0]):
+        return False
+    return not any(_point_in_ring(x, y, hole) for hole in polygon[1:])
+
+
+def _feature_polygons(geometry: Dict[str, Any]) -> List[Polygon]:
+    if geometry["type"] == "Polygon":
+        coordinates = [geometry["coordinates"]]
+    elif geometry["type"] == "MultiPolygon":
+        coordinates = geometry["coordinates"]
+    else:
+        return []
+    return [[[(float(p[0]), float(p[1])) for p in ring] for ring in polygon] for polygon in coordinates]
+
+
+def _district_number(properties: Dict[str, Any]) -> Optional[int]:
+    for name in DISTRICT_NUMBER_PROPERTIES:
+        value = properties.get(name)
+        if value is not None:
+            try:
+                return int(value)
+            except (TypeError, ValueError):
+                continue
+    return None
+
+
+class DistrictIndex:
+    """
+    A uniform-grid spatial index over the district polygons of one level.
+
+    Each grid cell lists the polygons whose bounding box overlaps it, so a
+    lookup only runs point-in-polygon tests against a handful of candidates.
+    """
+
+    def __init__(self, features: Iterable[Dict[str, Any]], cell_degrees: float = DISTRICT_GRID_CELL_DEGREES):
+        self.cell_degrees = cell_degrees
+        self._polygons: List[Tuple[int, Polygon, Tuple[float, float, float, float]]] = []
+        self._grid: Dict[Tuple[int, int], List[int]] = {}
+
+        for feature in features:
+            district = _district_number(feature.get("properties") or {})
+            if district is None or not feature.get("geometry"):
+                continue
+            for polygon in _feature_polygons(feature["geometry"]):
+                xs = [x for x, _ in polygon[0]]
+                ys = [y for _, y in polygon[0]]
+                bbox = (min(xs), min(ys), max(xs), max(ys))
+                polygon_id = len(self._polygons)
+                self._polygons.append((district, polygon, bbox))
+                for cx in range(self._cell(bbox[0]), self._cell(bbox[2]) + 1):
+                    for cy in range(self._cell(bbox[1]), self._cell(bbox[3]) + 1):
+                        self._grid.setdefault((cx, cy), []).append(polygon_id)
+
+    def _cell(self, degrees: float) -> int:
+        return math.floor(degrees / self.cell_degrees)
+
+    def __len__(self) -> int:
+        return len(self._polygons)
+
+    def lookup(self, longitude: float, latitude: float) -> Optional[int]:
+        """Returns the district number containing the point, or None."""
+        for polygon_id in self._grid.get((self._cell(longitude), self._cell(latitude)), ()):
+            district, polygon, (min_x, min_y, max_x, max_y) = self._polygons[polygon_id]
+            if min_x <= longitude <= max_x and min_y <= latitude <= max_y and _point_in_polygon(longitude, latitude, polygon):
+                return district
+        return None
+
+    @classmethod
+    def from_geojson(cls, path: str) -> "DistrictIndex":
+        with open(path, encoding="utf-8") as f:
+            collection = json.load(f)
+        return cls(collection.get("features", []))
+
+
+_indexes: Optional[Dict[str, DistrictIndex]] = None
+_indexes_lock = threading.Lock()
+
+
+def get_district_indexes() -> Dict[str, DistrictIndex]:
+    """
+    Loads and indexes every boundary file found in DISTRICT_BOUNDARIES_DIR once.
+    Levels whose file is missing are left out.
+    """
+    global _indexes
+    if _indexes is None:
+        with _indexes_lock:
+            if _indexes is None:
+                indexes = {}
+                for district_type, filename in DISTRICT_BOUNDARY_FILES.items():
+                    path = os.path.join(DISTRICT_BOUNDARIES_DIR, filename)
+                    if not os.path.exists(path):
+                        print(f"⚠️ District boundaries for {district_type} not found at {path}.")
+                        continue
+                    indexes[district_type] = DistrictIndex.from_geojson(path)
+                    print(f"✅ Indexed {len(indexes[district_type])} {district_type} district polygons.")
+                _indexes = indexes
+    return _indexes
+
+
+def district_boundaries_available() -> bool:
+    return bool(get_district_indexes())
+
+
+def resolve_districts(latitude: float, longitude: float) -> Dict[str, Optional[int]]:
+    """
+    Maps a geocoded point to its district numbers.
+
+    Args:
+        latitude: WGS84 latitude of the address.
+        longitude: WGS84 longitude of the address.
+
+    Returns:
+        A dictionary from district type ('STATE_LOWER', 'STATE_UPPER',
+        'NATIONAL_LOWER') to the district number, or None when the point falls
+        outside every district. Levels without boundary data are omitted.
+    """
+    return {
+        district_type: index.lookup(longitude, latitude)
+        for district_type, index in get_district_indexes().items()
+    }
@@ -0,0 +1,43 @@
+# services/embedding_cache.py
+import unicodedata
+from typing import List
+from langchain_core.embeddings import Embeddings
+from services.ttl_cache import TTLCache
+
+
+def normalize_query_text(text: str) -> str:
+    """
+    Normalizes query text so trivially different phrasings share a cache entry:
+    Unicode NFKC, case-folded, with whitespace collapsed. Both configured
+    embedding models (legal-bert-base-uncased, all-mpnet-base-v2) are uncased,
+    so this does not change the resulting vector.
+    """
+    return " ".join(unicodedata.normalize("NFKC", text).casefold().split())
+
+
+class CachedQueryEmbeddings(Embeddings):
+    """
+    Wraps an embedding model with an LRU + TTL cache for query embeddings.
+
+    Queries are keyed on (model_name, normalized text) and the normalized text is
+    what gets embedded, so a cache hit returns exactly what a miss would compute.
+    Document embeddings are passed straight through; they are only computed at
+    seeding time.
+    """
+
+    def __init__(self, embeddings: Embeddings, model_name: str, maxsize: int = 2048, ttl: float = 86400):
+        self.embeddings = embeddings
+        self.model_name = model_name
+        self.cache = TTLCache(maxsize=maxsize, ttl=ttl)
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self.embeddings.embed_documents(texts)
+
+    def embed_query(self, text: str) -> List[float]:
+        normalized = normalize_query_text(text)
+        key = (self.model_name, normalized)
+        vector = self.cache.get(key)
+        if vector is None:
+            vector = self.embeddings.embed_query(normalized)
+            self.cache.set(key, vector)
+        return vector
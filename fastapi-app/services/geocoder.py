@@ -0,0 +1,59 @@
+# services/geocoder.py
+import os
+from typing import Optional, Tuple
+import httpx
+from dotenv import load_dotenv
+from services import http_client
+from services.cicero_data_api import normalize_address
+from services.ttl_cache import TTLCache
+
+# Address -> (latitude, longitude) for the offline district resolver.
+# Uses the U.S. Census Bureau geocoder, which needs no API key; GEOCODER_URL
+# can point at a compatible service (or a local stub in tests).
+
+load_dotenv()
+
+GEOCODER_URL = os.getenv("GEOCODER_URL", "https://geocoding.geo.census.gov/geocoder/locations/onelineaddress")
+GEOCODER_BENCHMARK = os.getenv("GEOCODER_BENCHMARK", "Public_AR_Current")
+GEOCODER_CACHE_SIZE = int(os.getenv("GEOCODER_CACHE_SIZE", 4096))
+GEOCODER_CACHE_TTL_SECONDS = float(os.getenv("GEOCODER_CACHE_TTL_SECONDS", 30 * 86400))
+
+_geocode_cache = TTLCache(maxsize=GEOCODER_CACHE_SIZE, ttl=GEOCODER_CACHE_TTL_SECONDS)
+
+
+async def ageocode_address(address: str) -> Optional[Tuple[float, float]]:
+    """
+    Geocodes a one-line U.S. address.
+
+    Returns:
+        (latitude, longitude) of the best match, or None if the address could
+        not be matched or the geocoder is unavailable.
+    """
+    cache_key = normalize_address(address)
+    cached = _geocode_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    params = {"address": address, "benchmark": GEOCODER_BENCHMARK, "format": "json"}
+    try:
+        print(f"Geocoding address: '{address}'...")
+        response = await http_client.get(GEOCODER_URL, params=params)
+        response.raise_for_status()
+        matches = response.json().get("result", {}).get("addressMatches") or []
+    except httpx.HTTPError as err:
+        print(f"❌ Geocoding request failed: {err}")
+        return None
+    except ValueError as err:
+        print(f"❌ Unreadable geocoder response: {err}")
+        return None
+
+    if not matches:
+        print(f"No geocoder match for address: '{address}'.")
+        return None
+    coordinates = matches[0].get("coordinates") or {}
+    try:
+        point = (float(coordinates["y"]), float(coordinates["x"]))
+    except (KeyError, TypeError, ValueError):
+        return None
+    _geocode_cache.set(cache_key, point)
+    return point
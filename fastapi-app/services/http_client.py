@@ -0,0 +1,168 @@
+# services/http_client.py
+import asyncio
+import os
+import random
+import time
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+import httpx
+from dotenv import load_dotenv
+
+# Shared outbound HTTP layer for the civic data APIs (Cicero, Google Civic).
+# One pooled keep-alive client, a concurrency limit per upstream host,
+# bounded retries with jittered exponential backoff, and a circuit breaker
+# that fails fast while an upstream is down. Configuration is read once here.
+
+load_dotenv()
+
+HTTP_TIMEOUT_SECONDS = float(os.getenv("HTTP_TIMEOUT_SECONDS", 15))
+HTTP_CONNECT_TIMEOUT_SECONDS = float(os.getenv("HTTP_CONNECT_TIMEOUT_SECONDS", 5))
+HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", 20))
+HTTP_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("HTTP_MAX_KEEPALIVE_CONNECTIONS", 10))
+HTTP_PER_HOST_CONCURRENCY = int(os.getenv("HTTP_PER_HOST_CONCURRENCY", 8))
+HTTP_MAX_RETRIES = int(os.getenv("HTTP_MAX_RETRIES", 3))
+HTTP_BACKOFF_BASE_SECONDS = float(os.getenv("HTTP_BACKOFF_BASE_SECONDS", 0.5))
+HTTP_BACKOFF_MAX_SECONDS = float(os.getenv("HTTP_BACKOFF_MAX_SECONDS", 8))
+# Consecutive failures that open a host's circuit, and how long it stays open.
+HTTP_BREAKER_FAILURE_THRESHOLD = int(os.getenv("HTTP_BREAKER_FAILURE_THRESHOLD", 5))
+HTTP_BREAKER_RESET_SECONDS = float(os.getenv("HTTP_BREAKER_RESET_SECONDS", 30))
+
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+class CircuitOpenError(httpx.HTTPError):
+    """Raised without contacting the upstream while its circuit is open."""
+
+
+class CircuitBreaker:
+    """
+    Per-host circuit breaker.
+
+    Closed: requests flow. After HTTP_BREAKER_FAILURE_THRESHOLD consecutive
+    failures it opens and rejects requests for HTTP_BREAKER_RESET_SECONDS.
+    Then it lets a single trial request through (half-open); success closes
+    it again, failure re-opens it.
+    """
+
+    def __init__(self, failure_threshold: int = HTTP_BREAKER_FAILURE_THRESHOLD, reset_seconds: float = HTTP_BREAKER_RESET_SECONDS):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._trial_in_flight = False
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_seconds:
+            return "half_open"
+        return "open"
+
+    def allow(self) -> bool:
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "half_open" and not self._trial_in_flight:
+            self._trial_in_flight = True
+            return True
+        return False
+
+    def record_success(self):
+        self.failures = 0
+        self.opened_at = None
+        self._trial_in_flight = False
+
+    def record_failure(self):
+        self.failures += 1
+        if self._trial_in_flight or self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+        self._trial_in_flight = False
+
+    def release_trial(self):
+        """Frees the half-open trial slot when a request ended without a verdict (e.g. it was cancelled)."""
+        self._trial_in_flight = False
+
+
+_client: Optional[httpx.AsyncClient] = None
+_host_semaphores: Dict[str, asyncio.Semaphore] = {}
+_breakers: Dict[str, CircuitBreaker] = {}
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Returns the shared keep-alive client, creating it on first use."""
+    global _client
+    if _client is None:
+        _client = httpx.AsyncClient(
+            timeout=httpx.Timeout(HTTP_TIMEOUT_SECONDS, connect=HTTP_CONNECT_TIMEOUT_SECONDS),
+            limits=httpx.Limits(
+                max_connections=HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=HTTP_MAX_KEEPALIVE_CONNECTIONS
+            )
+        )
+    return _client
+
+
+async def close_http_client():
+    """Closes the shared client on application shutdown."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+def _backoff_seconds(attempt: int, response: Optional[httpx.Response] = None) -> float:
+    """Full-jitter exponential backoff, honouring a numeric Retry-After header."""
+    if response is not None:
+        retry_after = response.headers.get("Retry-After")
+        if retry_after and retry_after.isdigit():
+            return min(float(retry_after), HTTP_BACKOFF_MAX_SECONDS)
+    return random.uniform(0, min(HTTP_BACKOFF_MAX_SECONDS, HTTP_BACKOFF_BASE_SECONDS * 2 ** attempt))
+
+
+async def get(url: str, params=None, **kwargs) -> httpx.Response:
+    """
+    GETs `url` through the shared client.
+
+    Transport errors and retryable status codes (429 and 5xx gateway errors)
+    are retried up to HTTP_MAX_RETRIES times. The final response is returned
+    as-is, so callers still decide what to do with its status.
+
+    Raises:
+        CircuitOpenError: The host's circuit is open; no request was sent.
+        httpx.HTTPError: The request failed on every attempt.
+    """
+    host = urlsplit(url).netloc
+    breaker = _breakers.setdefault(host, CircuitBreaker())
+    semaphore = _host_semaphores.setdefault(host, asyncio.Semaphore(HTTP_PER_HOST_CONCURRENCY))
+
+    attempt = 0
+    while True:
+        if not breaker.allow():
+            raise CircuitOpenError(f"Circuit open for {host}; skipping request.")
+
+        response = None
+        try:
+            async with semaphore:
+                response = await get_http_client().get(url, params=params, **kwargs)
+        except httpx.TransportError:
+            breaker.record_failure()
+            if attempt >= HTTP_MAX_RETRIES:
+                raise
+        except BaseException:
+            # Cancellation or a non-transport error says nothing about the upstream's
+            # health, but must not hold the half-open trial slot forever.
+            breaker.release_trial()
+            raise
+        else:
+            if response.status_code not in RETRYABLE_STATUS_CODES:
+                breaker.record_success()
+                return response
+            breaker.record_failure()
+            if attempt >= HTTP_MAX_RETRIES:
+                return response
+
+        delay = _backoff_seconds(attempt, response)
+        print(f"⚠️ Request to {host} failed (attempt {attempt + 1}); retrying in {delay:.2f}s.")
+        await asyncio.sleep(delay)
+        attempt += 1
@@ -1,47 +1,20 @@
-import os
-from dotenv import load_dotenv
+import asyncio
 from typing import List, Dict, Tuple, Optional, Any
 from langchain_core.documents import Document
-from langchain_huggingface import HuggingFaceEmbeddings
-import chromadb
 from langchain_chroma import Chroma
+from services.vector_store import get_vectorstore, get_query_embeddings, aget_collection
 import json
 
-_vectorstore_instance = None
-
-def get_vectorstore():
-    global _vectorstore_instance
-    if _vectorstore_instance is None:
-        print("Initializing vector store from Search Service...")
-        load_dotenv()
-        embedding_model_name = os.environ.get('LEGISLATIVE_EMBEDDING_MODEL_NAME')
-        collection_name = os.environ.get('LEGISLATIVE_CHROMA_COLLECTION_NAME')
-        chroma_host = os.environ.get('CHROMA_SERVER_HOST')
-        chroma_port = int(os.environ.get('CHROMA_SERVER_PORT'))
-        
-        embeddings = HuggingFaceEmbeddings(model_name=embedding_model_name)
-        client = chromadb.HttpClient(host=chroma_host, port=chroma_port)
-        _vectorstore_instance = Chroma(
-            client=client,
-            collection_name=collection_name,
-            embedding_function=embeddings
-        )
-    return _vectorstore_instance
-
-def create_dynamic_retriever(
-    vectorstore: Chroma,
+def build_bill_filter(
     bill_number: int,
     chamber: str,
-    article_title: Optional[str]=None, 
-    article_number: Optional[str]=None, 
-    section_number: Optional[str]=None,
-    k: int = 25
-) -> any:
+    article_title: Optional[str]=None,
+    article_number: Optional[str]=None,
+    section_number: Optional[str]=None
+) -> Optional[Dict[str, Any]]:
     """
-    Creates a LangChain retriever with a dynamic metadata filter and document limit.
+    Builds the ChromaDB `where` filter that restricts a search to one bill.
     """
-    search_kwargs = {"k": k}
-    
     # ChromaDB's `where` filter requires an operator like '$and' or '$or'
     # when combining multiple conditions.
     filter_conditions = []
@@ -57,8 +30,28 @@ def create_dynamic_retriever(
         filter_conditions.append({"section_number": {"$eq": section_number}})
 
     # Combine all conditions with an '$and' operator.
-    if len(filter_conditions) > 0:
-        search_kwargs["filter"] = {"$and": filter_conditions}
+    if len(filter_conditions) > 1:
+        return {"$and": filter_conditions}
+    if filter_conditions:
+        return filter_conditions[0]
+    return None
+
+def create_dynamic_retriever(
+    vectorstore: Chroma,
+    bill_number: int,
+    chamber: str,
+    article_title: Optional[str]=None, 
+    article_number: Optional[str]=None, 
+    section_number: Optional[str]=None,
+    k: int = 25
+) -> any:
+    """
+    Creates a LangChain retriever with a dynamic metadata filter and document limit.
+    """
+    search_kwargs = {"k": k}
+    filter_dict = build_bill_filter(bill_number, chamber, article_title, article_number, section_number)
+    if filter_dict:
+        search_kwargs["filter"] = filter_dict
 
     return vectorstore.as_retriever(search_kwargs=search_kwargs)
 
@@ -92,4 +85,22 @@ def run_search_service_on_single_bill(query: str, bill_number: int, chamber: str
             "metadata": meta,
         }
         final_results.append(result)
-    return final_results
\ No newline at end of file
+    return final_results
+
+async def arun_search_service_on_single_bill(query: str, bill_number: int, chamber: str, article_title: Optional[str]=None, article_number: Optional[str]=None, section_number: Optional[str]=None, k: int=25) -> List[Dict[str, Any]]:
+    """
+    Async counterpart of run_search_service_on_single_bill() for use on the event loop.
+    Queries Chroma with the async client and embeds the query in a worker thread.
+    """
+    query_embedding = await asyncio.to_thread(get_query_embeddings().embed_query, query)
+    collection = await aget_collection()
+    response = await collection.query(
+        query_embeddings=[query_embedding],
+        n_results=k,
+        where=build_bill_filter(bill_number, chamber, article_title, article_number, section_number),
+        include=["documents", "metadatas"],
+    )
+    return [
+        {"content": content, "metadata": metadata}
+        for content, metadata in zip(response["documents"][0], response["metadatas"][0])
+    ]
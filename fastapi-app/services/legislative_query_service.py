@@ -1,30 +1,56 @@
 import os
-from dotenv import load_dotenv
-from typing import List, Dict, Any
-from langchain_huggingface import HuggingFaceEmbeddings
-import chromadb
-from langchain_chroma import Chroma
-
-_vectorstore_instance = None
-
-def get_vectorstore():
-    global _vectorstore_instance
-    if _vectorstore_instance is None:
-        print("Initializing vector store from Query Service...")
-        load_dotenv()
-        embedding_model_name = os.environ.get('LEGISLATIVE_EMBEDDING_MODEL_NAME')
-        collection_name = os.environ.get('LEGISLATIVE_CHROMA_COLLECTION_NAME')
-        chroma_host = os.environ.get('CHROMA_SERVER_HOST')
-        chroma_port = int(os.environ.get('CHROMA_SERVER_PORT'))
-        
-        embeddings = HuggingFaceEmbeddings(model_name=embedding_model_name)
-        client = chromadb.HttpClient(host=chroma_host, port=chroma_port)
-        _vectorstore_instance = Chroma(
-            client=client,
-            collection_name=collection_name,
-            embedding_function=embeddings
+from typing import List, Dict, Any, Iterator, AsyncIterator
+from services.vector_store import get_vectorstore, aget_collection
+
+# Number of documents fetched from Chroma per page.
+QUERY_PAGE_SIZE = int(os.environ.get('QUERY_PAGE_SIZE', 200))
+
+def iter_query_service(
+    filter_dict: Dict,
+    batch_size: int = QUERY_PAGE_SIZE
+) -> Iterator[Dict[str, Any]]:
+    """
+    Streams every document matching a metadata filter, one page at a time.
+    This function does NOT perform a semantic search.
+
+    Documents are fetched from Chroma in `limit`/`offset` batches and yielded as
+    they arrive, so memory stays bounded by one page no matter how many
+    documents match.
+
+    Args:
+        filter_dict: The dictionary defining the metadata filter (e.g., {"author": "Curry"}).
+        batch_size: The number of documents to request from Chroma per page.
+
+    Yields:
+        One dictionary per matching document with its id, content and metadata.
+    """
+    vectorstore = get_vectorstore()
+
+    if not filter_dict:
+        print("Warning: An empty filter was provided. Returning no documents.")
+        return
+
+    print(f"Streaming documents matching filter: {filter_dict} (page size {batch_size})")
+
+    offset = 0
+    while True:
+        results = vectorstore.get(
+            where=filter_dict,
+            limit=batch_size,
+            offset=offset,
+            include=["metadatas", "documents"],
         )
-    return _vectorstore_instance
+        ids = results.get("ids") or []
+        documents = results.get("documents") or []
+        metadatas = results.get("metadatas") or []
+
+        for i in range(len(ids)):
+            yield {"id": ids[i], "content": documents[i], "metadata": metadatas[i]}
+
+        # A short page means Chroma has nothing left for this filter.
+        if len(ids) < batch_size:
+            break
+        offset += batch_size
 
 def run_query_service(
     filter_dict: Dict
@@ -34,44 +60,63 @@ def run_query_service(
     Retrieves ALL documents from the vector store that match a metadata filter.
     This function does NOT perform a semantic search.
 
+    Use iter_query_service() instead when the caller can consume documents
+    incrementally; this function collects every page into a list.
+
     Args:
-        vectorstore: The initialized Chroma vector store object.
         filter_dict: The dictionary defining the metadata filter (e.g., {"author": "Curry"}).
 
     Returns:
         A list of dictionaries, where each dictionary represents a
         document matching the filter.
     """
-    vectorstore = get_vectorstore()
-    
-    if not filter_dict:
-        print("Warning: An empty filter was provided. Returning no documents.")
-        return []
-
-    print(f"Fetching all documents matching filter: {filter_dict}")
+    response_documents = list(iter_query_service(filter_dict))
 
-    # The .get() method performs the direct, filter-based retrieval.
-    # It fetches all matching documents by default if no limit is specified.
-    results = vectorstore.get(
-        where=filter_dict,
-        include=["metadatas", "documents"],
-    )
-
-    # Check if any documents were returned by looking at the 'ids' list
-    if not results.get("ids"):
+    if not response_documents:
         print("Found 0 documents matching the filter.")
         return []
 
-    # Format the results into a simple list of dictionaries for API serialization.
-    response_documents = []
-    ids = results.get("ids", [])
-    documents = results.get("documents", [])
-    metadatas = results.get("metadatas", [])
+    print(f"Found and returning {len(response_documents)} documents.")
+    return response_documents
 
-    for i in range(len(ids)):
-        response_documents.append(
-            {"id": ids[i], "content": documents[i], "metadata": metadatas[i]}
+async def aiter_query_service(
+    filter_dict: Dict,
+    batch_size: int = QUERY_PAGE_SIZE
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Async counterpart of iter_query_service() that pages through Chroma with
+    the async HTTP client, so the event loop is never blocked on the fetch.
+    """
+    if not filter_dict:
+        print("Warning: An empty filter was provided. Returning no documents.")
+        return
+
+    collection = await aget_collection()
+    offset = 0
+    while True:
+        results = await collection.get(
+            where=filter_dict,
+            limit=batch_size,
+            offset=offset,
+            include=["metadatas", "documents"],
         )
-    
+        ids = results.get("ids") or []
+        documents = results.get("documents") or []
+        metadatas = results.get("metadatas") or []
+
+        for i in range(len(ids)):
+            yield {"id": ids[i], "content": documents[i], "metadata": metadatas[i]}
+
+        if len(ids) < batch_size:
+            break
+        offset += batch_size
+
+async def arun_query_service(
+    filter_dict: Dict
+) -> List[Dict[str, Any]]:
+    """
+    Async counterpart of run_query_service(): collects every matching document.
+    """
+    response_documents = [document async for document in aiter_query_service(filter_dict)]
     print(f"Found and returning {len(response_documents)} documents.")
-    return response_documents
\ No newline at end of file
+    return response_documents
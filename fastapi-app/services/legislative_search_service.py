@@ -1,50 +1,67 @@
+import asyncio
 import os
-from dotenv import load_dotenv
 from typing import List, Dict, Tuple, Optional, Any
+import numpy as np
 from langchain_core.documents import Document
-from langchain_huggingface import HuggingFaceEmbeddings
-import chromadb
 from langchain_chroma import Chroma
+from services.vector_store import (
+    get_vectorstore, get_collection_version, get_query_embeddings, aget_collection, aget_collection_version,
+    get_distance_space, embeddings_unit_norm, BILL_SUMMARY_COLLECTION_NAME
+)
+from services.search_result_cache import search_result_cache, make_search_cache_key
 
-_vectorstore_instance = None
-
-def get_vectorstore():
-    global _vectorstore_instance
-    if _vectorstore_instance is None:
-        print("Initializing vector store from Search Service...")
-        load_dotenv()
-        embedding_model_name = os.environ.get('LEGISLATIVE_EMBEDDING_MODEL_NAME')
-        collection_name = os.environ.get('LEGISLATIVE_CHROMA_COLLECTION_NAME')
-        chroma_host = os.environ.get('CHROMA_SERVER_HOST')
-        chroma_port = int(os.environ.get('CHROMA_SERVER_PORT'))
-        
-        embeddings = HuggingFaceEmbeddings(model_name=embedding_model_name)
-        client = chromadb.HttpClient(host=chroma_host, port=chroma_port)
-        _vectorstore_instance = Chroma(
-            client=client,
-            collection_name=collection_name,
-            embedding_function=embeddings
-        )
-    return _vectorstore_instance
+# Section hits retrieved per search. Bills are ranked on hit similarity rather
+# than hit count, so a modest k ranks as well as the old k=50.
+SEARCH_DEFAULT_K = int(os.environ.get('SEARCH_DEFAULT_K', 20))
+# How section hits are combined into a bill ranking: 'max', 'sum' or 'rrf'.
+SEARCH_SCORE_AGGREGATION = os.environ.get('SEARCH_SCORE_AGGREGATION', 'rrf')
+# Damping constant for reciprocal-rank fusion.
+RRF_K = 60
+# Bills returned by a discovery search against the bill summary collection when
+# the caller does not pass k (the agent tools use this).
+SEARCH_BILL_K = int(os.environ.get('SEARCH_BILL_K', 10))
+# Section hits fetched per candidate bill when a discovery search drills into sections.
+SEARCH_SECTIONS_PER_BILL = int(os.environ.get('SEARCH_SECTIONS_PER_BILL', 3))
+
+# Section collection version for which the summary collection was found missing.
+# Discovery searches skip it until a reseed changes that version.
+_summary_missing_for_version: Optional[str] = None
+
+def build_search_filter(
+    author: Optional[str] = None,
+    bill_number: Optional[str] = None,
+    chamber: Optional[str] = None
+) -> Optional[Dict[str, Any]]:
+    """
+    Builds a ChromaDB `where` filter from the optional search filters.
+    ChromaDB requires an '$and' operator when combining multiple conditions.
+    """
+    filter_conditions = []
+    if author:
+        filter_conditions.append({"author": author})
+    if bill_number:
+        filter_conditions.append({"bill_number": bill_number})
+    if chamber:
+        filter_conditions.append({"chamber": chamber})
+
+    if not filter_conditions:
+        return None
+    if len(filter_conditions) == 1:
+        return filter_conditions[0]
+    return {"$and": filter_conditions}
 
 def create_dynamic_retriever(
     vectorstore: Chroma,
     author: Optional[str] = None,
     bill_number: Optional[str] = None,
     chamber: Optional[str] = None,
-    k: int = 50
+    k: int = SEARCH_DEFAULT_K
 ) -> any:
     """
     Creates a LangChain retriever with a dynamic metadata filter and document limit.
     """
     search_kwargs = {"k": k}
-    filter_dict = {}
-    if author:
-        filter_dict["author"] = author
-    if bill_number:
-        filter_dict["bill_number"] = bill_number
-    if chamber:
-        filter_dict["chamber"] = chamber
+    filter_dict = build_search_filter(author, bill_number, chamber)
 
     if filter_dict:
         search_kwargs["filter"] = filter_dict
@@ -52,42 +69,199 @@ def create_dynamic_retriever(
     return vectorstore.as_retriever(search_kwargs=search_kwargs)
 
 
+def distances_to_similarities(distances: List[float], space: str, unit_norm: bool = True) -> np.ndarray:
+    """
+    Converts Chroma distances to similarities in [0, 1].
+
+    'cosine' and 'ip' distances are 1 - similarity. 'l2' is the squared
+    Euclidean distance, which for unit-length embeddings equals
+    2 - 2 * cosine similarity. When the stored embeddings are not unit length
+    (`unit_norm` False) no calibrated conversion exists, so 1 / (1 + distance)
+    is used: it keeps the ranking without collapsing every score to 0.
+    """
+    distances = np.asarray(distances, dtype=np.float32)
+    if space == "l2" and not unit_norm:
+        return 1.0 / (1.0 + np.maximum(distances, 0.0))
+    if space == "l2":
+        similarities = 1.0 - distances / 2.0
+    else:
+        similarities = 1.0 - distances
+    return np.clip(similarities, 0.0, 1.0)
+
+
 def process_and_dedupe_results(
-    results: List[Document]
-) -> Tuple[List[Document], Dict[Tuple[str, str], int]]:
+    results: List[Document],
+    similarities: Optional[np.ndarray] = None,
+    aggregation: str = SEARCH_SCORE_AGGREGATION
+) -> Tuple[List[Document], Dict[Tuple[str, str], int], Dict[Tuple[str, str], float]]:
     """
-    Counts, orders, and deduplicates retriever results by a composite key of (bill_number, chamber).
+    Groups retriever hits by a composite key of (bill_number, chamber), ranks the bills
+    and keeps each bill's most similar section.
+
+    Hits are aggregated per bill in one vectorized pass. `aggregation` picks the ranking:
+    'max' (best section), 'sum' (similarity mass) or 'rrf' (reciprocal-rank fusion).
+    Without similarities every hit counts as 1, which ranks by hit count.
+
+    Returns:
+        The best document per bill in ranked order, the hit count per bill, and the
+        calibrated relevance score per bill (its best section's similarity, 0-1).
     """
     if not results:
-        return [], {}
+        return [], {}, {}
 
-    bill_groups = {}
-    for doc in results:
-        bill_number = doc.metadata.get("bill_number", "N/A")
-        chamber = doc.metadata.get("chamber", "N/A")
-        bill_key = (bill_number, chamber)
+    bill_keys: List[Tuple[str, str]] = []
+    key_codes: Dict[Tuple[str, str], int] = {}
+    codes = np.empty(len(results), dtype=np.int64)
+    for i, doc in enumerate(results):
+        key = (doc.metadata.get("bill_number", "N/A"), doc.metadata.get("chamber", "N/A"))
+        if key not in key_codes:
+            key_codes[key] = len(bill_keys)
+            bill_keys.append(key)
+        codes[i] = key_codes[key]
 
-        if bill_key not in bill_groups:
-            bill_groups[bill_key] = {"best_doc": doc, "count": 1}
-        else:
-            bill_groups[bill_key]["count"] += 1
+    if similarities is None:
+        sims = np.ones(len(results), dtype=np.float32)
+        aggregation = "sum"
+    else:
+        sims = np.asarray(similarities, dtype=np.float32)
+    n_bills = len(bill_keys)
+
+    # Hits ordered best first; a bill's first hit in this order is its best section.
+    hit_order = np.argsort(-sims, kind="stable")
+    ranks = np.empty(len(sims), dtype=np.float32)
+    ranks[hit_order] = np.arange(len(sims), dtype=np.float32)
+    _, first_hit = np.unique(codes[hit_order], return_index=True)
+    best_hit = hit_order[first_hit]
+
+    counts = np.bincount(codes, minlength=n_bills)
+    max_scores = sims[best_hit]
+    if aggregation == "max":
+        rank_scores = max_scores
+    elif aggregation == "sum":
+        rank_scores = np.bincount(codes, weights=sims, minlength=n_bills)
+    else:
+        rank_scores = np.bincount(codes, weights=1.0 / (RRF_K + ranks + 1.0), minlength=n_bills)
+
+    # Rank by the aggregate, breaking ties with the best section's similarity.
+    bill_order = np.lexsort((-max_scores, -rank_scores))
+
+    final_docs = [results[best_hit[b]] for b in bill_order]
+    bill_counts = {bill_keys[b]: int(counts[b]) for b in bill_order}
+    bill_scores = {}
+    if similarities is not None:
+        bill_scores = {bill_keys[b]: round(float(max_scores[b]), 4) for b in bill_order}
+    return final_docs, bill_counts, bill_scores
 
-    sorted_groups = sorted(
-        bill_groups.values(), key=lambda x: x["count"], reverse=True
-    )
 
-    final_docs = [group["best_doc"] for group in sorted_groups]
+def _summaries_available(section_version: str) -> bool:
+    return bool(BILL_SUMMARY_COLLECTION_NAME) and _summary_missing_for_version != section_version
 
-    bill_counts = {}
-    for group in sorted_groups:
-        doc_meta = group["best_doc"].metadata
-        key = (doc_meta.get("bill_number", "N/A"), doc_meta.get("chamber", "N/A"))
-        bill_counts[key] = group["count"]
 
-    return final_docs, bill_counts
+def _mark_summaries_missing(section_version: str, error: Exception):
+    global _summary_missing_for_version
+    print(f"Bill summary collection unavailable, searching sections until the next reseed: {error}")
+    _summary_missing_for_version = section_version
 
 
-def run_search_service(query: str, author: Optional[str]=None, bill_number: Optional[str]=None, chamber: Optional[str]=None, k: int=50) -> List[Dict[str, Any]]:
+def _search_cache_version(section_version: str, bill_number: Optional[str], with_sections: bool) -> str:
+    # The aggregation method, the index used and whether sections were attached
+    # are part of the version, so changing any of them never serves stale results.
+    index = "bills" if _summaries_available(section_version) and not bill_number else "sections"
+    if index == "bills" and with_sections:
+        index = "bills+sections"
+    return f"{section_version}:{SEARCH_SCORE_AGGREGATION}:{index}"
+
+
+def _drill_down_filter(bill_results: List[Dict[str, Any]], author: Optional[str], chamber: Optional[str]) -> Dict[str, Any]:
+    """Restricts a section query to the bills a summary search returned."""
+    conditions = [{"bill_number": {"$in": list({result["bill_number"] for result in bill_results})}}]
+    base_filter = build_search_filter(author, None, chamber)
+    if base_filter:
+        conditions.append(base_filter)
+    return conditions[0] if len(conditions) == 1 else {"$and": conditions}
+
+
+def _drill_down_k(bill_results: List[Dict[str, Any]], k: int) -> int:
+    return max(k, len(bill_results) * SEARCH_SECTIONS_PER_BILL)
+
+
+def attach_best_sections(
+    bill_results: List[Dict[str, Any]],
+    section_docs: List[Document],
+    similarities: np.ndarray
+) -> List[Dict[str, Any]]:
+    """
+    Replaces each summary hit's caption content with its most similar section and
+    counts the bill's section hits. Bills keep their summary rank and score; bills
+    without a section hit keep their caption. Hits on bills outside `bill_results`
+    (same number, other chamber) are ignored.
+    """
+    best: Dict[Tuple[Any, Any], Tuple[float, Document]] = {}
+    counts: Dict[Tuple[Any, Any], int] = {}
+    for doc, similarity in zip(section_docs, similarities):
+        key = (doc.metadata.get("bill_number"), doc.metadata.get("chamber"))
+        counts[key] = counts.get(key, 0) + 1
+        if key not in best or similarity > best[key][0]:
+            best[key] = (float(similarity), doc)
+
+    drilled = []
+    for result in bill_results:
+        key = (result["bill_number"], result["chamber"])
+        if key not in best:
+            drilled.append(result)
+            continue
+        _, doc = best[key]
+        drilled.append({
+            **result,
+            "relevance_count": counts[key],
+            "content": doc.page_content,
+            "metadata": {
+                **result["metadata"],
+                "article_number": doc.metadata.get("article_number"),
+                "section_number": doc.metadata.get("section_number"),
+            },
+        })
+    return drilled
+
+
+def search_bill_summaries(query: str, author: Optional[str]=None, chamber: Optional[str]=None, k: int=SEARCH_BILL_K) -> List[Dict[str, Any]]:
+    """
+    Discovery search over the bill summary collection (one vector per bill).
+
+    Returns one result per bill with the bill's title and caption as content, or
+    an empty list when the collection has no match. Raises when the collection
+    is missing.
+    """
+    # Raises if the seeder has not built the collection; also records its distance space.
+    get_collection_version(BILL_SUMMARY_COLLECTION_NAME)
+    hits = get_vectorstore(BILL_SUMMARY_COLLECTION_NAME).similarity_search_with_score(
+        query, k=k, filter=build_search_filter(author, None, chamber)
+    )
+    similarities = distances_to_similarities(
+        [distance for _, distance in hits], get_distance_space(BILL_SUMMARY_COLLECTION_NAME), embeddings_unit_norm(BILL_SUMMARY_COLLECTION_NAME)
+    )
+    return format_search_results([doc for doc, _ in hits], similarities)
+
+
+async def asearch_bill_summaries(query_embedding: List[float], author: Optional[str]=None, chamber: Optional[str]=None, k: int=SEARCH_BILL_K) -> List[Dict[str, Any]]:
+    """Async counterpart of search_bill_summaries(), taking a precomputed query embedding."""
+    await aget_collection_version(BILL_SUMMARY_COLLECTION_NAME)
+    collection = await aget_collection(BILL_SUMMARY_COLLECTION_NAME)
+    response = await collection.query(
+        query_embeddings=[query_embedding],
+        n_results=k,
+        where=build_search_filter(author, None, chamber),
+        include=["documents", "metadatas", "distances"],
+    )
+    raw_results = [
+        Document(page_content=content, metadata=metadata or {})
+        for content, metadata in zip(response["documents"][0], response["metadatas"][0])
+    ]
+    similarities = distances_to_similarities(response["distances"][0], get_distance_space(BILL_SUMMARY_COLLECTION_NAME), embeddings_unit_norm(BILL_SUMMARY_COLLECTION_NAME))
+    return format_search_results(raw_results, similarities)
+
+
+def run_search_service(query: str, author: Optional[str]=None, bill_number: Optional[str]=None, chamber: Optional[str]=None, k: int=SEARCH_DEFAULT_K, with_sections: bool=False) -> List[Dict[str, Any]]:
     """
     Main entry point for the semantic search service.
 
@@ -96,17 +270,115 @@ def run_search_service(query: str, author: Optional[str]=None, bill_number: Opti
         author: Optional author filter.
         bill_number: Optional bill_number filter.
         chamber: Optional chamber filter.
-        k: The maximum number of documents to retrieve initially.
+        k: The maximum number of documents to retrieve initially: bills for a
+            discovery search, sections otherwise.
+        with_sections: For discovery searches, also fetch the best-matching
+            section of each bill (a section query restricted to those bills)
+            and use it as the result's content instead of the caption.
+
+    Discovery searches (no bill_number) query the bill summary collection first
+    and only fall back to scanning sections when it is unavailable or empty.
 
     Returns:
         A list of dictionaries, where each dictionary represents a
         processed, deduplicated, and API-friendly bill result.
+        Results may be served from the result cache and are shared between
+        callers, so treat them as read-only.
     """
-    # Get the singleton instance of the vector store
+    # Serve repeated searches from the cache until the corpus is reseeded
+    section_version = get_collection_version()
+    collection_version = _search_cache_version(section_version, bill_number, with_sections)
+    cache_key = make_search_cache_key(query, author, bill_number, chamber, k, collection_version)
+    cached_results = search_result_cache.get(cache_key)
+    if cached_results is not None:
+        return cached_results
+
     vectorstore = get_vectorstore()
-    retriever = create_dynamic_retriever(vectorstore, author, bill_number, chamber, k)
-    raw_results = retriever.invoke(query)
-    processed_docs, bill_counts = process_and_dedupe_results(raw_results)
+    if _summaries_available(section_version) and not bill_number:
+        try:
+            final_results = search_bill_summaries(query, author, chamber, k)
+        except Exception as e:
+            _mark_summaries_missing(section_version, e)
+            final_results = []
+        if final_results:
+            if with_sections:
+                hits = vectorstore.similarity_search_with_score(
+                    query, k=_drill_down_k(final_results, k), filter=_drill_down_filter(final_results, author, chamber)
+                )
+                similarities = distances_to_similarities([distance for _, distance in hits], get_distance_space(), embeddings_unit_norm())
+                final_results = attach_best_sections(final_results, [doc for doc, _ in hits], similarities)
+            search_result_cache.set(cache_key, final_results)
+            return final_results
+
+    hits = vectorstore.similarity_search_with_score(
+        query, k=k, filter=build_search_filter(author, bill_number, chamber)
+    )
+    raw_results = [doc for doc, _ in hits]
+    similarities = distances_to_similarities([distance for _, distance in hits], get_distance_space(), embeddings_unit_norm())
+    final_results = format_search_results(raw_results, similarities)
+    search_result_cache.set(cache_key, final_results)
+    return final_results
+
+
+async def _aquery_sections(query_embedding: List[float], k: int, where: Optional[Dict[str, Any]]) -> Tuple[List[Document], np.ndarray]:
+    collection = await aget_collection()
+    response = await collection.query(
+        query_embeddings=[query_embedding],
+        n_results=k,
+        where=where,
+        include=["documents", "metadatas", "distances"],
+    )
+    raw_results = [
+        Document(page_content=content, metadata=metadata or {})
+        for content, metadata in zip(response["documents"][0], response["metadatas"][0])
+    ]
+    return raw_results, distances_to_similarities(response["distances"][0], get_distance_space(), embeddings_unit_norm())
+
+
+async def arun_search_service(query: str, author: Optional[str]=None, bill_number: Optional[str]=None, chamber: Optional[str]=None, k: int=SEARCH_DEFAULT_K, with_sections: bool=False) -> List[Dict[str, Any]]:
+    """
+    Async counterpart of run_search_service() for use on the event loop.
+
+    Chroma is queried through the async HTTP client and the query embedding is
+    computed in a worker thread, so a slow search never blocks other requests.
+    Shares the result cache with run_search_service().
+    """
+    section_version = await aget_collection_version()
+    collection_version = _search_cache_version(section_version, bill_number, with_sections)
+    cache_key = make_search_cache_key(query, author, bill_number, chamber, k, collection_version)
+    cached_results = search_result_cache.get(cache_key)
+    if cached_results is not None:
+        return cached_results
+
+    query_embedding = await asyncio.to_thread(get_query_embeddings().embed_query, query)
+    if _summaries_available(section_version) and not bill_number:
+        try:
+            final_results = await asearch_bill_summaries(query_embedding, author, chamber, k)
+        except Exception as e:
+            _mark_summaries_missing(section_version, e)
+            final_results = []
+        if final_results:
+            if with_sections:
+                section_docs, similarities = await _aquery_sections(
+                    query_embedding, _drill_down_k(final_results, k), _drill_down_filter(final_results, author, chamber)
+                )
+                final_results = attach_best_sections(final_results, section_docs, similarities)
+            search_result_cache.set(cache_key, final_results)
+            return final_results
+
+    raw_results, similarities = await _aquery_sections(
+        query_embedding, k, build_search_filter(author, bill_number, chamber)
+    )
+    final_results = format_search_results(raw_results, similarities)
+    search_result_cache.set(cache_key, final_results)
+    return final_results
+
+
+def format_search_results(raw_results: List[Document], similarities: Optional[np.ndarray] = None) -> List[Dict[str, Any]]:
+    """
+    Deduplicates raw hits by bill and converts them into API-friendly dictionaries.
+    """
+    processed_docs, bill_counts, bill_scores = process_and_dedupe_results(raw_results, similarities)
     final_results = []
     for doc in processed_docs:
         meta = doc.metadata
@@ -116,8 +388,9 @@ def run_search_service(query: str, author: Optional[str]=None, bill_number: Opti
             "bill_number": bill_num,
             "chamber": cham,
             "relevance_count": bill_counts.get((bill_num, cham), 0),
+            "relevance_score": bill_scores.get((bill_num, cham)),
             "content": doc.page_content,
             "metadata": meta,
         }
         final_results.append(result)
-    return final_results
\ No newline at end of file
+    return final_results
@@ -0,0 +1,153 @@
+# services/legislator_directory.py
+import asyncio
+import os
+import re
+import time
+import unicodedata
+from typing import Any, Dict, List, Optional
+import asyncpg
+from dotenv import load_dotenv
+from services.database_pool import get_async_pool, get_connection_params
+
+# In-process directory of Texas legislators (150 House members, 31 senators).
+# The tables almost never change, so lookups by district or name are served
+# from memory and only fall back to PostgreSQL on a miss.
+
+load_dotenv()
+
+LEGISLATOR_TABLES = ("house_representatives", "senate_senators")
+LEGISLATOR_DIRECTORY_REFRESH_SECONDS = float(os.getenv('LEGISLATOR_DIRECTORY_REFRESH_SECONDS', 3600))
+# Retry interval while the database is unreachable.
+LEGISLATOR_DIRECTORY_RETRY_SECONDS = float(os.getenv('LEGISLATOR_DIRECTORY_RETRY_SECONDS', 30))
+# The seeder sends NOTIFY on this channel after (re)loading the tables.
+LEGISLATOR_NOTIFY_CHANNEL = os.getenv('LEGISLATOR_NOTIFY_CHANNEL', 'legislators_changed')
+
+
+def normalize_name(name: str) -> str:
+    """
+    Folds a legislator name for matching: accents removed, case-folded,
+    punctuation dropped and whitespace collapsed ("José  O'Rourke" -> "jose orourke").
+    """
+    decomposed = unicodedata.normalize("NFKD", name)
+    without_accents = "".join(c for c in decomposed if not unicodedata.combining(c))
+    without_punctuation = re.sub(r"[^\w\s]", "", without_accents.casefold())
+    return " ".join(without_punctuation.split())
+
+
+class LegislatorDirectory:
+    """
+    Holds every legislator record indexed by district number and by normalized
+    name, per table. A reload builds fresh indexes and swaps them in at once,
+    so readers never see a half-built directory.
+    """
+
+    def __init__(self):
+        self._records: Dict[str, List[Dict[str, Any]]] = {}
+        self._by_district: Dict[str, Dict[int, Dict[str, Any]]] = {}
+        self._by_name: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self.loaded_at: Optional[float] = None
+
+    @property
+    def loaded(self) -> bool:
+        return self.loaded_at is not None
+
+    def _build(self, records_by_table: Dict[str, List[Dict[str, Any]]]):
+        by_district = {}
+        by_name = {}
+        for table_name, records in records_by_table.items():
+            by_district[table_name] = {}
+            by_name[table_name] = {}
+            for record in records:
+                if record.get("district_number") is not None:
+                    by_district[table_name].setdefault(int(record["district_number"]), record)
+                if record.get("full_name"):
+                    by_name[table_name].setdefault(normalize_name(record["full_name"]), record)
+        self._records = records_by_table
+        self._by_district = by_district
+        self._by_name = by_name
+        self.loaded_at = time.time()
+        counts = ", ".join(f"{table}={len(records)}" for table, records in records_by_table.items())
+        print(f"✅ Legislator directory loaded ({counts}).")
+
+    async def aload(self):
+        """Loads both chamber tables through the asyncpg pool."""
+        pool = await get_async_pool()
+        records_by_table = {}
+        for table_name in LEGISLATOR_TABLES:
+            rows = await pool.fetch(f'SELECT * FROM "{table_name}";')
+            records_by_table[table_name] = [dict(row) for row in rows]
+        self._build(records_by_table)
+
+    def lookup(self, table_name: str, column: str, value: str | int) -> Optional[Dict[str, Any]]:
+        """
+        Returns a copy of the matching record, or None when the directory has no match
+        (including when it has not been loaded yet).
+        """
+        if column == "district_number":
+            try:
+                record = self._by_district.get(table_name, {}).get(int(value))
+            except (TypeError, ValueError):
+                return None
+        elif column == "full_name":
+            record = self._by_name.get(table_name, {}).get(normalize_name(str(value)))
+        else:
+            return None
+        return dict(record) if record is not None else None
+
+    def records(self, table_name: str) -> List[Dict[str, Any]]:
+        """Returns copies of every record in a table, or an empty list if not loaded."""
+        return [dict(record) for record in self._records.get(table_name, [])]
+
+
+legislator_directory = LegislatorDirectory()
+
+
+async def run_directory_refresh():
+    """
+    Loads the directory at startup, then reloads it every
+    LEGISLATOR_DIRECTORY_REFRESH_SECONDS or as soon as a NOTIFY arrives on
+    LEGISLATOR_NOTIFY_CHANNEL. Meant to run as a background task for the
+    lifetime of the app.
+    """
+    refresh_requested = asyncio.Event()
+    listener = None
+    try:
+        while True:
+            try:
+                await legislator_directory.aload()
+                wait_seconds = LEGISLATOR_DIRECTORY_REFRESH_SECONDS
+            except Exception as e:
+                # Keep the loop alive; lookups fall back to the database meanwhile.
+                print(f"⚠️ Could not load legislator directory: {e}")
+                wait_seconds = LEGISLATOR_DIRECTORY_RETRY_SECONDS
+
+            if listener is None or listener.is_closed():
+                listener = await _listen_for_changes(refresh_requested)
+
+            try:
+                await asyncio.wait_for(refresh_requested.wait(), timeout=wait_seconds)
+                print("Legislator tables changed; reloading directory.")
+            except asyncio.TimeoutError:
+                pass
+            refresh_requested.clear()
+    finally:
+        if listener is not None and not listener.is_closed():
+            await listener.close()
+
+
+async def _listen_for_changes(refresh_requested: asyncio.Event):
+    """Opens a dedicated connection that LISTENs for legislator table changes."""
+    params = get_connection_params()
+    try:
+        conn = await asyncpg.connect(
+            database=params['dbname'],
+            user=params['user'],
+            password=params['password'],
+            host=params['host'],
+            port=int(params['port'] or 5432)
+        )
+        await conn.add_listener(LEGISLATOR_NOTIFY_CHANNEL, lambda *args: refresh_requested.set())
+        return conn
+    except Exception as e:
+        print(f"⚠️ Could not LISTEN on '{LEGISLATOR_NOTIFY_CHANNEL}': {e}")
+        return None
@@ -0,0 +1,175 @@
+# services/legislator_name_index.py
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Set
+from services.legislator_directory import legislator_directory, normalize_name, LEGISLATOR_TABLES
+
+# Trigram index over legislator names for fuzzy and partial matching.
+# Handles nicknames ("Bob Hall" vs "Robert Hall"), missing or extra middle
+# initials, and small misspellings, without a database round trip.
+
+CHAMBER_BY_TABLE = {"house_representatives": "House", "senate_senators": "Senate"}
+
+# Common English nicknames mapped to one canonical given name, so both forms
+# of a name produce the same trigrams.
+NICKNAMES = {
+    "bob": "robert", "bobby": "robert", "rob": "robert", "robbie": "robert",
+    "bill": "william", "billy": "william", "will": "william", "willie": "william",
+    "jim": "james", "jimmy": "james", "jamie": "james",
+    "joe": "joseph", "joey": "joseph",
+    "mike": "michael", "mick": "michael",
+    "tom": "thomas", "tommy": "thomas",
+    "dick": "richard", "rick": "richard", "rich": "richard", "ricky": "richard",
+    "dan": "daniel", "danny": "daniel",
+    "dave": "david",
+    "chris": "christopher",
+    "tony": "anthony",
+    "steve": "steven", "stephen": "steven",
+    "ed": "edward", "eddie": "edward", "ted": "edward",
+    "greg": "gregory",
+    "jeff": "jeffrey", "geoff": "jeffrey",
+    "jon": "john", "johnny": "john", "jack": "john",
+    "ken": "kenneth", "kenny": "kenneth",
+    "larry": "lawrence",
+    "matt": "matthew",
+    "nate": "nathan", "nathaniel": "nathan",
+    "pat": "patrick",
+    "pete": "peter",
+    "ron": "ronald", "ronnie": "ronald",
+    "sam": "samuel", "sammy": "samuel",
+    "tim": "timothy",
+    "don": "donald", "donnie": "donald",
+    "charlie": "charles", "chuck": "charles",
+    "andy": "andrew", "drew": "andrew",
+    "ben": "benjamin",
+    "beth": "elizabeth", "liz": "elizabeth", "betsy": "elizabeth",
+    "kate": "katherine", "katie": "katherine", "kathy": "katherine", "cathy": "katherine",
+    "jenny": "jennifer", "jen": "jennifer",
+    "sue": "susan", "suzy": "susan",
+    "vicki": "victoria", "vicky": "victoria",
+}
+
+# Weight of an exact last-name match on top of the trigram similarity.
+LAST_NAME_WEIGHT = 0.2
+# Discount applied to containment (share of the query's trigrams found in the
+# name), which lets partial queries like a bare surname still rank.
+PARTIAL_MATCH_WEIGHT = 0.75
+
+
+def canonical_name(name: str) -> str:
+    """Normalizes a name, drops middle initials and maps nicknames to canonical given names."""
+    tokens = [token for token in normalize_name(name).split() if len(token) > 1]
+    return " ".join(NICKNAMES.get(token, token) for token in tokens)
+
+
+def trigrams(text: str) -> Set[str]:
+    """Word trigrams padded the way pg_trgm pads them: two spaces before, one after."""
+    grams = set()
+    for word in text.split():
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+class LegislatorNameIndex:
+    """
+    An inverted trigram index over the names of every legislator in the directory.
+    """
+
+    def __init__(self, records_by_table: Dict[str, List[Dict[str, Any]]]):
+        self._entries: List[Dict[str, Any]] = []
+        self._postings: Dict[str, List[int]] = defaultdict(list)
+        for table_name, records in records_by_table.items():
+            for record in records:
+                if not record.get("full_name"):
+                    continue
+                canonical = canonical_name(record["full_name"])
+                grams = trigrams(canonical)
+                entry_id = len(self._entries)
+                self._entries.append({
+                    "table": table_name,
+                    "record": record,
+                    "trigrams": grams,
+                    "last_name": canonical.split()[-1] if canonical else "",
+                })
+                for gram in grams:
+                    self._postings[gram].append(entry_id)
+
+    def search(self, name: str, table_name: Optional[str] = None, limit: int = 5, min_score: float = 0.3) -> List[Dict[str, Any]]:
+        """
+        Ranks legislators by similarity to `name`.
+
+        Score is the trigram similarity of the canonical names (Jaccard, or discounted
+        containment for partial queries), blended with a bonus for an exact
+        last-name match. Returns at most `limit` matches scoring
+        at least `min_score`, best first.
+        """
+        canonical = canonical_name(name)
+        query_grams = trigrams(canonical)
+        if not query_grams:
+            return []
+        query_last_name = canonical.split()[-1]
+
+        shared_counts: Dict[int, int] = defaultdict(int)
+        for gram in query_grams:
+            for entry_id in self._postings.get(gram, ()):
+                shared_counts[entry_id] += 1
+
+        matches = []
+        for entry_id, shared in shared_counts.items():
+            entry = self._entries[entry_id]
+            if table_name and entry["table"] != table_name:
+                continue
+            jaccard = shared / (len(query_grams) + len(entry["trigrams"]) - shared)
+            containment = shared / len(query_grams)
+            similarity = max(jaccard, PARTIAL_MATCH_WEIGHT * containment)
+            last_name_match = 1.0 if entry["last_name"] == query_last_name else 0.0
+            score = (1 - LAST_NAME_WEIGHT) * similarity + LAST_NAME_WEIGHT * last_name_match
+            if score >= min_score:
+                matches.append((score, entry))
+
+        matches.sort(key=lambda match: match[0], reverse=True)
+        return [
+            {
+                "chamber": CHAMBER_BY_TABLE.get(entry["table"], entry["table"]),
+                "district_number": entry["record"].get("district_number"),
+                "full_name": entry["record"].get("full_name"),
+                "score": round(score, 3),
+            }
+            for score, entry in matches[:limit]
+        ]
+
+
+_name_index: Optional[LegislatorNameIndex] = None
+_name_index_loaded_at: Optional[float] = None
+
+
+def get_name_index() -> LegislatorNameIndex:
+    """
+    Returns the name index for the current directory contents, rebuilding it
+    whenever the directory has been reloaded.
+    """
+    global _name_index, _name_index_loaded_at
+    if _name_index is None or _name_index_loaded_at != legislator_directory.loaded_at:
+        records_by_table = {table: legislator_directory.records(table) for table in LEGISLATOR_TABLES}
+        _name_index = LegislatorNameIndex(records_by_table)
+        _name_index_loaded_at = legislator_directory.loaded_at
+    return _name_index
+
+
+def search_legislators_by_name(name: str, chamber: Optional[str] = None, limit: int = 5) -> List[Dict[str, Any]]:
+    """
+    Fuzzy, partial legislator-name search over both chambers.
+
+    Args:
+        name: The (possibly partial or misspelled) name to look up.
+        chamber: Optional 'House' or 'Senate' to restrict the search.
+        limit: Maximum number of matches to return.
+
+    Returns:
+        Ranked matches with chamber, district_number, full_name and a 0-1 score.
+        Empty when nothing is similar enough or the directory is not loaded yet.
+    """
+    table_name = None
+    if chamber:
+        table_name = {"house": "house_representatives", "senate": "senate_senators"}.get(chamber.strip().lower())
+    return get_name_index().search(name, table_name=table_name, limit=limit)
@@ -0,0 +1,26 @@
+# services/llm_service.py
+import os
+import threading
+from dotenv import load_dotenv
+from langchain_ollama import ChatOllama
+
+load_dotenv()
+
+OLLAMA_BASE_URL = os.getenv("OLLAMA_BASE_URL")
+OLLAMA_MODEL = os.getenv("OLLAMA_MODEL")
+
+_lock = threading.Lock()
+_chat_model_instance = None
+
+
+def get_chat_model() -> ChatOllama:
+    """
+    Returns the process-wide ChatOllama client shared by every agent.
+    """
+    global _chat_model_instance
+    if _chat_model_instance is None:
+        with _lock:
+            if _chat_model_instance is None:
+                print(f"Initializing ChatOllama model '{OLLAMA_MODEL}' at {OLLAMA_BASE_URL}...")
+                _chat_model_instance = ChatOllama(base_url=OLLAMA_BASE_URL, model=OLLAMA_MODEL)
+    return _chat_model_instance
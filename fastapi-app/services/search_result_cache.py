@@ -0,0 +1,81 @@
+# services/search_result_cache.py
+import hashlib
+import json
+import os
+from typing import Any, Dict, List, Optional, Tuple
+from dotenv import load_dotenv
+from services.disk_cache import SQLiteCache
+from services.embedding_cache import normalize_query_text
+from services.ttl_cache import TTLCache
+
+# Result cache in front of run_search_service.
+# Keys include the collection version stamp, so a reseed makes every old entry
+# unreachable without an explicit flush.
+
+load_dotenv()
+
+SEARCH_RESULT_CACHE_SIZE = int(os.getenv("SEARCH_RESULT_CACHE_SIZE", 1024))
+SEARCH_RESULT_CACHE_MAX_BYTES = int(os.getenv("SEARCH_RESULT_CACHE_MAX_BYTES", 64 * 1024 * 1024))
+SEARCH_RESULT_CACHE_TTL_SECONDS = float(os.getenv("SEARCH_RESULT_CACHE_TTL_SECONDS", 86400))
+# Optional on-disk backend shared by workers; disabled when unset.
+SEARCH_RESULT_CACHE_PATH = os.getenv("SEARCH_RESULT_CACHE_PATH")
+
+
+def _json_size(value: Any) -> int:
+    return len(json.dumps(value))
+
+
+class SearchResultCache:
+    """
+    Two-tier cache for search results: a byte-capped in-memory LRU, optionally
+    backed by a SQLite file. Disk hits are promoted into memory.
+    """
+
+    def __init__(self, memory: TTLCache, disk: Optional[SQLiteCache] = None):
+        self.memory = memory
+        self.disk = disk
+
+    @staticmethod
+    def _disk_key(key: Tuple) -> str:
+        return hashlib.sha256(json.dumps(key).encode("utf-8")).hexdigest()
+
+    def get(self, key: Tuple) -> Optional[List[Dict[str, Any]]]:
+        value = self.memory.get(key)
+        if value is None and self.disk is not None:
+            value = self.disk.get(self._disk_key(key))
+            if value is not None:
+                self.memory.set(key, value)
+        return value
+
+    def set(self, key: Tuple, value: List[Dict[str, Any]]):
+        self.memory.set(key, value)
+        if self.disk is not None:
+            self.disk.set(self._disk_key(key), value)
+
+    def stats(self) -> Dict[str, Any]:
+        stats = self.memory.stats()
+        stats["disk_path"] = self.disk.path if self.disk is not None else None
+        return stats
+
+
+def make_search_cache_key(
+    query: str,
+    author: Optional[str],
+    bill_number: Optional[str],
+    chamber: Optional[str],
+    k: int,
+    collection_version: str
+) -> Tuple:
+    """Builds the cache key from the normalized query, the filter tuple, k and the corpus version."""
+    return (collection_version, normalize_query_text(query), author, bill_number, chamber, k)
+
+
+search_result_cache = SearchResultCache(
+    memory=TTLCache(
+        maxsize=SEARCH_RESULT_CACHE_SIZE,
+        ttl=SEARCH_RESULT_CACHE_TTL_SECONDS,
+        max_bytes=SEARCH_RESULT_CACHE_MAX_BYTES,
+        getsizeof=_json_size
+    ),
+    disk=SQLiteCache(SEARCH_RESULT_CACHE_PATH, ttl=SEARCH_RESULT_CACHE_TTL_SECONDS) if SEARCH_RESULT_CACHE_PATH else None
+)
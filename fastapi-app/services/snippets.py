@@ -0,0 +1,98 @@
+# services/snippets.py
+import json
+import os
+import re
+from typing import Any, Dict, List
+
+# Compact, query-focused tool output. Everything a tool returns is fed back
+# into the LLM context, so results carry a short snippet around the passage
+# that best matches the query instead of a full section and its metadata.
+
+TOOL_SNIPPET_SENTENCES = int(os.getenv("TOOL_SNIPPET_SENTENCES", 3))
+# Approximate token budget per result snippet.
+TOOL_SNIPPET_TOKEN_BUDGET = int(os.getenv("TOOL_SNIPPET_TOKEN_BUDGET", 120))
+# Rough characters per token for English legislative text.
+CHARS_PER_TOKEN = 4
+
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "bill", "bills", "by", "for", "from", "in", "is",
+    "it", "law", "laws", "legislation", "of", "on", "or", "that", "the", "this", "to", "with",
+}
+
+_SENTENCE_BOUNDARY = re.compile(r"(?<=[.;:])\s+(?=[A-Z(\"'])|\n+")
+_WORD = re.compile(r"[a-z0-9]+")
+
+
+def estimate_tokens(text: str) -> int:
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """Cuts text at a word boundary so it fits the token budget, marking the cut with an ellipsis."""
+    max_chars = max_tokens * CHARS_PER_TOKEN
+    if len(text) <= max_chars:
+        return text
+    cut = text[:max_chars].rsplit(" ", 1)[0]
+    return cut.rstrip(" ,;:") + " …"
+
+
+def split_sentences(text: str) -> List[str]:
+    return [sentence.strip() for sentence in _SENTENCE_BOUNDARY.split(text) if sentence and sentence.strip()]
+
+
+def query_terms(query: str) -> set:
+    return {word for word in _WORD.findall(query.lower()) if word not in STOPWORDS and len(word) > 2}
+
+
+def extract_snippet(
+    text: str,
+    query: str,
+    max_sentences: int = TOOL_SNIPPET_SENTENCES,
+    max_tokens: int = TOOL_SNIPPET_TOKEN_BUDGET
+) -> str:
+    """
+    Returns the window of `max_sentences` sentences around the sentence that shares
+    the most terms with the query, trimmed to `max_tokens`.
+    """
+    sentences = split_sentences(text)
+    if not sentences:
+        return ""
+    terms = query_terms(query)
+
+    best_index = 0
+    if terms:
+        overlaps = [len(terms & set(_WORD.findall(sentence.lower()))) for sentence in sentences]
+        best_index = max(range(len(sentences)), key=lambda i: overlaps[i])
+
+    start = max(0, min(best_index - (max_sentences - 1) // 2, len(sentences) - max_sentences))
+    snippet = " ".join(sentences[start:start + max_sentences])
+    if start > 0:
+        snippet = "… " + snippet
+    return truncate_to_tokens(snippet, max_tokens)
+
+
+def compact_search_results(results: List[Dict[str, Any]], query: str, follow_up: bool = True) -> List[Dict[str, Any]]:
+    """
+    Shrinks search service results to what the agent needs: the bill, its author,
+    its relevance score and a query-focused snippet. With `follow_up`, each result
+    names the get_bill_details call that fetches the bill's full text.
+    """
+    compact = []
+    for result in results:
+        metadata = result.get("metadata") or {}
+        item = {
+            "bill_number": result.get("bill_number"),
+            "chamber": result.get("chamber"),
+            "author": metadata.get("author"),
+            "score": result.get("relevance_score"),
+            "snippet": extract_snippet(result.get("content") or "", query),
+        }
+        if follow_up:
+            item["full_text"] = f"get_bill_details(bill_number='{item['bill_number']}', chamber='{item['chamber']}')"
+        compact.append(item)
+    return compact
+
+
+def to_compact_json(value: Any) -> str:
+    """Minified JSON for tool output."""
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False, default=str)
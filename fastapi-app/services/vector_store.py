@@ -0,0 +1,249 @@
+# services/vector_store.py
+import asyncio
+import os
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+from dotenv import load_dotenv
+from langchain_huggingface import HuggingFaceEmbeddings
+import chromadb
+from langchain_chroma import Chroma
+from services.embedding_cache import CachedQueryEmbeddings
+
+# Shared vector-store layer for every legislative service.
+# One embedding model, one Chroma HTTP client (and therefore one keep-alive
+# connection pool) and one LangChain handle per collection, per worker.
+
+load_dotenv()
+
+EMBEDDING_MODEL_NAME = os.environ.get('LEGISLATIVE_EMBEDDING_MODEL_NAME')
+COLLECTION_NAME = os.environ.get('LEGISLATIVE_CHROMA_COLLECTION_NAME')
+# One vector per bill, built by the seeder next to the section collection.
+BILL_SUMMARY_COLLECTION_NAME = os.environ.get(
+    'LEGISLATIVE_CHROMA_SUMMARY_COLLECTION_NAME', f"{COLLECTION_NAME}-bills" if COLLECTION_NAME else None
+)
+CHROMA_HOST = os.environ.get('CHROMA_SERVER_HOST')
+CHROMA_PORT = int(os.environ.get('CHROMA_SERVER_PORT', 8000))
+QUERY_EMBEDDING_CACHE_SIZE = int(os.environ.get('QUERY_EMBEDDING_CACHE_SIZE', 2048))
+QUERY_EMBEDDING_CACHE_TTL_SECONDS = float(os.environ.get('QUERY_EMBEDDING_CACHE_TTL_SECONDS', 86400))
+# How long a collection version stamp is trusted before Chroma is asked again.
+COLLECTION_VERSION_CHECK_SECONDS = float(os.environ.get('COLLECTION_VERSION_CHECK_SECONDS', 30))
+# Query embeddings are unit-normalized, matching the seeder, so distances map to cosine similarity.
+EMBEDDING_ENCODE_KWARGS = {'normalize_embeddings': True}
+# Stored embeddings sampled per collection version to check they are unit length.
+EMBEDDING_NORM_SAMPLE_SIZE = 16
+EMBEDDING_NORM_TOLERANCE = 0.01
+
+# RLock because get_vectorstore() builds the client and model while holding it.
+_lock = threading.RLock()
+_embeddings_instance = None
+_query_embeddings_instance = None
+_client_instance = None
+_vectorstore_instances: Dict[str, Chroma] = {}
+_collection_versions: Dict[str, Tuple[str, float]] = {}
+_collection_spaces: Dict[str, str] = {}
+# Collection name -> (version checked, whether its sampled embeddings were unit length)
+_collection_unit_norms: Dict[str, Tuple[str, bool]] = {}
+
+# Async client state for the event-loop tool path. The lock is created lazily
+# so it binds to the running loop rather than to import time.
+_async_lock: Optional[asyncio.Lock] = None
+_async_client_instance = None
+_async_collection_instances: Dict[str, object] = {}
+
+
+def get_embeddings() -> HuggingFaceEmbeddings:
+    """
+    Returns the process-wide embedding model, loading it on first use.
+    """
+    global _embeddings_instance
+    if _embeddings_instance is None:
+        with _lock:
+            if _embeddings_instance is None:
+                print(f"Loading embedding model '{EMBEDDING_MODEL_NAME}'...")
+                _embeddings_instance = HuggingFaceEmbeddings(model_name=EMBEDDING_MODEL_NAME, encode_kwargs=EMBEDDING_ENCODE_KWARGS)
+    return _embeddings_instance
+
+
+def get_query_embeddings() -> CachedQueryEmbeddings:
+    """
+    Returns the shared embedding model wrapped in the query-embedding cache.
+    This is the embedding function every vector store handle searches with.
+    """
+    global _query_embeddings_instance
+    if _query_embeddings_instance is None:
+        with _lock:
+            if _query_embeddings_instance is None:
+                _query_embeddings_instance = CachedQueryEmbeddings(
+                    embeddings=get_embeddings(),
+                    model_name=EMBEDDING_MODEL_NAME,
+                    maxsize=QUERY_EMBEDDING_CACHE_SIZE,
+                    ttl=QUERY_EMBEDDING_CACHE_TTL_SECONDS
+                )
+    return _query_embeddings_instance
+
+
+def get_chroma_client():
+    """
+    Returns the process-wide Chroma HTTP client.
+
+    The client keeps its HTTP session open between calls, so every collection
+    handle built on top of it reuses the same pooled keep-alive connections.
+    """
+    global _client_instance
+    if _client_instance is None:
+        with _lock:
+            if _client_instance is None:
+                print(f"Connecting to ChromaDB at {CHROMA_HOST}:{CHROMA_PORT}...")
+                _client_instance = chromadb.HttpClient(host=CHROMA_HOST, port=CHROMA_PORT)
+    return _client_instance
+
+
+def get_vectorstore(collection_name: Optional[str] = None) -> Chroma:
+    """
+    Returns the shared LangChain Chroma handle for a collection.
+
+    Args:
+        collection_name: The collection to open. Defaults to the legislative
+            collection configured by LEGISLATIVE_CHROMA_COLLECTION_NAME.
+
+    Returns:
+        A Chroma vector store bound to the shared client and cached embedding model.
+    """
+    name = collection_name or COLLECTION_NAME
+    vectorstore = _vectorstore_instances.get(name)
+    if vectorstore is None:
+        with _lock:
+            vectorstore = _vectorstore_instances.get(name)
+            if vectorstore is None:
+                print(f"Initializing vector store for collection '{name}'...")
+                vectorstore = Chroma(
+                    client=get_chroma_client(),
+                    collection_name=name,
+                    embedding_function=get_query_embeddings()
+                )
+                _vectorstore_instances[name] = vectorstore
+    return vectorstore
+
+
+def _record_collection_version(name: str, collection, now: float) -> str:
+    metadata = collection.metadata or {}
+    _collection_spaces[name] = metadata.get("hnsw:space", "l2")
+    version = str(metadata.get("corpus_version") or collection.id)
+    cached = _collection_versions.get(name)
+    if cached is not None and cached[0] != version:
+        print(f"Collection '{name}' changed version: {cached[0]} -> {version}")
+    _collection_versions[name] = (version, now)
+    return version
+
+
+def _record_embedding_norms(name: str, version: str, embeddings: Optional[List]) -> bool:
+    """
+    Records whether a sample of a collection's stored embeddings is unit length.
+    'l2' distances only convert to cosine similarity when it is.
+    """
+    norms = [sum(x * x for x in embedding) ** 0.5 for embedding in (embeddings if embeddings is not None else [])]
+    unit_norm = all(abs(norm - 1.0) <= EMBEDDING_NORM_TOLERANCE for norm in norms)
+    if not unit_norm:
+        print(
+            f"⚠️ Collection '{name}' stores embeddings that are not unit length "
+            f"(sampled norms {min(norms):.3f}-{max(norms):.3f}). Relevance scores fall back to "
+            f"1 / (1 + distance); reseed it with normalized embeddings for calibrated scores."
+        )
+    _collection_unit_norms[name] = (version, unit_norm)
+    return unit_norm
+
+
+def _needs_norm_check(name: str, version: str) -> bool:
+    checked = _collection_unit_norms.get(name)
+    return checked is None or checked[0] != version
+
+
+def get_collection_version(collection_name: Optional[str] = None) -> str:
+    """
+    Returns the version stamp of a collection, used to invalidate result caches.
+
+    The seeder writes a 'corpus_version' into the collection metadata on every
+    reseed. Collections seeded before that fall back to the collection id, which
+    also changes because the seeder drops and recreates the collection.
+    The stamp is re-read from Chroma at most every COLLECTION_VERSION_CHECK_SECONDS.
+    """
+    name = collection_name or COLLECTION_NAME
+    now = time.monotonic()
+    cached = _collection_versions.get(name)
+    if cached is not None and now - cached[1] < COLLECTION_VERSION_CHECK_SECONDS:
+        return cached[0]
+
+    collection = get_chroma_client().get_collection(name=name)
+    version = _record_collection_version(name, collection, now)
+    if _needs_norm_check(name, version):
+        sample = collection.get(limit=EMBEDDING_NORM_SAMPLE_SIZE, include=["embeddings"])
+        _record_embedding_norms(name, version, sample.get("embeddings"))
+    return version
+
+
+def get_distance_space(collection_name: Optional[str] = None) -> str:
+    """
+    Returns the distance function of a collection ('l2', 'cosine' or 'ip') as last
+    seen by get_collection_version(). Chroma's default, 'l2', is assumed until then.
+    """
+    return _collection_spaces.get(collection_name or COLLECTION_NAME, "l2")
+
+
+def embeddings_unit_norm(collection_name: Optional[str] = None) -> bool:
+    """
+    Whether a collection's stored embeddings were found to be unit length by the
+    last get_collection_version() check. Assumed True until checked.
+    """
+    checked = _collection_unit_norms.get(collection_name or COLLECTION_NAME)
+    return checked is None or checked[1]
+
+
+async def get_async_chroma_client():
+    """
+    Returns the process-wide async Chroma HTTP client for use on the event loop.
+    """
+    global _async_lock, _async_client_instance
+    if _async_client_instance is None:
+        if _async_lock is None:
+            _async_lock = asyncio.Lock()
+        async with _async_lock:
+            if _async_client_instance is None:
+                print(f"Connecting async client to ChromaDB at {CHROMA_HOST}:{CHROMA_PORT}...")
+                _async_client_instance = await chromadb.AsyncHttpClient(host=CHROMA_HOST, port=CHROMA_PORT)
+    return _async_client_instance
+
+
+async def aget_collection(collection_name: Optional[str] = None):
+    """
+    Returns a cached async Chroma collection handle.
+
+    Async handles carry no embedding function; callers embed the query with
+    get_query_embeddings() and pass `query_embeddings` explicitly.
+    """
+    name = collection_name or COLLECTION_NAME
+    collection = _async_collection_instances.get(name)
+    if collection is None:
+        client = await get_async_chroma_client()
+        collection = await client.get_collection(name=name)
+        _async_collection_instances[name] = collection
+    return collection
+
+
+async def aget_collection_version(collection_name: Optional[str] = None) -> str:
+    """Async counterpart of get_collection_version(), sharing the same stamp cache."""
+    name = collection_name or COLLECTION_NAME
+    now = time.monotonic()
+    cached = _collection_versions.get(name)
+    if cached is not None and now - cached[1] < COLLECTION_VERSION_CHECK_SECONDS:
+        return cached[0]
+
+    client = await get_async_chroma_client()
+    collection = await client.get_collection(name=name)
+    version = _record_collection_version(name, collection, now)
+    if _needs_norm_check(name, version):
+        sample = await collection.get(limit=EMBEDDING_NORM_SAMPLE_SIZE, include=["embeddings"])
+        _record_embedding_norms(name, version, sample.get("embeddings"))
+    # Keep the async handle current; a reseed recreates the collection under a new id.
+    _async_collection_instances[name] = collection
+    return version
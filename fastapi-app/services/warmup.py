@@ -0,0 +1,79 @@
+# services/warmup.py
+import asyncio
+import os
+import time
+from typing import Any, Callable, Dict
+from langchain_ollama import ChatOllama
+from services.vector_store import COLLECTION_NAME, get_chroma_client, get_embeddings, get_vectorstore
+from services.llm_service import OLLAMA_BASE_URL, OLLAMA_MODEL
+
+# Startup warm-up for the heavy dependencies behind the agent endpoints.
+# Each check loads and exercises one dependency; the app only reports ready
+# once all of them have succeeded at least once.
+
+WARMUP_RETRY_SECONDS = float(os.getenv("WARMUP_RETRY_SECONDS", 10))
+
+_readiness: Dict[str, Any] = {
+    "ready": False,
+    "checks": {
+        "embeddings": {"status": "pending"},
+        "chroma": {"status": "pending"},
+        "ollama": {"status": "pending"},
+    },
+}
+
+
+def warm_up_embeddings():
+    """Loads the embedding model and runs one dummy embedding through it."""
+    get_embeddings().embed_query("warm-up")
+
+
+def warm_up_chroma():
+    """Checks the Chroma heartbeat and opens the legislative collection."""
+    client = get_chroma_client()
+    client.heartbeat()
+    client.get_collection(name=COLLECTION_NAME)
+    get_vectorstore()
+
+
+def warm_up_ollama():
+    """Loads the Ollama model into memory with a one-token generation."""
+    ChatOllama(base_url=OLLAMA_BASE_URL, model=OLLAMA_MODEL, num_predict=1).invoke("ping")
+
+
+WARMUP_CHECKS: Dict[str, Callable[[], None]] = {
+    "embeddings": warm_up_embeddings,
+    "chroma": warm_up_chroma,
+    "ollama": warm_up_ollama,
+}
+
+
+async def run_warmup():
+    """
+    Runs every warm-up check off the event loop, retrying failed checks until
+    all of them pass. Intended to run as a background task from the app lifespan
+    so liveness is served while the dependencies are still loading.
+    """
+    pending = dict(WARMUP_CHECKS)
+    while pending:
+        for name, check in list(pending.items()):
+            start_time = time.time()
+            try:
+                await asyncio.to_thread(check)
+            except Exception as e:
+                print(f"⚠️ Warm-up check '{name}' failed: {e}")
+                _readiness["checks"][name] = {"status": "error", "error": str(e)}
+                continue
+            elapsed_ms = (time.time() - start_time) * 1000
+            print(f"✅ Warm-up check '{name}' completed in {elapsed_ms:.0f}ms.")
+            _readiness["checks"][name] = {"status": "ok", "elapsed_ms": round(elapsed_ms, 1)}
+            del pending[name]
+        if pending:
+            await asyncio.sleep(WARMUP_RETRY_SECONDS)
+    _readiness["ready"] = True
+    print("✅ All warm-up checks passed. Application is ready.")
+
+
+def get_readiness() -> Dict[str, Any]:
+    """Returns the current readiness state and the result of each check."""
+    return _readiness
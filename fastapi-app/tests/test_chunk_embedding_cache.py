@@ -0,0 +1,100 @@
+import hashlib
+import multiprocessing
+import os
+
+import numpy as np
+import pytest
+
+from services.chunk_embedding_cache import ChunkEmbeddingCache
+
+DIM = 8
+
+
+def vector_for(key):
+    """A vector derived from the key, so any row can be checked against the hash that points at it."""
+    seed = int(hashlib.sha256(key.encode()).hexdigest()[:8], 16)
+    return np.random.default_rng(seed).random(DIM, dtype=np.float32)
+
+
+def put(cache, keys):
+    cache.put_many(keys, np.stack([vector_for(key) for key in keys]))
+
+
+def assert_consistent(cache, keys):
+    for key, vector in cache.get_many(keys).items():
+        np.testing.assert_array_equal(vector, vector_for(key))
+
+
+def test_round_trip_and_reload(tmp_path):
+    cache = ChunkEmbeddingCache(str(tmp_path), "model", capacity=10)
+    put(cache, ["a", "b"])
+    assert set(cache.get_many(["a", "b", "c"])) == {"a", "b"}
+
+    reopened = ChunkEmbeddingCache(str(tmp_path), "model", capacity=10)
+    assert len(reopened) == 2
+    assert_consistent(reopened, ["a", "b"])
+
+
+def test_evicts_least_recently_written(tmp_path):
+    cache = ChunkEmbeddingCache(str(tmp_path), "model", capacity=2)
+    put(cache, ["a", "b"])
+    put(cache, ["c"])
+    assert set(cache.get_many(["a", "b", "c"])) == {"b", "c"}
+    assert_consistent(cache, ["b", "c"])
+
+
+def test_index_is_appended_not_rewritten(tmp_path):
+    cache = ChunkEmbeddingCache(str(tmp_path), "model", capacity=100)
+    put(cache, ["a"])
+    inode = os.stat(cache.index_path).st_ino
+    put(cache, ["b", "c"])
+    assert os.stat(cache.index_path).st_ino == inode
+    with open(cache.index_path, encoding="utf-8") as f:
+        assert len(f.read().splitlines()) == 4  # header + one line per write
+
+
+def test_log_is_compacted(tmp_path):
+    cache = ChunkEmbeddingCache(str(tmp_path), "model", capacity=2)
+    for i in range(ChunkEmbeddingCache.COMPACT_FACTOR * 2 + 1):
+        put(cache, [f"k{i}"])
+    with open(cache.index_path, encoding="utf-8") as f:
+        assert len(f.read().splitlines()) <= 1 + ChunkEmbeddingCache.COMPACT_FACTOR * 2
+    reopened = ChunkEmbeddingCache(str(tmp_path), "model", capacity=2)
+    assert len(reopened) == 2
+    assert_consistent(reopened, [f"k{i}" for i in range(20)])
+
+
+def test_instances_sharing_a_directory_see_each_others_evictions(tmp_path):
+    first = ChunkEmbeddingCache(str(tmp_path), "model", capacity=2)
+    second = ChunkEmbeddingCache(str(tmp_path), "model", capacity=2)
+    put(first, ["a", "b"])
+    assert_consistent(second, ["a", "b"])
+
+    # second reuses a's row; first must not keep resolving "a" to it
+    put(second, ["c"])
+    assert "a" not in first.get_many(["a"])
+    assert_consistent(first, ["a", "b", "c"])
+
+
+def _worker(directory, worker_id):
+    cache = ChunkEmbeddingCache(directory, "model", capacity=16)
+    for i in range(30):
+        keys = [f"w{worker_id}-{i}", f"shared-{i % 5}"]
+        put(cache, keys)
+        assert_consistent(cache, keys)
+
+
+@pytest.mark.skipif("fork" not in multiprocessing.get_all_start_methods(), reason="needs fork")
+def test_concurrent_processes_never_mix_up_rows(tmp_path):
+    context = multiprocessing.get_context("fork")
+    workers = [context.Process(target=_worker, args=(str(tmp_path), n)) for n in range(4)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join(timeout=60)
+    assert all(worker.exitcode == 0 for worker in workers)
+
+    cache = ChunkEmbeddingCache(str(tmp_path), "model", capacity=16)
+    keys = [f"w{n}-{i}" for n in range(4) for i in range(30)] + [f"shared-{i}" for i in range(5)]
+    assert 0 < len(cache) <= 16
+    assert_consistent(cache, keys)
@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+
+from endpoints import chunk_recall
+from endpoints.chunk_recall import (
+    Chunk, ChunkRecallRequest, ChunkingStrategy, Document, Query, normalize_embeddings, run_evaluation, score_queries
+)
+
+
+def make_chunk(chunk_id, content, embedding):
+    return Chunk(
+        id=chunk_id, content=content, document_id="doc", start_position=0,
+        end_position=len(content), token_count=len(content.split()), embedding=embedding
+    )
+
+
+@pytest.fixture(autouse=True)
+def no_embedding_cache(monkeypatch):
+    monkeypatch.setattr(chunk_recall, "CHUNK_EMBEDDING_CACHE_DIR", "")
+
+
+def test_score_queries_without_queries_returns_nothing():
+    chunks = [make_chunk("c1", "property tax relief", [1.0, 0.0])]
+    assert score_queries([], [], chunks, normalize_embeddings([[1.0, 0.0]]), top_k=5) == []
+
+
+def test_evaluation_without_queries_reports_zero_recall():
+    request = ChunkRecallRequest(
+        strategy=ChunkingStrategy(name="paragraphs", type="paragraph"),
+        documents=[Document(id="doc", content="First paragraph.\n\nSecond paragraph.")],
+        queries=[],
+    )
+    response = run_evaluation(request, "eval-1")
+    assert response.total_chunks > 0
+    assert response.overall_recall == 0.0
+    assert response.query_results == []
+
+
+def test_score_queries_ranks_by_cosine_similarity():
+    chunks = [
+        make_chunk("c1", "school vouchers", [0.0, 1.0]),
+        make_chunk("c2", "property tax relief", [1.0, 0.1]),
+    ]
+    query = Query(id="q1", text="tax", expected_answer="property tax")
+    results = score_queries(
+        [query], np.array([[1.0, 0.0]], dtype=np.float32), chunks,
+        normalize_embeddings([chunk.embedding for chunk in chunks]), top_k=2
+    )
+    assert [chunk.id for chunk in results[0].retrieved_chunks] == ["c2", "c1"]
+    assert results[0].chunk_recall and results[0].recall_rank == 1
@@ -0,0 +1,163 @@
+# tests/test_cicero_data_api.py
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+from services import cicero_data_api, http_client
+from services.disk_cache import SQLiteCache
+
+
+def _official(district_type: str) -> dict:
+    return {"last_name": f"Official {district_type}", "office": {"district": {"district_type": district_type}}}
+
+
+class StubCicero:
+    """A local HTTP server that answers like Cicero's /official endpoint and counts requests."""
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.requests = []
+        # district_type -> status code to answer with instead of officials
+        self.failing = {}
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                params = parse_qs(urlsplit(self.path).query)
+                stub.requests.append(params)
+                time.sleep(stub.delay)
+                district_types = params.get("district_type", [])
+                status = next((stub.failing[d] for d in district_types if d in stub.failing), 200)
+                if status != 200:
+                    self.send_response(status)
+                    self.end_headers()
+                    return
+                body = {"response": {"results": {"candidates": [
+                    {"officials": [_official(d) for d in district_types]}
+                ]}}}
+                payload = json.dumps(body).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/v3.1/official"
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def stub(monkeypatch, tmp_path):
+    server = StubCicero()
+    monkeypatch.setenv("CICERO_DATA_API_KEY", "test-key")
+    monkeypatch.setattr(cicero_data_api, "CICERO_BASE_URL", server.url)
+    monkeypatch.setattr(cicero_data_api, "_lookup_cache", SQLiteCache(str(tmp_path / "cicero.sqlite3"), ttl=60))
+    monkeypatch.setattr(http_client, "HTTP_MAX_RETRIES", 0)
+    cicero_data_api._inflight.clear()
+    http_client._breakers.clear()
+    http_client._host_semaphores.clear()
+    yield server
+    server.close()
+
+
+def run(coro):
+    """Runs a coroutine on a fresh loop, closing the shared client it created."""
+    async def main():
+        try:
+            return await coro
+        finally:
+            await http_client.close_http_client()
+            http_client._host_semaphores.clear()
+    return asyncio.run(main())
+
+
+def test_second_lookup_is_a_cache_hit(stub):
+    first = run(cicero_data_api.aget_representative_by_address("601 West Renner Road, Richardson, TX", "STATE_LOWER"))
+    second = run(cicero_data_api.aget_representative_by_address("601 W Renner Rd Richardson TX", "state_lower"))
+
+    assert first == second
+    assert len(stub.requests) == 1
+
+
+def test_different_district_type_is_a_cache_miss(stub):
+    run(cicero_data_api.aget_representative_by_address("601 W Renner Rd, Richardson, TX", "STATE_LOWER"))
+    run(cicero_data_api.aget_representative_by_address("601 W Renner Rd, Richardson, TX", "STATE_UPPER"))
+
+    assert len(stub.requests) == 2
+
+
+def test_expired_entry_is_fetched_again(stub, monkeypatch, tmp_path):
+    monkeypatch.setattr(cicero_data_api, "_lookup_cache", SQLiteCache(str(tmp_path / "short.sqlite3"), ttl=0.2))
+
+    run(cicero_data_api.aget_representative_by_address("601 W Renner Rd, Richardson, TX", "STATE_LOWER"))
+    run(cicero_data_api.aget_representative_by_address("601 W Renner Rd, Richardson, TX", "STATE_LOWER"))
+    assert len(stub.requests) == 1
+
+    time.sleep(0.3)
+    run(cicero_data_api.aget_representative_by_address("601 W Renner Rd, Richardson, TX", "STATE_LOWER"))
+    assert len(stub.requests) == 2
+
+
+def test_concurrent_identical_lookups_share_one_request(stub):
+    stub.delay = 0.2
+
+    async def lookups():
+        return await asyncio.gather(*(
+            cicero_data_api.aget_representative_by_address("601 W Renner Rd, Richardson, TX", "STATE_LOWER")
+            for _ in range(5)
+        ))
+
+    results = run(lookups())
+
+    assert len(stub.requests) == 1
+    assert all(result == results[0] for result in results)
+    assert results[0] is not None
+
+
+def test_failed_lookup_is_not_cached(stub):
+    stub.failing["STATE_LOWER"] = 500
+
+    assert run(cicero_data_api.aget_representative_by_address("601 W Renner Rd", "STATE_LOWER")) is None
+    del stub.failing["STATE_LOWER"]
+    assert run(cicero_data_api.aget_representative_by_address("601 W Renner Rd", "STATE_LOWER")) is not None
+    assert len(stub.requests) == 2
+
+
+def test_all_levels_come_from_one_request_and_are_cached(stub):
+    first = run(cicero_data_api.aget_all_representatives_by_address("601 W Renner Rd, Richardson, TX"))
+    second = run(cicero_data_api.aget_all_representatives_by_address("601 W Renner Rd, Richardson, TX"))
+
+    assert len(stub.requests) == 1
+    assert first == second
+    assert set(first["districts"]) == set(cicero_data_api.ALL_DISTRICT_TYPES)
+    assert "unresolved" not in first
+
+
+def test_partial_result_is_returned_but_not_cached(stub):
+    stub.failing["NATIONAL_UPPER"] = 503
+
+    partial = run(cicero_data_api.aget_all_representatives_by_address("601 W Renner Rd, Richardson, TX"))
+    assert partial["unresolved"] == ["NATIONAL_UPPER"]
+    assert partial["districts"]["NATIONAL_UPPER"] == []
+    assert partial["districts"]["STATE_LOWER"]
+
+    del stub.failing["NATIONAL_UPPER"]
+    requests_before = len(stub.requests)
+    complete = run(cicero_data_api.aget_all_representatives_by_address("601 W Renner Rd, Richardson, TX"))
+    assert len(stub.requests) > requests_before
+    assert complete["districts"]["NATIONAL_UPPER"]
+    assert "unresolved" not in complete
@@ -0,0 +1,12 @@
+import asyncio
+
+from services import database_state_legislators
+
+
+def test_non_numeric_district_returns_none_without_querying(monkeypatch):
+    async def no_pool():
+        raise AssertionError("the database must not be queried")
+
+    monkeypatch.setattr(database_state_legislators, "get_async_pool", no_pool)
+    record = asyncio.run(database_state_legislators.aquery_legislator("house_representatives", "district_number", "twelve"))
+    assert record is None
@@ -0,0 +1,81 @@
+# tests/test_district_resolver.py
+import json
+import os
+
+import pytest
+
+from services import district_resolver
+from services.district_resolver import DistrictIndex, _point_in_polygon
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "districts")
+
+
+def _features(filename):
+    with open(os.path.join(FIXTURES_DIR, filename), encoding="utf-8") as f:
+        return json.load(f)["features"]
+
+
+@pytest.fixture
+def house_index():
+    return DistrictIndex(_features("texas_house.geojson"))
+
+
+def test_point_in_polygon_respects_holes():
+    square = [[(0, 0), (4, 0), (4, 4), (0, 4), (0, 0)]]
+    with_hole = square + [[(1, 1), (3, 1), (3, 3), (1, 3), (1, 1)]]
+
+    assert _point_in_polygon(0.5, 0.5, square)
+    assert _point_in_polygon(2, 2, square)
+    assert not _point_in_polygon(2, 2, with_hole)
+    assert _point_in_polygon(0.5, 0.5, with_hole)
+    assert not _point_in_polygon(5, 2, square)
+
+
+def test_lookup_finds_each_district(house_index):
+    assert house_index.lookup(-96.5, 32.5) == 1
+    assert house_index.lookup(-95.2, 32.8) == 2
+    # Inside district 2's hole, which is district 3's first polygon.
+    assert house_index.lookup(-95.5, 32.5) == 3
+    # District 3's second, detached polygon.
+    assert house_index.lookup(-93.75, 30.25) == 3
+
+
+def test_lookup_outside_every_district(house_index):
+    assert house_index.lookup(-100.0, 35.0) is None
+    assert house_index.lookup(-94.5, 31.0) is None
+
+
+def test_shared_edge_resolves_to_exactly_one_district(house_index):
+    # Points on the border between districts 1 and 2 belong to one of them, never neither.
+    for latitude in (32.1, 32.25, 32.5, 32.75, 32.9):
+        assert house_index.lookup(-96.0, latitude) in (1, 2)
+
+
+def test_hole_border_resolves_to_one_district(house_index):
+    assert house_index.lookup(-95.6, 32.5) in (2, 3)
+    assert house_index.lookup(-95.5, 32.4) in (2, 3)
+
+
+@pytest.mark.parametrize("cell_degrees", [0.05, 0.1, 0.37, 5.0])
+def test_grid_size_does_not_change_results(house_index, cell_degrees):
+    index = DistrictIndex(_features("texas_house.geojson"), cell_degrees=cell_degrees)
+    points = [(-97.0 + i * 0.13, 30.0 + j * 0.11) for i in range(30) for j in range(30)]
+
+    assert [index.lookup(x, y) for x, y in points] == [house_index.lookup(x, y) for x, y in points]
+
+
+def test_features_without_district_number_are_skipped():
+    features = _features("texas_house.geojson") + [
+        {"type": "Feature", "properties": {"name": "unnumbered"}, "geometry": {"type": "Polygon", "coordinates": [[[0, 0], [1, 0], [1, 1], [0, 0]]]}}
+    ]
+    assert len(DistrictIndex(features)) == 4
+
+
+def test_resolve_districts_uses_available_levels(monkeypatch):
+    monkeypatch.setattr(district_resolver, "DISTRICT_BOUNDARIES_DIR", FIXTURES_DIR)
+    monkeypatch.setattr(district_resolver, "_indexes", None)
+
+    assert district_resolver.district_boundaries_available()
+    # No congressional file in the fixtures, so that level is omitted.
+    assert district_resolver.resolve_districts(32.5, -96.5) == {"STATE_LOWER": 1, "STATE_UPPER": 10}
+    assert district_resolver.resolve_districts(30.25, -93.75) == {"STATE_LOWER": 3, "STATE_UPPER": None}
@@ -0,0 +1,61 @@
+# tests/test_geocoder.py
+import asyncio
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+from services import geocoder, http_client
+from services.ttl_cache import TTLCache
+
+
+@pytest.fixture
+def stub_geocoder(monkeypatch):
+    requests = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            address = parse_qs(urlsplit(self.path).query)["address"][0]
+            requests.append(address)
+            matches = [] if "nowhere" in address.lower() else [{"coordinates": {"x": -96.5, "y": 32.5}}]
+            payload = json.dumps({"result": {"addressMatches": matches}}).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    monkeypatch.setattr(geocoder, "GEOCODER_URL", f"http://127.0.0.1:{server.server_address[1]}/geocode")
+    monkeypatch.setattr(geocoder, "_geocode_cache", TTLCache(maxsize=16, ttl=60))
+    http_client._breakers.clear()
+    http_client._host_semaphores.clear()
+    yield requests
+    server.shutdown()
+    server.server_close()
+
+
+def run(coro):
+    async def main():
+        try:
+            return await coro
+        finally:
+            await http_client.close_http_client()
+            http_client._host_semaphores.clear()
+    return asyncio.run(main())
+
+
+def test_geocode_returns_latitude_longitude_and_caches(stub_geocoder):
+    assert run(geocoder.ageocode_address("601 West Renner Road, Richardson, TX 75080")) == (32.5, -96.5)
+    assert run(geocoder.ageocode_address("601 W Renner Rd Richardson TX 75080")) == (32.5, -96.5)
+    assert len(stub_geocoder) == 1
+
+
+def test_unmatched_address_returns_none(stub_geocoder):
+    assert run(geocoder.ageocode_address("1 Nowhere Lane")) is None
@@ -0,0 +1,112 @@
+# tests/test_http_client.py
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from services import http_client
+from services.http_client import CircuitBreaker, CircuitOpenError
+
+URL = "http://upstream.test/lookup"
+
+
+class FakeClient:
+    """Stands in for the shared AsyncClient; `behaviour` decides what each GET does."""
+
+    def __init__(self, behaviour):
+        self.behaviour = behaviour
+        self.calls = 0
+
+    async def get(self, url, params=None, **kwargs):
+        self.calls += 1
+        return await self.behaviour(url)
+
+
+@pytest.fixture(autouse=True)
+def reset_http_client(monkeypatch):
+    monkeypatch.setattr(http_client, "HTTP_MAX_RETRIES", 0)
+    http_client._breakers.clear()
+    http_client._host_semaphores.clear()
+    yield
+    http_client._breakers.clear()
+    http_client._host_semaphores.clear()
+
+
+def _half_open_breaker() -> CircuitBreaker:
+    breaker = CircuitBreaker(failure_threshold=1, reset_seconds=30)
+    breaker.opened_at = time.monotonic() - 60
+    http_client._breakers["upstream.test"] = breaker
+    return breaker
+
+
+def test_breaker_opens_after_threshold_and_allows_one_trial():
+    breaker = CircuitBreaker(failure_threshold=2, reset_seconds=30)
+    breaker.record_failure()
+    assert breaker.state == "closed"
+    breaker.record_failure()
+    assert breaker.state == "open"
+    assert not breaker.allow()
+
+    breaker.opened_at = time.monotonic() - 60
+    assert breaker.allow()
+    assert not breaker.allow()
+    breaker.record_success()
+    assert breaker.state == "closed"
+
+
+def test_open_circuit_fails_fast(monkeypatch):
+    fake = FakeClient(lambda url: asyncio.sleep(0))
+    monkeypatch.setattr(http_client, "get_http_client", lambda: fake)
+    http_client._breakers["upstream.test"] = CircuitBreaker(failure_threshold=1, reset_seconds=30)
+    http_client._breakers["upstream.test"].record_failure()
+
+    with pytest.raises(CircuitOpenError):
+        asyncio.run(http_client.get(URL))
+    assert fake.calls == 0
+
+
+def test_cancelled_trial_releases_the_half_open_slot(monkeypatch):
+    async def hang(url):
+        await asyncio.sleep(10)
+
+    monkeypatch.setattr(http_client, "get_http_client", lambda: FakeClient(hang))
+    breaker = _half_open_breaker()
+
+    async def cancel_trial():
+        task = asyncio.create_task(http_client.get(URL))
+        await asyncio.sleep(0.05)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(cancel_trial())
+
+    assert breaker.state == "half_open"
+    assert breaker.allow()
+
+
+def test_non_transport_error_releases_the_half_open_slot(monkeypatch):
+    async def invalid(url):
+        raise httpx.InvalidURL("bad url")
+
+    monkeypatch.setattr(http_client, "get_http_client", lambda: FakeClient(invalid))
+    breaker = _half_open_breaker()
+
+    with pytest.raises(httpx.InvalidURL):
+        asyncio.run(http_client.get(URL))
+
+    assert breaker.allow()
+
+
+def test_failed_trial_reopens_the_circuit(monkeypatch):
+    async def refuse(url):
+        raise httpx.ConnectError("refused")
+
+    monkeypatch.setattr(http_client, "get_http_client", lambda: FakeClient(refuse))
+    breaker = _half_open_breaker()
+
+    with pytest.raises(httpx.ConnectError):
+        asyncio.run(http_client.get(URL))
+
+    assert breaker.state == "open"
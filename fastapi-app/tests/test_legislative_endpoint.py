@@ -0,0 +1,53 @@
+import json
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from endpoints import legislative
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.include_router(legislative.router)
+    return TestClient(app)
+
+
+def pages(*items):
+    """A fake iter_query_service yielding `items`, raising any exception instance among them."""
+    def iter_query_service(filter_dict):
+        for item in items:
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    return iter_query_service
+
+
+def test_stream_returns_one_document_per_line(client, monkeypatch):
+    monkeypatch.setattr(legislative, "iter_query_service", pages({"id": "a"}, {"id": "b"}))
+    response = client.post("/get?stream=true", json={"author": "Curry"})
+    assert response.status_code == 200
+    assert [json.loads(line) for line in response.text.splitlines()] == [{"id": "a"}, {"id": "b"}]
+
+
+def test_stream_with_no_matches_is_empty(client, monkeypatch):
+    monkeypatch.setattr(legislative, "iter_query_service", pages())
+    response = client.post("/get?stream=true", json={"author": "Nobody"})
+    assert response.status_code == 200
+    assert response.text == ""
+
+
+def test_stream_first_page_failure_is_an_http_error(client, monkeypatch):
+    monkeypatch.setattr(legislative, "iter_query_service", pages(ValueError("invalid where filter")))
+    response = client.post("/get?stream=true", json={"$bogus": 1})
+    assert response.status_code == 500
+
+
+def test_stream_later_page_failure_ends_with_error_line(client, monkeypatch):
+    monkeypatch.setattr(legislative, "iter_query_service", pages({"id": "a"}, ConnectionError("chroma went away")))
+    response = client.post("/get?stream=true", json={"author": "Curry"})
+    assert response.status_code == 200
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert lines[0] == {"id": "a"}
+    assert "error" in lines[-1]
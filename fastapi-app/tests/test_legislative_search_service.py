@@ -0,0 +1,109 @@
+import numpy as np
+import pytest
+from langchain_core.documents import Document
+
+from services.legislative_search_service import (
+    attach_best_sections, distances_to_similarities, format_search_results, process_and_dedupe_results
+)
+
+
+def hits(*specs):
+    """Documents and similarities from (bill_number, similarity) or (bill_number, chamber, similarity) tuples."""
+    docs, sims = [], []
+    for spec in specs:
+        bill_number, chamber, similarity = spec if len(spec) == 3 else (spec[0], "House", spec[1])
+        docs.append(Document(
+            page_content=f"{bill_number} {chamber} {similarity}",
+            metadata={"bill_number": bill_number, "chamber": chamber},
+        ))
+        sims.append(similarity)
+    return docs, np.array(sims, dtype=np.float32)
+
+
+def ranked_bills(docs, sims, aggregation):
+    ranked, _, _ = process_and_dedupe_results(docs, sims, aggregation)
+    return [doc.metadata["bill_number"] for doc in ranked]
+
+
+# One strong hit against several weaker ones separates the three aggregations.
+ONE_STRONG = hits(("HB1", 0.9), ("HB2", 0.8), ("HB2", 0.7), ("HB2", 0.6))
+TWO_STRONG = hits(("HB1", 0.9), ("HB1", 0.85), ("HB2", 0.3), ("HB2", 0.3), ("HB2", 0.3))
+
+
+@pytest.mark.parametrize("aggregation, one_strong, two_strong", [
+    ("max", ["HB1", "HB2"], ["HB1", "HB2"]),
+    ("sum", ["HB2", "HB1"], ["HB1", "HB2"]),
+    ("rrf", ["HB2", "HB1"], ["HB2", "HB1"]),
+])
+def test_aggregation_modes(aggregation, one_strong, two_strong):
+    assert ranked_bills(*ONE_STRONG, aggregation) == one_strong
+    assert ranked_bills(*TWO_STRONG, aggregation) == two_strong
+
+
+def test_ties_are_broken_by_the_best_section():
+    docs, sims = hits(("HB1", 0.5), ("HB1", 0.25), ("HB2", 0.75))
+    assert ranked_bills(docs, sims, "sum") == ["HB2", "HB1"]
+
+
+def test_full_ties_keep_retrieval_order():
+    docs, sims = hits(("HB7", 0.6), ("HB3", 0.6))
+    for aggregation in ("max", "sum"):
+        assert ranked_bills(docs, sims, aggregation) == ["HB7", "HB3"]
+
+
+def test_best_hit_counts_and_scores_per_bill_and_chamber():
+    docs, sims = hits(("HB1", "House", 0.4), ("HB1", "Senate", 0.5), ("HB1", "House", 0.8))
+    ranked, counts, scores = process_and_dedupe_results(docs, sims, "max")
+    assert [doc.page_content for doc in ranked] == ["HB1 House 0.8", "HB1 Senate 0.5"]
+    assert counts == {("HB1", "House"): 2, ("HB1", "Senate"): 1}
+    assert scores == {("HB1", "House"): pytest.approx(0.8), ("HB1", "Senate"): pytest.approx(0.5)}
+
+
+def test_without_similarities_bills_rank_by_hit_count():
+    docs, _ = hits(("HB1", 0.0), ("HB2", 0.0), ("HB2", 0.0))
+    ranked, counts, scores = process_and_dedupe_results(docs, None, "max")
+    assert [doc.metadata["bill_number"] for doc in ranked] == ["HB2", "HB1"]
+    assert counts == {("HB2", "House"): 2, ("HB1", "House"): 1}
+    assert scores == {}
+    assert format_search_results(docs)[0]["relevance_score"] is None
+
+
+def test_no_hits():
+    assert process_and_dedupe_results([]) == ([], {}, {})
+    assert format_search_results([], np.array([])) == []
+
+
+@pytest.mark.parametrize("space, unit_norm, distances, expected", [
+    ("cosine", True, [0.0, 0.25, 1.5], [1.0, 0.75, 0.0]),
+    ("ip", True, [0.0, 0.25], [1.0, 0.75]),
+    ("l2", True, [0.0, 1.0, 4.0], [1.0, 0.5, 0.0]),
+    ("l2", False, [0.0, 1.0, 3.0, -0.5], [1.0, 0.5, 0.25, 1.0]),
+])
+def test_distances_to_similarities(space, unit_norm, distances, expected):
+    np.testing.assert_allclose(distances_to_similarities(distances, space, unit_norm), expected, rtol=1e-6)
+
+
+def test_non_unit_l2_keeps_far_hits_apart():
+    # Large distances would all clip to 0 under the unit-norm formula.
+    similarities = distances_to_similarities([10.0, 20.0], "l2", unit_norm=False)
+    assert similarities[0] > similarities[1] > 0
+
+
+def test_attach_best_sections_keeps_bill_order_and_scores():
+    summaries = [
+        {"bill_number": "HB2", "chamber": "House", "relevance_count": 1, "relevance_score": 0.9,
+         "content": "House Bill 2: caption", "metadata": {"author": "A"}},
+        {"bill_number": "HB1", "chamber": "House", "relevance_count": 1, "relevance_score": 0.8,
+         "content": "House Bill 1: caption", "metadata": {"author": "B"}},
+    ]
+    docs, sims = hits(("HB2", 0.4), ("HB2", 0.7), ("HB2", "Senate", 0.95))
+    docs[1].metadata.update(article_number="1", section_number="3")
+
+    drilled = attach_best_sections(summaries, docs, sims)
+    assert [result["bill_number"] for result in drilled] == ["HB2", "HB1"]
+    assert drilled[0]["content"] == "HB2 House 0.7"
+    assert drilled[0]["relevance_count"] == 2
+    assert drilled[0]["relevance_score"] == 0.9
+    assert drilled[0]["metadata"] == {"author": "A", "article_number": "1", "section_number": "3"}
+    # A bill without section hits keeps its caption.
+    assert drilled[1] == summaries[1]
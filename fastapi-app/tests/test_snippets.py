@@ -0,0 +1,65 @@
+import json
+
+from services.snippets import CHARS_PER_TOKEN, compact_search_results, extract_snippet, to_compact_json, truncate_to_tokens
+
+SECTION = (
+    "This Act may be cited as the Example Act. "
+    "The comptroller shall publish an annual report. "
+    "A school district may not adopt a property tax rate above the voter-approval rate. "
+    "The agency shall adopt rules to implement this Act. "
+    "This Act takes effect September 1, 2025."
+)
+
+
+def test_snippet_is_a_window_centred_on_the_best_sentence():
+    snippet = extract_snippet(SECTION, "property tax rate", max_sentences=3, max_tokens=1000)
+    assert snippet.startswith("… The comptroller")
+    assert "A school district" in snippet
+    assert snippet.endswith("implement this Act.")
+    assert "September" not in snippet
+
+
+def test_snippet_window_is_clamped_at_the_end():
+    snippet = extract_snippet(SECTION, "takes effect September", max_sentences=3, max_tokens=1000)
+    assert snippet.startswith("… A school district")
+    assert snippet.endswith("September 1, 2025.")
+
+
+def test_snippet_without_matching_terms_starts_at_the_beginning():
+    snippet = extract_snippet(SECTION, "the bill", max_sentences=2, max_tokens=1000)
+    assert snippet.startswith("This Act may be cited")
+    assert "school district" not in snippet
+
+
+def test_snippet_respects_the_token_budget():
+    snippet = extract_snippet(SECTION, "property tax rate", max_sentences=5, max_tokens=20)
+    assert len(snippet) <= 20 * CHARS_PER_TOKEN + len(" …")
+    assert snippet.endswith(" …")
+
+
+def test_truncate_cuts_at_a_word_boundary():
+    assert truncate_to_tokens("short text", 10) == "short text"
+    cut = truncate_to_tokens("alpha beta gamma, delta epsilon", 4)
+    assert cut == "alpha beta …"
+
+
+def test_compact_results_carry_snippet_and_full_text_handle():
+    results = [{
+        "bill_number": "HB 1",
+        "chamber": "House",
+        "relevance_score": 0.91,
+        "relevance_count": 3,
+        "content": SECTION,
+        "metadata": {"author": "Bettencourt", "article_number": "1"},
+    }]
+    compact = compact_search_results(results, "property tax rate")
+    assert compact == [{
+        "bill_number": "HB 1",
+        "chamber": "House",
+        "author": "Bettencourt",
+        "score": 0.91,
+        "snippet": extract_snippet(SECTION, "property tax rate"),
+        "full_text": "get_bill_details(bill_number='HB 1', chamber='House')",
+    }]
+    assert "full_text" not in compact_search_results(results, "property tax rate", follow_up=False)[0]
+    assert json.loads(to_compact_json(compact)) == compact
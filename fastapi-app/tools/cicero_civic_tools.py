@@ -1,10 +1,10 @@
 import json
 from langchain.tools import tool
 # Assuming your service function is in a file like this
-from services.cicero_data_api import get_representative_by_address
+from services.cicero_data_api import aget_representative_by_address, aget_all_representatives_by_address
 
 @tool
-def find_elected_officials_by_address(address: str, district_type: str) -> str:
+async def find_elected_officials_by_address(address: str, district_type: str) -> str:
     """
     Finds the elected officials for a specific address and legislative district level using the Cicero Data API.
 
@@ -32,9 +32,31 @@ def find_elected_officials_by_address(address: str, district_type: str) -> str:
         str: A JSON string containing the detailed API response from the Cicero Data API. This response includes official names, party, contact information, and district details. If no official is found, it will indicate that.
     """
     print(f"--- TOOL: Finding official for address '{address}' and district type '{district_type}'... ---")
-    response_data = get_representative_by_address(address, district_type)
+    response_data = await aget_representative_by_address(address, district_type)
     
     if response_data:
         return json.dumps(response_data, indent=2)
     
-    return "Could not retrieve information for the specified address and district type."
\ No newline at end of file
+    return "Could not retrieve information for the specified address and district type."
+
+
+@tool
+async def find_all_elected_officials_by_address(address: str) -> str:
+    """
+    Finds every elected official for an address in one call: state house, state senate, U.S. House and U.S. Senate.
+
+    Use this tool instead of calling find_elected_officials_by_address several times when the user asks "Who are all my representatives?" or wants officials at more than one level of government.
+
+    Args:
+        address (str): The full street address to search, including city, state, and zip code.
+
+    Returns:
+        str: A JSON object with the address and a "districts" map from district type ('STATE_LOWER', 'STATE_UPPER', 'NATIONAL_LOWER', 'NATIONAL_UPPER') to the list of officials for that level, including names, party and contact information. If some levels could not be looked up, an "unresolved" list names them; do not tell the user those levels have no officials.
+    """
+    print(f"--- TOOL: Finding all officials for address '{address}'... ---")
+    response_data = await aget_all_representatives_by_address(address)
+
+    if response_data:
+        return json.dumps(response_data, indent=2)
+
+    return "Could not retrieve information for the specified address."
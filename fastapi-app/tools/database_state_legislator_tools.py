@@ -1,10 +1,16 @@
+import asyncio
+from typing import Optional
 from langchain.tools import tool
 import json
 # Import your original database function
-from services.database_state_legislators import query_legislator
+from services.database_state_legislators import aquery_legislator
+from services.legislator_directory import legislator_directory
+from services.legislator_name_index import search_legislators_by_name
+from services.district_resolver import get_district_indexes, resolve_districts
+from services.geocoder import ageocode_address
 
 @tool
-def find_house_rep_by_district(district: int) -> str:
+async def find_house_rep_by_district(district: int) -> str:
     """Finds a Texas state house representative by their district number.
 
     Use this tool to get detailed information about a specific representative when you know their district number. This is often used after finding a user's legislative district via their address.
@@ -18,7 +24,7 @@ def find_house_rep_by_district(district: int) -> str:
     print(f"--- TOOL: Searching database for House Rep in district {district}... ---")
     
     # The arguments are now hardcoded for this specific task
-    legislator_data = query_legislator(
+    legislator_data = await aquery_legislator(
         table_name="house_representatives", 
         column="district_number", 
         value=district
@@ -32,7 +38,7 @@ def find_house_rep_by_district(district: int) -> str:
 
 
 @tool
-def find_senate_rep_by_district(district: int) -> str:
+async def find_senate_rep_by_district(district: int) -> str:
     """Finds a Texas state senator by their district number.
 
     Use this tool to get detailed information about a specific state senator when you know their district number. This is often used after finding a user's legislative district via their address.
@@ -46,7 +52,7 @@ def find_senate_rep_by_district(district: int) -> str:
     print(f"--- TOOL: Searching database for Senator in district {district}... ---")
 
     # The arguments are now hardcoded for this specific task
-    legislator_data = query_legislator(
+    legislator_data = await aquery_legislator(
         table_name="senate_senators", 
         column="district_number", 
         value=district
@@ -59,7 +65,7 @@ def find_senate_rep_by_district(district: int) -> str:
     return f"No Senator was found in the database for district {district}."
 
 @tool
-def find_house_rep_by_name(full_name: str) -> str:
+async def find_house_rep_by_name(full_name: str) -> str:
     """Finds detailed information for a Texas state house representative given their full name.
 
     Use this tool when the user asks a question about a specific member of the Texas House of Representatives by their full name.
@@ -72,7 +78,7 @@ def find_house_rep_by_name(full_name: str) -> str:
     """
     print(f"--- TOOL: Searching database for House Rep with name '{full_name}'... ---")
     
-    legislator_data = query_legislator(
+    legislator_data = await aquery_legislator(
         table_name="house_representatives",
         column="full_name",
         value=full_name
@@ -83,7 +89,7 @@ def find_house_rep_by_name(full_name: str) -> str:
     return f"No House representative was found in the database with the name '{full_name}'."
 
 @tool
-def find_senate_rep_by_name(full_name: str) -> str:
+async def find_senate_rep_by_name(full_name: str) -> str:
     """Finds detailed information for a Texas state senator given their full name.
 
     Use this tool when the user asks a question about a specific member of the Texas Senate by their full name.
@@ -96,7 +102,7 @@ def find_senate_rep_by_name(full_name: str) -> str:
     """
     print(f"--- TOOL: Searching database for Senator with name '{full_name}'... ---")
     
-    legislator_data = query_legislator(
+    legislator_data = await aquery_legislator(
         table_name="senate_senators",
         column="full_name",
         value=full_name
@@ -105,3 +111,75 @@ def find_senate_rep_by_name(full_name: str) -> str:
     if legislator_data:
         return json.dumps(legislator_data, indent=2)
     return f"No Senator was found in the database with the name '{full_name}'."
+
+@tool
+async def find_legislator_by_partial_name(name: str, chamber: Optional[str] = None) -> str:
+    """Finds Texas state legislators whose names are similar to the given name, ranked by similarity.
+
+    Use this tool when a name lookup fails or the name may be partial, misspelled, a nickname (e.g. 'Bob Hall' for 'Robert Hall'), or missing a middle initial, instead of retrying the exact-name tools.
+
+    Args:
+        name (str): The full or partial name of the legislator.
+        chamber (Optional[str]): 'House' or 'Senate' to restrict the search. Leave empty to search both chambers.
+
+    Returns:
+        str: A JSON list of matches (chamber, district_number, full_name, score from 0 to 1), best first. Use the district tools for full details on a match.
+    """
+    print(f"--- TOOL: Fuzzy-searching legislators for '{name}' (chamber={chamber})... ---")
+
+    if not legislator_directory.loaded:
+        try:
+            await legislator_directory.aload()
+        except Exception as e:
+            print(f"❌ Error loading legislator directory: {e}")
+            return "The legislator directory is not available right now."
+
+    matches = search_legislators_by_name(name, chamber=chamber)
+    if matches:
+        return json.dumps(matches, indent=2)
+    return f"No legislator with a name similar to '{name}' was found."
+
+@tool
+async def find_state_legislators_by_location(address: Optional[str] = None, latitude: Optional[float] = None, longitude: Optional[float] = None) -> str:
+    """Finds the Texas state house representative and state senator for an address, using locally stored district boundaries.
+
+    Use this tool when the user gives their address and wants their state legislators. Pass the full street address; it is geocoded and resolved to districts without a Cicero lookup. Only pass latitude and longitude instead if the user provided coordinates themselves; never guess them.
+
+    Args:
+        address (Optional[str]): The full street address, including city, state and zip code.
+        latitude (Optional[float]): The latitude of the location, only if the user gave coordinates.
+        longitude (Optional[float]): The longitude of the location, only if the user gave coordinates.
+
+    Returns:
+        str: A JSON object with the district numbers ('STATE_LOWER', 'STATE_UPPER', 'NATIONAL_LOWER') and the matching house representative and senator records, or an error message if the address cannot be located, district boundaries are unavailable, or the point is outside Texas.
+    """
+    if latitude is None or longitude is None:
+        if not address:
+            return "Provide the user's street address (or coordinates they gave you)."
+        print(f"--- TOOL: Resolving districts offline for address '{address}'... ---")
+        point = await ageocode_address(address)
+        if point is None:
+            return f"Could not locate the address '{address}'; look it up with find_elected_officials_by_address instead."
+        latitude, longitude = point
+    else:
+        print(f"--- TOOL: Resolving districts offline for ({latitude}, {longitude})... ---")
+
+    # The first call parses the boundary files; keep that off the event loop.
+    if not await asyncio.to_thread(get_district_indexes):
+        return "District boundary data is not available; look up the address with find_elected_officials_by_address instead."
+
+    districts = resolve_districts(latitude, longitude)
+    if not any(districts.values()):
+        return f"The point ({latitude}, {longitude}) is not inside any Texas district."
+
+    house_district = districts.get("STATE_LOWER")
+    senate_district = districts.get("STATE_UPPER")
+    house_rep, senator = await asyncio.gather(
+        aquery_legislator("house_representatives", "district_number", house_district) if house_district else asyncio.sleep(0),
+        aquery_legislator("senate_senators", "district_number", senate_district) if senate_district else asyncio.sleep(0),
+    )
+    return json.dumps({
+        "districts": districts,
+        "house_representative": house_rep,
+        "senator": senator,
+    }, indent=2, default=str)
@@ -1,10 +1,10 @@
 from langchain.tools import tool
 import json
 # Import the service function that calls the Google Civic API
-from services.google_civic_api import get_divisions_by_address
+from services.google_civic_api import aget_divisions_by_address
 
 @tool
-def get_political_divisions_by_address(address: str) -> str:
+async def get_political_divisions_by_address(address: str) -> str:
     """
     Queries the Google Civic Information API to find divisions by address.
 
@@ -18,7 +18,7 @@ def get_political_divisions_by_address(address: str) -> str:
         return "Error: A valid street address string must be provided."
 
     print(f"Tool: Calling Google Civic API to get divisions for address: '{address}'")
-    divisions_data = get_divisions_by_address(address)
+    divisions_data = await aget_divisions_by_address(address)
 
     if divisions_data and "divisions" in divisions_data:
         # We only need to return the 'divisions' part to the LLM
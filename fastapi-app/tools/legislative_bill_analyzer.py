@@ -2,7 +2,7 @@
 from typing import Optional, List, Dict, Any, Type
 from langchain.tools import BaseTool
 from langchain_core.pydantic_v1 import BaseModel, Field
-from services.legislative_analysis_service import run_search_service_on_single_bill
+from services.legislative_analysis_service import run_search_service_on_single_bill, arun_search_service_on_single_bill
 
 # Step 1: Define an input schema for the tool's arguments using Pydantic.
 # This provides clear, typed arguments for the agent to use.
@@ -38,7 +38,8 @@ if the user's request mentions a specific part of the bill.
     args_schema: Type[BaseModel] = SearchToolInput
     
     # --- Tool State ---
-    # These values will be provided when the tool is initialized.
+    # These values will be provided when the tool is initialized. Instances are
+    # cheap, so the endpoint builds one per request to bind the bill context.
     bill_number: int
     chamber: str
 
@@ -60,3 +61,20 @@ if the user's request mentions a specific part of the bill.
             article_number=article_number,
             section_number=section_number
         )
+
+    async def _arun(
+        self,
+        query: str,
+        article_title: Optional[str] = None,
+        article_number: Optional[str] = None,
+        section_number: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Use the tool asynchronously."""
+        return await arun_search_service_on_single_bill(
+            query=query,
+            bill_number=self.bill_number,
+            chamber=self.chamber,
+            article_title=article_title,
+            article_number=article_number,
+            section_number=section_number
+        )
@@ -1,17 +1,21 @@
 # fastapi-app/tools/legislative_tools.py
 
+import asyncio
 import json
 import re
-from typing import Optional, List, Dict, Any
+from typing import Optional
 from langchain.tools import tool
 
 # Import your service functions
-from services.legislative_search_service import run_search_service
-from services.legislative_query_service import run_query_service
+from services.legislative_search_service import arun_search_service, SEARCH_BILL_K
+from services.legislative_query_service import arun_query_service
+from services.snippets import compact_search_results, to_compact_json
+from services.bill_text import assemble_bill_text, fit_to_budget, remove_boilerplate
+from services.bill_text_store import load_bill_text, list_bills_by_author
 
 # --- Tools Based on Semantic Search ---
 @tool
-def search_for_legislative_documents(query: str, chamber: Optional[str] = None) -> str:
+async def search_for_legislative_documents(query: str, chamber: Optional[str] = None) -> str:
     """
     Finds and ranks legislative bills based on a user's natural language description of a topic.
 
@@ -45,21 +49,21 @@ def search_for_legislative_documents(query: str, chamber: Optional[str] = None)
         chamber (Optional[str]): The legislative chamber to filter by. Can be 'House' or 'Senate'.
 
     Returns:
-        str: A JSON string representing a list of relevant bills. Each item in the list
-        contains the bill number, chamber, a relevance score, and a snippet of the most
-        relevant text found.
+        str: A JSON list of relevant bills, most relevant first. Each item contains the
+        bill number, chamber, author, a relevance score (0-1), a short snippet of the
+        text that best matches the query, and the get_bill_details call for its full text.
     """
     print(f"--- TOOL: Finding relevant bills for query: '{query}'... ---")
     
-    # Call the underlying service function
-    results = run_search_service(query=query, chamber=chamber)
+    # Call the underlying service function; snippets come from each bill's best-matching section
+    results = await arun_search_service(query=query, chamber=chamber, k=SEARCH_BILL_K, with_sections=True)
     
-    # Return the results as a JSON string for the agent to process
-    return json.dumps(results, indent=2)
+    # Return compact, query-focused results to keep the agent's prompt small
+    return to_compact_json(compact_search_results(results, query))
 
 
 @tool
-def find_bills_by_author_on_topic(author_name: str, topic: str) -> str:
+async def find_bills_by_author_on_topic(author_name: str, topic: str) -> str:
     """
     Finds and ranks legislative bills on a specific topic that are authored by a specific legislator.
 
@@ -82,23 +86,23 @@ def find_bills_by_author_on_topic(author_name: str, topic: str) -> str:
         topic (str): A detailed description of the topic or issue to find bills about.
 
     Returns:
-        str: A JSON string representing a list of relevant bills. Each item in the list
-        contains the bill number, chamber, a relevance score, and a snippet of the most
-        relevant text found.
+        str: A JSON list of relevant bills, most relevant first. Each item contains the
+        bill number, chamber, author, a relevance score (0-1), a short snippet of the
+        text that best matches the query, and the get_bill_details call for its full text.
     """
     print(f"--- TOOL: Finding bills by author '{author_name}' on topic: '{topic}'... ---")
     
     # Call the underlying service function, mapping the tool's parameters to the service's arguments
-    results = run_search_service(query=topic, author=author_name)
+    results = await arun_search_service(query=topic, author=author_name, k=SEARCH_BILL_K, with_sections=True)
     
-    # Return the results as a JSON string for the agent to process
-    return json.dumps(results, indent=2)
+    # Return compact, query-focused results to keep the agent's prompt small
+    return to_compact_json(compact_search_results(results, topic))
 
 
 # --- Tools Based on Direct Metadata Query ---
 
 @tool
-def get_bill_details(bill_number: str, chamber: str) -> str:
+async def get_bill_details(bill_number: str, chamber: str) -> str:
     """
     Retrieves the full text for a specific bill to enable detailed analysis.
 
@@ -122,7 +126,8 @@ def get_bill_details(bill_number: str, chamber: str) -> str:
         chamber (str): The legislative chamber of the bill ('House' or 'Senate').
 
     Returns:
-        str: The complete, combined text of the specified legislative bill.
+        str: The text of the specified bill, with its sections in order. Very long bills are
+        condensed to each section's heading and key sentences, marked by a note at the top.
     """
     print(f"--- TOOL: Getting all details for {chamber} Bill {bill_number}... ---")
 
@@ -132,7 +137,13 @@ def get_bill_details(bill_number: str, chamber: str) -> str:
     cleaned_bill_number = re.sub(r'(?i)HB|SB', '', bill_number).strip()
     print(f"--- Cleaned bill number to: '{cleaned_bill_number}' ---")
 
+    # Read the seeded full-text store first; it holds the bill's sections already in order.
+    record = await asyncio.to_thread(load_bill_text, chamber, cleaned_bill_number)
+    if record:
+        sections = [section.get("content") or "" for section in record.get("sections", [])]
+        return fit_to_budget(remove_boilerplate(sections))
 
+    # Not in the store (not seeded yet): rebuild the bill from its Chroma chunks.
     filter_conditions = [{"chamber": {"$eq": chamber}}]
 
     # Use a robust filter to handle potential string vs. integer mismatches for the bill number.
@@ -150,18 +161,16 @@ def get_bill_details(bill_number: str, chamber: str) -> str:
 
     filter_dict = {"$and": filter_conditions}
     
-    results = run_query_service(filter_dict=filter_dict)
+    results = await arun_query_service(filter_dict=filter_dict)
 
     if not results:
         return f"No documents found for {chamber} Bill {bill_number}."
 
-    # Combine all the text chunks into a single string for the agent to analyze.
-    full_text = "\n\n".join([doc.get("content", "") for doc in results])
-    
-    return full_text
+    # Order the sections, strip boilerplate and keep the text within the prompt budget.
+    return assemble_bill_text(results)
 
 @tool
-def list_all_bills_by_author(author_name: str) -> str:
+async def list_all_bills_by_author(author_name: str) -> str:
     """
     Retrieves a list of all legislative bills authored by a specific legislator.
 
@@ -185,8 +194,14 @@ def list_all_bills_by_author(author_name: str) -> str:
         Each item includes the bill number, chamber, and title.
     """
     print(f"--- TOOL: Listing all bills for author '{author_name}'... ---")
+
+    stored_bills = await asyncio.to_thread(list_bills_by_author, author_name)
+    if stored_bills is not None:
+        if not stored_bills:
+            return f"No bills found for author '{author_name}'."
+        return json.dumps(stored_bills, indent=2)
     
-    results = run_query_service(filter_dict={"author": author_name})
+    results = await arun_query_service(filter_dict={"author": author_name})
 
     if not results:
         return f"No bills found for author '{author_name}'."
@@ -1,13 +1,23 @@
 import re
 import os
+import gzip
+import json
+import shutil
 import yaml
 import chromadb
+import numpy as np
+from datetime import datetime, timezone
 from langchain_community.document_loaders import PyPDFLoader
 from langchain.docstore.document import Document
 from langchain_huggingface import HuggingFaceEmbeddings
 from langchain_community.vectorstores import Chroma
 from typing import List, Tuple, Dict
 
+# Embeddings are unit-normalized and both collections use cosine distance, so the
+# API can turn distances into calibrated similarities whatever the model.
+EMBEDDING_ENCODE_KWARGS = {'normalize_embeddings': True}
+COLLECTION_DISTANCE_SPACE = "cosine"
+
 def load_config(config_path: str = 'config.yaml') -> Dict:
     """
     Loads configuration settings from a YAML file.
@@ -107,6 +117,16 @@ def extract_author(full_text: str) -> str:
     
     return author
 
+def extract_caption(full_text: str) -> str:
+    """
+    Extracts the bill caption ("relating to ...") that follows "AN ACT".
+    """
+    caption = ""
+    caption_match = re.search(r"AN\s+ACT\s+([\s\S]+?)(?=BE\s+IT\s+ENACTED|\n\s*SECTION\s)", full_text[:5000], re.IGNORECASE)
+    if caption_match:
+        caption = ' '.join(clean_chunk_text(caption_match.group(1)).split()).strip()
+    return caption
+
 def split_bill_by_section(full_text: str, page_map: List[Tuple[int, int]], pdf_path: str) -> List[Document]:
     """
     Splits the legislative bill text into chunks based on SECTION markers
@@ -212,26 +232,31 @@ def split_bill_by_section(full_text: str, page_map: List[Tuple[int, int]], pdf_p
     print(f"Successfully split {os.path.basename(pdf_path)} into {len(documents)} structured documents.")
     return documents
 
-def upsert_to_chroma(documents: List[Document], collection_name: str, embedding_model_name: str, chroma_host: str, chroma_port: int):
+def upsert_to_chroma(documents: List[Document], collection_name: str, embedding_model_name: str, chroma_host: str, chroma_port: int, corpus_version: str = None):
     """
     Vectorizes documents and upserts them into a ChromaDB collection.
 
+    The collection is stamped with a fresh 'corpus_version' in its metadata so the
+    API's search result cache knows the corpus changed and stops serving old entries.
+
     Args:
         documents: A list of LangChain Document objects to be upserted.
         collection_name: The name of the ChromaDB collection.
         embedding_model_name: The name of the Hugging Face model for embeddings.
         chroma_host: The hostname or IP address of the ChromaDB server.
         chroma_port: The port number of the ChromaDB server.
+        corpus_version: Version stamp to write; defaults to the current UTC time.
     """
     print(f"\nInitializing embedding model: {embedding_model_name}")
     # Initialize the embedding model from Hugging Face.
-    embeddings = HuggingFaceEmbeddings(model_name=embedding_model_name)
+    embeddings = HuggingFaceEmbeddings(model_name=embedding_model_name, encode_kwargs=EMBEDDING_ENCODE_KWARGS)
     
     print(f"Connecting to ChromaDB at {chroma_host}:{chroma_port}")
     # Initialize the ChromaDB client.
     client = chromadb.HttpClient(host=chroma_host, port=chroma_port)
 
-    print(f"Upserting {len(documents)} documents to collection '{collection_name}'. This may take a moment...")
+    corpus_version = corpus_version or datetime.now(timezone.utc).isoformat()
+    print(f"Upserting {len(documents)} documents to collection '{collection_name}' (corpus_version {corpus_version}). This may take a moment...")
     # Use LangChain's Chroma vector store to handle the embedding and upserting.
     # This will create the collection if it doesn't exist.
     Chroma.from_documents(
@@ -239,10 +264,151 @@ def upsert_to_chroma(documents: List[Document], collection_name: str, embedding_
         collection_name=collection_name,
         documents=documents,
         embedding=embeddings,
+        collection_metadata={"corpus_version": corpus_version, "hnsw:space": COLLECTION_DISTANCE_SPACE},
     )
     
     print("Successfully upserted documents to ChromaDB.")
 
+def upsert_bill_summaries(bills: Dict[Tuple[str, int], Dict], section_collection_name: str, summary_collection_name: str, embedding_model_name: str, chroma_host: str, chroma_port: int, corpus_version: str, caption_weight: float = 0.5):
+    """
+    Builds the bill-level summary collection: one vector per bill.
+
+    Each bill's vector blends the embedding of its title and caption with the mean
+    of its section embeddings, which are read back from the section collection
+    instead of being recomputed. Discovery searches query this much smaller
+    collection first.
+
+    Args:
+        bills: Bill-level info keyed by (chamber, bill_number), with 'author', 'caption' and 'source'.
+        section_collection_name: The collection the sections were upserted to.
+        summary_collection_name: The bill-level collection to create.
+        embedding_model_name: The name of the Hugging Face model for embeddings.
+        chroma_host: The hostname or IP address of the ChromaDB server.
+        chroma_port: The port number of the ChromaDB server.
+        corpus_version: The version stamp shared with the section collection.
+        caption_weight: Share of the caption embedding in the blended vector.
+    """
+    client = chromadb.HttpClient(host=chroma_host, port=chroma_port)
+    sections = client.get_collection(name=section_collection_name)
+
+    print(f"\nPooling section embeddings for {len(bills)} bills...")
+    section_sums: Dict[Tuple[str, int], np.ndarray] = {}
+    section_counts: Dict[Tuple[str, int], int] = {}
+    offset, page_size = 0, 1000
+    while True:
+        page = sections.get(limit=page_size, offset=offset, include=["embeddings", "metadatas"])
+        for embedding, metadata in zip(page["embeddings"], page["metadatas"]):
+            key = (metadata.get("chamber"), metadata.get("bill_number"))
+            vector = np.asarray(embedding, dtype=np.float32)
+            section_sums[key] = section_sums.get(key, 0) + vector
+            section_counts[key] = section_counts.get(key, 0) + 1
+        if len(page["ids"]) < page_size:
+            break
+        offset += page_size
+
+    keys = [key for key in bills if key in section_sums]
+    if not keys:
+        print("No sections found to summarize; skipping the bill summary collection.")
+        return
+    texts = [
+        f"{chamber} Bill {bill_number}: {bills[(chamber, bill_number)]['caption']}".strip()
+        for chamber, bill_number in keys
+    ]
+
+    embeddings = HuggingFaceEmbeddings(model_name=embedding_model_name, encode_kwargs=EMBEDDING_ENCODE_KWARGS)
+    caption_vectors = np.asarray(embeddings.embed_documents(texts), dtype=np.float32)
+    pooled_vectors = np.stack([section_sums[key] / section_counts[key] for key in keys])
+    pooled_vectors /= np.maximum(np.linalg.norm(pooled_vectors, axis=1, keepdims=True), 1e-12)
+    bill_vectors = caption_weight * caption_vectors + (1 - caption_weight) * pooled_vectors
+    bill_vectors /= np.maximum(np.linalg.norm(bill_vectors, axis=1, keepdims=True), 1e-12)
+
+    summaries = client.get_or_create_collection(
+        name=summary_collection_name,
+        metadata={"corpus_version": corpus_version, "hnsw:space": COLLECTION_DISTANCE_SPACE}
+    )
+    summaries.upsert(
+        ids=[f"{chamber}-{bill_number}" for chamber, bill_number in keys],
+        embeddings=bill_vectors.tolist(),
+        documents=texts,
+        metadatas=[
+            {
+                "chamber": chamber,
+                "bill_number": bill_number,
+                "author": bills[(chamber, bill_number)]["author"],
+                "caption": bills[(chamber, bill_number)]["caption"],
+                "source": bills[(chamber, bill_number)]["source"],
+                "section_count": section_counts[(chamber, bill_number)],
+            }
+            for chamber, bill_number in keys
+        ]
+    )
+    print(f"Successfully upserted {len(keys)} bill summaries to '{summary_collection_name}'.")
+
+def write_bill_text_store(documents: List[Document], bills: Dict[Tuple[str, int], Dict], store_dir: str, corpus_version: str):
+    """
+    Writes the per-bill full-text store the API reads in get_bill_details and
+    list_all_bills_by_author, so neither has to query ChromaDB.
+
+    Each bill becomes '<store_dir>/<chamber>/<bill_number>.json.gz' with its metadata
+    and its sections in document order, and 'authors.json' maps each author to their
+    bills. The store is built in a sibling directory and swapped in at the end, so
+    the API never reads a half-written store.
+
+    Args:
+        documents: The section documents of every bill, in document order.
+        bills: Bill-level metadata keyed by (chamber, bill_number).
+        store_dir: The directory the store is written to; it is replaced.
+        corpus_version: The version stamp shared with the Chroma collections.
+    """
+    build_dir = f"{store_dir}.new"
+    shutil.rmtree(build_dir, ignore_errors=True)
+    print(f"\nWriting bill text store for {len(bills)} bills to '{store_dir}'...")
+
+    sections_by_bill: Dict[Tuple[str, int], List[Dict]] = {}
+    for doc in documents:
+        key = (doc.metadata.get('chamber'), doc.metadata.get('bill_number'))
+        sections_by_bill.setdefault(key, []).append({
+            'article_number': doc.metadata.get('article_number'),
+            'section_number': doc.metadata.get('section_number'),
+            'content': doc.page_content,
+        })
+
+    authors: Dict[str, List[Dict]] = {}
+    for (chamber, bill_number), bill in sorted(bills.items(), key=lambda item: (str(item[0][0]), str(item[0][1]))):
+        if chamber not in ('House', 'Senate') or not isinstance(bill_number, int):
+            continue
+        record = {
+            'chamber': chamber,
+            'bill_number': bill_number,
+            'author': bill['author'],
+            'caption': bill['caption'],
+            'source': bill['source'],
+            'corpus_version': corpus_version,
+            'sections': sections_by_bill.get((chamber, bill_number), []),
+        }
+        chamber_dir = os.path.join(build_dir, chamber.lower())
+        os.makedirs(chamber_dir, exist_ok=True)
+        with gzip.open(os.path.join(chamber_dir, f"{bill_number}.json.gz"), 'wt', encoding='utf-8') as f:
+            json.dump(record, f)
+        authors.setdefault(bill['author'], []).append({
+            'bill_number': bill_number,
+            'chamber': chamber,
+            'title': bill['caption'] or "No title available",
+        })
+
+    os.makedirs(build_dir, exist_ok=True)
+    with open(os.path.join(build_dir, 'authors.json'), 'w', encoding='utf-8') as f:
+        json.dump(authors, f)
+
+    # Swap the new store in place of the old one.
+    old_dir = f"{store_dir}.old"
+    shutil.rmtree(old_dir, ignore_errors=True)
+    if os.path.isdir(store_dir):
+        os.replace(store_dir, old_dir)
+    os.replace(build_dir, store_dir)
+    shutil.rmtree(old_dir, ignore_errors=True)
+    print(f"Successfully wrote the bill text store to '{store_dir}'.")
+
 # --- Main Execution ---
 # --- Main Execution ---
 if __name__ == "__main__":
@@ -257,10 +423,13 @@ if __name__ == "__main__":
     source_directory = source_dir_config.get('path', 'docs/')
     embedding_model_name = embedding_config.get('model_name', 'nlpaueb/legal-bert-base-uncased')
     chroma_collection_name = chroma_config.get('collection_name', 'legislation-89-r')
+    chroma_summary_collection_name = chroma_config.get('summary_collection_name', f"{chroma_collection_name}-bills")
     chroma_server_host = chroma_config.get('host', 'localhost')
     chroma_server_port = chroma_config.get('port', 8001)
+    bill_text_store_dir = os.getenv('BILL_TEXT_STORE_DIR', config.get('bill_text_store', {}).get('path', '../../../shared/bill_text'))
 
     all_docs_to_upsert = []
+    bills = {}
 
     # --- NEW: Connect to ChromaDB and delete the collection if it exists ---
     print(f"\nConnecting to ChromaDB at {chroma_server_host}:{chroma_server_port}...")
@@ -274,6 +443,12 @@ if __name__ == "__main__":
     except Exception as e:
         # This is expected if the collection doesn't exist on the first run.
         print(f"Collection '{chroma_collection_name}' did not exist, skipping deletion.")
+
+    try:
+        client.delete_collection(name=chroma_summary_collection_name)
+        print(f"Deleted existing bill summary collection: '{chroma_summary_collection_name}'.")
+    except Exception as e:
+        print(f"Collection '{chroma_summary_collection_name}' did not exist, skipping deletion.")
     # -------------------------------------------------------------------------
 
     # Iterate through all files in the source directory
@@ -288,16 +463,40 @@ if __name__ == "__main__":
                 bill_text, page_to_char_map = load_and_preprocess_pdf(pdf_file_path)
                 structured_docs = split_bill_by_section(bill_text, page_to_char_map, pdf_file_path)
                 all_docs_to_upsert.extend(structured_docs)
+                if structured_docs:
+                    first_meta = structured_docs[0].metadata
+                    bills[(first_meta['chamber'], first_meta['bill_number'])] = {
+                        'author': first_meta['author'],
+                        'caption': extract_caption(bill_text),
+                        'source': pdf_file_path
+                    }
 
     # Step 3: Vectorize and upsert all documents to a new, clean collection.
     if all_docs_to_upsert:
         print(f"\nFound {len(all_docs_to_upsert)} document chunks to add.")
+        corpus_version = datetime.now(timezone.utc).isoformat()
         upsert_to_chroma(
             documents=all_docs_to_upsert,
             collection_name=chroma_collection_name,
             embedding_model_name=embedding_model_name,
             chroma_host=chroma_server_host,
-            chroma_port=chroma_server_port
+            chroma_port=chroma_server_port,
+            corpus_version=corpus_version
+        )
+        upsert_bill_summaries(
+            bills=bills,
+            section_collection_name=chroma_collection_name,
+            summary_collection_name=chroma_summary_collection_name,
+            embedding_model_name=embedding_model_name,
+            chroma_host=chroma_server_host,
+            chroma_port=chroma_server_port,
+            corpus_version=corpus_version
+        )
+        write_bill_text_store(
+            documents=all_docs_to_upsert,
+            bills=bills,
+            store_dir=bill_text_store_dir,
+            corpus_version=corpus_version
         )
         
         # Step 4: Display final summary.
@@ -5,6 +5,9 @@ import pathlib
 import re
 from sqlalchemy import create_engine, text, inspect, Table, Column, Integer, String, MetaData
 
+# Must match the API's LEGISLATOR_NOTIFY_CHANNEL (services/legislator_directory.py).
+LEGISLATOR_NOTIFY_CHANNEL = os.getenv("LEGISLATOR_NOTIFY_CHANNEL", "legislators_changed")
+
 def sanitize_key(key):
     """
     Sanitizes a CSV header to be a valid database column name.
@@ -136,6 +139,11 @@ def seed_data(engine, table_name, csv_file_path):
                         insert_stmt = text(f"INSERT INTO {table_name} ({columns}) VALUES ({placeholders})")
                         connection.execute(insert_stmt, filtered_row)
 
+                # Tell running API workers to reload their in-memory legislator
+                # directory. Postgres delivers the notification on commit.
+                channel = connection.dialect.identifier_preparer.quote_identifier(LEGISLATOR_NOTIFY_CHANNEL)
+                connection.execute(text(f"NOTIFY {channel}"))
+
                 print(f"✅ Successfully seeded '{table_name}'.")
     except FileNotFoundError:
         print(f"🚨 ERROR: CSV file not found at {csv_file_path}. Please check the path.")